@@ -0,0 +1,35 @@
+"""add trigram search indexes
+
+Revision ID: 3e9b7c5d1f20
+Revises: 8c3f1d2a9b47
+Create Date: 2026-01-19 15:42:27.104518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e9b7c5d1f20'
+down_revision: Union[str, Sequence[str], None] = '8c3f1d2a9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_movies_title_trgm', 'movies', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_movies_cast_trgm', 'movies', ['cast'], unique=False, postgresql_using='gin', postgresql_ops={'cast': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_movies_cast_trgm', table_name='movies', postgresql_using='gin')
+    op.drop_index('ix_movies_title_trgm', table_name='movies', postgresql_using='gin')
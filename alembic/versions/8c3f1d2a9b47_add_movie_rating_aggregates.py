@@ -0,0 +1,39 @@
+"""add movie rating aggregates
+
+Revision ID: 8c3f1d2a9b47
+Revises: 5aaf9d672e1c
+Create Date: 2026-01-12 10:14:03.512907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3f1d2a9b47'
+down_revision: Union[str, Sequence[str], None] = '5aaf9d672e1c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movies', sa.Column('ratings_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('movies', sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing ratings.
+    op.execute(
+        """
+        UPDATE movies SET
+            ratings_count = (SELECT COUNT(*) FROM movie_ratings r WHERE r.movie_id = movies.id),
+            rating_sum = (SELECT COALESCE(SUM(r.score), 0) FROM movie_ratings r WHERE r.movie_id = movies.id)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('movies', 'rating_sum')
+    op.drop_column('movies', 'ratings_count')
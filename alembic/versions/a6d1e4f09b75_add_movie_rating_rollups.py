@@ -0,0 +1,58 @@
+"""add movie rating rollups
+
+Revision ID: a6d1e4f09b75
+Revises: f3c90a6e2d41
+Create Date: 2026-02-16 09:42:03.518220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d1e4f09b75'
+down_revision: Union[str, Sequence[str], None] = 'f3c90a6e2d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCORES = range(1, 11)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'movie_rating_rollups',
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('ratings_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False),
+        *(sa.Column(f'score_{score}_count', sa.Integer(), server_default='0', nullable=False) for score in SCORES),
+        sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('movie_id', 'bucket'),
+    )
+    op.create_index('ix_movie_rating_rollups_bucket_movie', 'movie_rating_rollups', ['bucket', 'movie_id'], unique=False)
+
+    # Backfill one row per movie and UTC hour in a single grouped pass.
+    if op.get_bind().dialect.name == 'postgresql':
+        bucket = "date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+    else:
+        bucket = "strftime('%Y-%m-%d %H:00:00.000000', created_at)"
+    score_columns = ", ".join(f"score_{score}_count" for score in SCORES)
+    buckets = ",\n                ".join(f"SUM(CASE WHEN score = {score} THEN 1 ELSE 0 END)" for score in SCORES)
+    op.execute(
+        f"""
+        INSERT INTO movie_rating_rollups (movie_id, bucket, ratings_count, rating_sum, {score_columns})
+        SELECT movie_id, {bucket}, COUNT(*), SUM(score),
+                {buckets}
+        FROM movie_ratings
+        GROUP BY movie_id, {bucket}
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movie_rating_rollups_bucket_movie', table_name='movie_rating_rollups')
+    op.drop_table('movie_rating_rollups')
@@ -0,0 +1,31 @@
+"""add movie_ratings keyset index
+
+Revision ID: b41d6e0a7c93
+Revises: 3e9b7c5d1f20
+Create Date: 2026-01-26 09:31:48.220671
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41d6e0a7c93'
+down_revision: Union[str, Sequence[str], None] = '3e9b7c5d1f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_movie_ratings_movie_created_id', 'movie_ratings', ['movie_id', sa.text('created_at DESC'), 'id'], unique=False)
+    # movie_id is the leading column of the new index, so the single-column one is redundant
+    op.drop_index(op.f('ix_movie_ratings_movie_id'), table_name='movie_ratings')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_movie_ratings_movie_id'), 'movie_ratings', ['movie_id'], unique=False)
+    op.drop_index('ix_movie_ratings_movie_created_id', table_name='movie_ratings')
@@ -0,0 +1,30 @@
+"""add genres_movie genre index
+
+Revision ID: c28e5a71d4f6
+Revises: a6d1e4f09b75
+Create Date: 2026-02-18 10:12:37.904415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c28e5a71d4f6'
+down_revision: Union[str, Sequence[str], None] = 'a6d1e4f09b75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the primary key leads with movie_id, so genre filters had no index to seek on;
+    # movie_id is included so the IN subquery is answered from the index alone
+    op.create_index('ix_genres_movie_genre_id', 'genres_movie', ['genre_id', 'movie_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_genres_movie_genre_id', table_name='genres_movie')
@@ -0,0 +1,49 @@
+"""add movie weighted score
+
+Revision ID: d7a2c94e15b8
+Revises: b41d6e0a7c93
+Create Date: 2026-01-29 11:02:37.904115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import LEADERBOARD_PRIOR_MEAN, LEADERBOARD_PRIOR_WEIGHT
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a2c94e15b8'
+down_revision: Union[str, Sequence[str], None] = 'b41d6e0a7c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # an unrated movie's score is the prior mean, also for rows inserted outside the ORM
+    op.add_column(
+        'movies',
+        sa.Column('weighted_score', sa.Float(), server_default=str(LEADERBOARD_PRIOR_MEAN), nullable=False),
+    )
+
+    # Backfill from the stored aggregates with the configured prior.
+    op.execute(
+        sa.text(
+            """
+            UPDATE movies SET
+                weighted_score = (rating_sum + CAST(:prior_total AS FLOAT)) / (ratings_count + :prior_weight)
+            """
+        ).bindparams(
+            prior_total=LEADERBOARD_PRIOR_WEIGHT * LEADERBOARD_PRIOR_MEAN,
+            prior_weight=LEADERBOARD_PRIOR_WEIGHT,
+        )
+    )
+    op.create_index('ix_movies_weighted_score', 'movies', [sa.text('weighted_score DESC'), 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movies_weighted_score', table_name='movies')
+    op.drop_column('movies', 'weighted_score')
@@ -0,0 +1,31 @@
+"""add catalog import indexes
+
+Revision ID: d93b6f2e8a15
+Revises: c28e5a71d4f6
+Create Date: 2026-02-20 14:05:52.117364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd93b6f2e8a15'
+down_revision: Union[str, Sequence[str], None] = 'c28e5a71d4f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # not unique: catalogs loaded before imports existed may already repeat the key
+    op.create_index('ix_movies_natural_key', 'movies', ['title', 'director_id', 'release_year'], unique=False)
+    op.create_index(op.f('ix_directors_name'), 'directors', ['name'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_directors_name'), table_name='directors')
+    op.drop_index('ix_movies_natural_key', table_name='movies')
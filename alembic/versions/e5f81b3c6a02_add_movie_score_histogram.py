@@ -0,0 +1,51 @@
+"""add movie score histogram
+
+Revision ID: e5f81b3c6a02
+Revises: d7a2c94e15b8
+Create Date: 2026-02-02 14:47:19.331862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f81b3c6a02'
+down_revision: Union[str, Sequence[str], None] = 'd7a2c94e15b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCORES = range(1, 11)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for score in SCORES:
+        op.add_column('movies', sa.Column(f'score_{score}_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing ratings in one grouped pass (UPDATE ... FROM: PostgreSQL, SQLite >= 3.33).
+    assignments = ",\n                ".join(f"score_{score}_count = h.s{score}" for score in SCORES)
+    buckets = ",\n                    ".join(
+        f"SUM(CASE WHEN score = {score} THEN 1 ELSE 0 END) AS s{score}" for score in SCORES
+    )
+    op.execute(
+        f"""
+        UPDATE movies SET
+                {assignments}
+        FROM (
+            SELECT movie_id,
+                    {buckets}
+            FROM movie_ratings
+            GROUP BY movie_id
+        ) AS h
+        WHERE movies.id = h.movie_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for score in reversed(SCORES):
+        op.drop_column('movies', f'score_{score}_count')
@@ -0,0 +1,40 @@
+"""add movie version and updated_at
+
+Revision ID: f3c90a6e2d41
+Revises: e5f81b3c6a02
+Create Date: 2026-02-09 10:21:44.907316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c90a6e2d41'
+down_revision: Union[str, Sequence[str], None] = 'e5f81b3c6a02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movies', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    # SQLite cannot add a column with a non-constant default, so add it nullable, backfill it
+    # (existing rows all start out "modified" at migration time), then tighten it
+    op.add_column('movies', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute(sa.text('UPDATE movies SET updated_at = CURRENT_TIMESTAMP'))
+    with op.batch_alter_table('movies') as batch_op:
+        batch_op.alter_column(
+            'updated_at',
+            existing_type=sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('movies', 'updated_at')
+    op.drop_column('movies', 'version')
@@ -0,0 +1,114 @@
+"""In-process cache of the reference data movie writes and filters look up: genre ids and
+names, and director ids.
+
+Both tables are small and change rarely (no API endpoint writes them), so every worker keeps
+a snapshot, loaded at startup and reloaded once it is ``max_age_seconds`` old. A lookup that
+misses reloads early, at most once per ``MISS_RELOAD_INTERVAL_SECONDS``, so rows added by
+scripts or another worker are picked up without waiting for the snapshot to expire. Each
+load bumps ``version``.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import REFERENCE_DATA_MAX_AGE_SECONDS
+from app.models.director import Director
+from app.models.genre import Genre
+
+MISS_RELOAD_INTERVAL_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    version: int
+    loaded_at: float
+    genre_names: dict[int, str] = field(default_factory=dict)
+    director_ids: frozenset[int] = frozenset()
+
+
+class ReferenceDataCache:
+    def __init__(self, max_age_seconds: float | None = None):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._snapshot: ReferenceSnapshot | None = None
+        self.loads = 0
+
+    def snapshot(self, session: Session) -> ReferenceSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None or (
+            self.max_age_seconds is not None and time.monotonic() - snapshot.loaded_at > self.max_age_seconds
+        ):
+            snapshot = self.load(session)
+        return snapshot
+
+    def load(self, session: Session) -> ReferenceSnapshot:
+        genre_names = dict(session.execute(select(Genre.id, Genre.name)).tuples().all())
+        director_ids = frozenset(session.scalars(select(Director.id)))
+        with self._lock:
+            self.loads += 1
+            self._snapshot = ReferenceSnapshot(
+                version=self.loads,
+                loaded_at=time.monotonic(),
+                genre_names=genre_names,
+                director_ids=director_ids,
+            )
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next lookup reloads; call after writing either table."""
+        with self._lock:
+            self._snapshot = None
+
+    def _lookup(self, session: Session, find):
+        """``find(snapshot)``, retried once on a reloaded snapshot when it comes back empty."""
+        snapshot = self.snapshot(session)
+        result = find(snapshot)
+        if not result and time.monotonic() - snapshot.loaded_at >= MISS_RELOAD_INTERVAL_SECONDS:
+            result = find(self.load(session))
+        return result
+
+    def director_exists(self, session: Session, director_id: int) -> bool:
+        return self._lookup(session, lambda snapshot: director_id in snapshot.director_ids)
+
+    def genres_exist(self, session: Session, genre_ids: Iterable[int]) -> bool:
+        wanted = set(genre_ids)
+        return self._lookup(session, lambda snapshot: wanted <= snapshot.genre_names.keys())
+
+    def genre_id(self, session: Session, name: str) -> int | None:
+        """Id of the genre called ``name``, compared case-insensitively."""
+        name = name.lower()
+        return self._lookup(
+            session,
+            lambda snapshot: next(
+                (genre_id for genre_id, genre_name in snapshot.genre_names.items() if genre_name.lower() == name), None
+            ),
+        )
+
+    def genre_ids_matching(self, session: Session, text: str) -> list[int]:
+        """Ids of the genres whose name contains ``text``, case-insensitively (what the old
+        ``Genre.name ILIKE '%text%'`` filter matched)."""
+        text = text.lower()
+        return self._lookup(
+            session,
+            lambda snapshot: sorted(genre_id for genre_id, name in snapshot.genre_names.items() if text in name.lower()),
+        )
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"loaded": False, "loads": self.loads}
+        return {
+            "loaded": True,
+            "version": snapshot.version,
+            "age_seconds": round(time.monotonic() - snapshot.loaded_at, 3),
+            "genres": len(snapshot.genre_names),
+            "directors": len(snapshot.director_ids),
+            "loads": self.loads,
+        }
+
+
+reference_data = ReferenceDataCache(max_age_seconds=REFERENCE_DATA_MAX_AGE_SECONDS)
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""Read-through cache for built API responses.
+
+Entries carry tags (``movie:<id>`` for every movie they contain, ``movies:list`` for listing
+pages) and writes invalidate by tag, so a new rating drops exactly the detail and the list
+pages that show that movie.
+
+``CacheBackend`` is the contract; ``InMemoryLRUCache`` keeps entries in this process only,
+so with several workers another worker's write is only seen once its entries expire. A
+shared backend (e.g. Redis) can implement the same interface.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Iterable
+
+from app.config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS
+
+LIST_TAG = "movies:list"
+
+
+def movie_tag(movie_id: int) -> str:
+    return f"movie:{movie_id}"
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        """Return the cached value, or ``None`` on a miss."""
+
+    @abstractmethod
+    def generation(self) -> int:
+        """Token to take before computing a value; pass it to ``set``."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, tags: Iterable[str], generation: int) -> None:
+        """Store ``value`` unless one of ``tags`` was invalidated after ``generation`` was taken,
+        which would mean the value may have been read before a concurrent write committed."""
+
+    @abstractmethod
+    def invalidate(self, *tags: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> dict: ...
+
+
+class NullCache(CacheBackend):
+    """Used when caching is disabled (``RESPONSE_CACHE_MAX_ENTRIES=0``)."""
+
+    def get(self, key):
+        return None
+
+    def generation(self):
+        return 0
+
+    def set(self, key, value, tags, generation):
+        pass
+
+    def invalidate(self, *tags):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {"enabled": False}
+
+
+class InMemoryLRUCache(CacheBackend):
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Any, frozenset[str]]] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+        self._invalidated_at: dict[str, int] = {}
+        self._generation = 0
+        # sets computed before this generation are refused outright; lets _invalidated_at be reset
+        self._floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= now:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def set(self, key, value, tags, generation):
+        tags = frozenset(tags)
+        with self._lock:
+            if generation < self._floor or any(self._invalidated_at.get(tag, 0) > generation for tag in tags):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, tags)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tags):
+        with self._lock:
+            self._generation += 1
+            if len(self._invalidated_at) > 4 * self.max_entries:
+                self._invalidated_at.clear()
+                self._floor = self._generation
+            for tag in tags:
+                self._invalidated_at[tag] = self._generation
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+def build_response_cache() -> CacheBackend:
+    if RESPONSE_CACHE_MAX_ENTRIES <= 0:
+        return NullCache()
+    return InMemoryLRUCache(max_entries=RESPONSE_CACHE_MAX_ENTRIES, ttl_seconds=RESPONSE_CACHE_TTL_SECONDS)
+
+
+response_cache = build_response_cache()
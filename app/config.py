@@ -0,0 +1,93 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# How long an exact movie count served for ``total=cached`` may be reused, and the catalog state
+# behind the ETag of listing pages (conditional requests always read it afresh).
+MOVIE_COUNT_CACHE_TTL_SECONDS = float(os.getenv("MOVIE_COUNT_CACHE_TTL_SECONDS", "30"))
+
+# off | warn | enforce -- see app/middleware/statement_budget.py
+SQL_STATEMENT_BUDGET_MODES = ("off", "warn", "enforce")
+SQL_STATEMENT_BUDGET_MODE = os.getenv("SQL_STATEMENT_BUDGET_MODE", "off")
+if SQL_STATEMENT_BUDGET_MODE not in SQL_STATEMENT_BUDGET_MODES:
+    raise RuntimeError(
+        f"SQL_STATEMENT_BUDGET_MODE={SQL_STATEMENT_BUDGET_MODE!r} is not one of {', '.join(SQL_STATEMENT_BUDGET_MODES)}"
+    )
+
+# Movie search (q=): the in-process n-gram index used off PostgreSQL is rebuilt after this
+# many seconds so writes from other workers become visible. When q= is combined with other
+# filters, only this many of the best matches are considered.
+SEARCH_INDEX_MAX_AGE_SECONDS = float(os.getenv("SEARCH_INDEX_MAX_AGE_SECONDS", "300"))
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "1000"))
+
+# "Similar movies": the in-process feature index (app/search/similarity_index.py) is rebuilt
+# after this many seconds so movies changed by other workers are picked up.
+SIMILARITY_INDEX_MAX_AGE_SECONDS = float(os.getenv("SIMILARITY_INDEX_MAX_AGE_SECONDS", "300"))
+
+# Genres and director ids are cached in every worker and reloaded after this many seconds
+# (or sooner, when a lookup misses).
+REFERENCE_DATA_MAX_AGE_SECONDS = float(os.getenv("REFERENCE_DATA_MAX_AGE_SECONDS", "300"))
+
+# Most ids one GET /movies/batch request may ask for.
+MOVIE_BATCH_MAX_IDS = int(os.getenv("MOVIE_BATCH_MAX_IDS", "100"))
+
+# sync | async. "async" serves the core movie/rating endpoints from async def routes on an
+# AsyncEngine (asyncpg for PostgreSQL, aiosqlite for SQLite: the "async" extra).
+DB_MODE = os.getenv("DB_MODE", "sync")
+# Defaults to DATABASE_URL with its driver swapped for the async one.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+# Read replicas: comma-separated URLs (same schema as DATABASE_URL, async drivers derived the
+# same way). GET requests read from them round-robin; writes, and the reads of a client for
+# READ_YOUR_WRITES_SECONDS after its last write, go to the primary. Replicas failing the health
+# check, or (PostgreSQL) lagging more than REPLICA_MAX_LAG_SECONDS (0 = unchecked), are skipped.
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL_SECONDS", "5"))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "0"))
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+# Rows fetched per round-trip by the /api/v1/export streams and scripts.export_catalog.
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+# Incremental movie exports hand out the database clock less this many seconds as the next
+# updated_since: updated_at is stamped when a write's transaction starts, so writes still in
+# flight when an export runs are picked up by the next one (unless they run longer than this).
+EXPORT_WATERMARK_MARGIN_SECONDS = float(os.getenv("EXPORT_WATERMARK_MARGIN_SECONDS", "60"))
+
+# Bulk catalog imports (POST /api/v1/movies/import, scripts.import_catalog): records resolved and
+# inserted per transaction, and the most per-row errors one import reports.
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "1000"))
+
+# Response cache for movie detail and listing pages; 0 entries disables it.
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30"))
+
+# Upper bound on records accepted by one POST /api/v1/ratings/bulk call.
+BULK_RATINGS_MAX_RECORDS = int(os.getenv("BULK_RATINGS_MAX_RECORDS", "10000"))
+
+# Requests slower than this are logged with their SQL statements and timings; 0 disables the log.
+SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "0"))
+
+# Connection pool (QueuePool family only). The sync routes run on a ~40-thread pool, so size
+# the pool (plus overflow) for the concurrency you expect per worker process.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+# Connections older than this are replaced on checkout; -1 keeps them forever.
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "-1"))
+
+# Admission control for /api requests: at most this many in flight per worker (defaults to the
+# pool capacity, 0 disables). Excess requests wait up to ADMISSION_QUEUE_TIMEOUT_MS for a slot,
+# which absorbs short bursts, then get a 503 with Retry-After (0 sheds them straight away).
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", str(DB_POOL_SIZE + DB_MAX_OVERFLOW)))
+ADMISSION_QUEUE_TIMEOUT_MS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "1000"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+
+# Leaderboards rank movies by a Bayesian average: (rating_sum + m * C) / (ratings_count + m),
+# i.e. every movie starts with m pseudo-ratings of C. Changing either value requires
+# `python -m scripts.recompute_weighted_scores` to rewrite the stored scores.
+LEADERBOARD_PRIOR_MEAN = float(os.getenv("LEADERBOARD_PRIOR_MEAN", "5.5"))
+LEADERBOARD_PRIOR_WEIGHT = int(os.getenv("LEADERBOARD_PRIOR_WEIGHT", "20"))
+# Movies need at least this many ratings to be listed.
+LEADERBOARD_MIN_RATINGS = int(os.getenv("LEADERBOARD_MIN_RATINGS", "1"))
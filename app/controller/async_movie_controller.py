@@ -0,0 +1,132 @@
+"""Async twins of the core movie endpoints, served when ``DB_MODE=async``.
+
+They mirror ``movie_controller`` route for route and are registered ahead of it, so the
+sync router keeps serving every endpoint that has no async twin.
+"""
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.controller.conditional import (
+    catalog_validators,
+    is_conditional,
+    is_not_modified,
+    movie_body_validators,
+    movie_validators,
+    not_modified_response,
+    validator_headers,
+)
+from app.controller.responses import success_response
+from app.db.database import get_async_db
+from app.schemas.common import SuccessResponse
+from app.schemas.movie import MovieBatch, MovieCreate, MovieDetail, MoviePage, MovieUpdate
+from app.exceptions.http_exceptions import unprocessable
+from app.services.movie_service import AsyncMovieService
+
+# the sync twins already document these routes in the OpenAPI schema
+router = APIRouter(prefix="/api/v1/movies", tags=["movies"], include_in_schema=False)
+
+
+@router.get("", response_model=SuccessResponse[MoviePage])
+async def list_movies(
+    request: Request,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    title: str | None = None,
+    release_year: str | None = None,
+    genre: str | None = None,
+    q: str | None = Query(None, min_length=1, max_length=255),
+    cursor: str | None = None,
+    total: Literal["exact", "estimate", "cached", "none"] = "exact",
+    db: AsyncSession = Depends(get_async_db),
+):
+    year: int | None = None
+    if release_year is not None:
+        if not release_year.isdigit():
+            raise unprocessable("Invalid release_year")
+        year = int(release_year)
+
+    service = AsyncMovieService(db)
+    # listings validate on the ETag alone: If-Modified-Since has one-second resolution, so a
+    # write in the same second as the client's copy would still answer 304. Only If-None-Match
+    # pays for reading the catalog version (one primary key read).
+    catalog_state = None
+    if "if-none-match" in request.headers:
+        catalog_state = await service.get_catalog_state()
+        etag, last_modified = catalog_validators(*catalog_state)
+        if is_not_modified(request, etag, None):
+            return not_modified_response(etag, last_modified)
+
+    data, catalog_state = await service.list_movies(
+        page=page,
+        page_size=page_size,
+        title=title,
+        release_year=year,
+        genre=genre,
+        cursor=cursor,
+        total_mode=total,
+        search=q,
+        catalog_state=catalog_state,
+    )
+    return success_response(data, headers=validator_headers(*catalog_validators(*catalog_state)))
+
+
+@router.post("", response_model=SuccessResponse[MovieDetail], status_code=status.HTTP_201_CREATED)
+async def create_movie(payload: MovieCreate, db: AsyncSession = Depends(get_async_db)):
+    service = AsyncMovieService(db)
+    movie = await service.create_movie(payload)
+    return success_response(movie, status_code=status.HTTP_201_CREATED)
+
+
+# registered before /{movie_id}, which would otherwise capture "batch"
+@router.get("/batch", response_model=SuccessResponse[MovieBatch])
+async def get_movies_batch(
+    ids: str = Query(..., min_length=1, description="Comma-separated movie ids, e.g. 3,1,2"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        movie_ids = [int(part) for part in ids.split(",")]
+    except ValueError:
+        raise unprocessable("Invalid ids")
+
+    service = AsyncMovieService(db)
+    data = await service.get_movies(movie_ids)
+    return success_response(data)
+
+
+@router.get("/{movie_id}", response_model=SuccessResponse[MovieDetail])
+async def get_movie(movie_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    service = AsyncMovieService(db)
+    min_version = None
+    if is_conditional(request):
+        state = await service.get_movie_state(movie_id)
+        if state is not None:
+            etag, last_modified = movie_validators(movie_id, *state)
+            if is_not_modified(request, etag, last_modified):
+                return not_modified_response(etag, last_modified)
+            min_version = state[0]
+
+    movie = await service.get_movie(movie_id, min_version=min_version)
+    return success_response(movie, headers=validator_headers(*movie_body_validators(movie)))
+
+
+@router.put("/{movie_id}", response_model=SuccessResponse[MovieDetail])
+async def update_movie(movie_id: int, payload: MovieUpdate, db: AsyncSession = Depends(get_async_db)):
+    service = AsyncMovieService(db)
+    movie = await service.update_movie(movie_id, payload)
+    return success_response(movie, headers=validator_headers(*movie_body_validators(movie)))
+
+
+@router.patch("/{movie_id}", response_model=SuccessResponse[MovieDetail])
+async def patch_movie(movie_id: int, payload: MovieUpdate, db: AsyncSession = Depends(get_async_db)):
+    service = AsyncMovieService(db)
+    movie = await service.update_movie(movie_id, payload)
+    return success_response(movie, headers=validator_headers(*movie_body_validators(movie)))
+
+
+@router.delete("/{movie_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_movie(movie_id: int, db: AsyncSession = Depends(get_async_db)):
+    service = AsyncMovieService(db)
+    await service.delete_movie(movie_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
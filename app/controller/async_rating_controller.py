@@ -0,0 +1,39 @@
+"""Async twins of the rating endpoints, served when ``DB_MODE=async``."""
+from typing import List, Literal, Union
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.controller.responses import success_response
+from app.controller.streaming import ndjson_response
+from app.db.database import get_async_db
+from app.schemas.common import SuccessResponse
+from app.schemas.rating import RatingCreate, RatingCreated, RatingOut, RatingPage
+from app.services.rating_service import AsyncRatingService
+
+router = APIRouter(prefix="/api/v1/movies", tags=["ratings"], include_in_schema=False)
+
+
+@router.post("/{movie_id}/ratings", response_model=SuccessResponse[RatingCreated], status_code=status.HTTP_201_CREATED)
+async def create_rating(movie_id: int, payload: RatingCreate, db: AsyncSession = Depends(get_async_db)):
+    service = AsyncRatingService(db)
+    data = await service.create_rating(movie_id=movie_id, score=payload.score)
+    return success_response(data, status_code=status.HTTP_201_CREATED)
+
+
+@router.get("/{movie_id}/ratings", response_model=SuccessResponse[Union[List[RatingOut], RatingPage]])
+async def list_ratings(
+    movie_id: int,
+    limit: int | None = Query(None, ge=1, le=1000),
+    cursor: str | None = None,
+    format: Literal["json", "ndjson"] = "json",
+    db: AsyncSession = Depends(get_async_db),
+):
+    service = AsyncRatingService(db)
+    if format == "ndjson":
+        return ndjson_response(await service.stream_ratings(movie_id=movie_id))
+    if limit is not None or cursor is not None:
+        data = await service.list_ratings_page(movie_id=movie_id, limit=limit or 100, cursor=cursor)
+    else:
+        data = await service.list_ratings(movie_id=movie_id)
+    return success_response(data)
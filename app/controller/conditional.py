@@ -0,0 +1,71 @@
+"""HTTP validators (ETag, Last-Modified) and conditional GET, shared by the sync and async
+movie controllers.
+
+A conditional request is answered from a cheap version lookup: on a match the controller
+returns 304 before the response body is built or read from the cache.
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+
+def movie_validators(movie_id: int, version: int, updated_at: datetime) -> tuple[str, datetime]:
+    return f'"movie-{movie_id}-{version}"', updated_at
+
+
+def movie_body_validators(movie: dict) -> tuple[str, datetime]:
+    """Validators of a built (possibly cached) detail body, so its headers always describe it."""
+    return movie_validators(movie["id"], movie["version"], datetime.fromisoformat(movie["updated_at"]))
+
+
+def catalog_validators(version: int, updated_at: datetime) -> tuple[str, datetime]:
+    # the timestamp keeps the tag from repeating if the catalog_version row is ever recreated
+    stamp = int(updated_at.timestamp() * 1_000_000)
+    return f'"movies-{version}-{stamp}"', updated_at
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison (RFC 9110 13.1.2)
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    """Whether the client's cached copy is current. If-None-Match takes precedence over
+    If-Modified-Since, which only has one-second resolution; pass ``last_modified=None`` to
+    validate on the ETag alone."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified_response(etag: str, last_modified: datetime | None) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag, last_modified))
\ No newline at end of file
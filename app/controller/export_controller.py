@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.controller.streaming import export_response
+from app.db.database import get_db
+from app.services.movie_service import MOVIE_EXPORT_COLUMNS, MovieService
+from app.services.rating_service import RATING_EXPORT_COLUMNS, RatingService
+
+router = APIRouter(prefix="/api/v1/export", tags=["export"])
+
+
+@router.get("/movies")
+def export_movies(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    updated_since: datetime | None = None,
+    db: Session = Depends(get_db),
+):
+    """Every movie with its director, genres and rating aggregates, streamed in one pass.
+    ``updated_since`` limits the export to movies created, edited or rated since then; pass the
+    ``X-Export-As-Of`` of the previous export."""
+    watermark, items = MovieService(db).export_catalog(updated_since=updated_since)
+    headers = {"X-Export-As-Of": watermark.isoformat().replace("+00:00", "Z")}
+    return export_response(items, format, MOVIE_EXPORT_COLUMNS, "movies", compress=gzip, headers=headers)
+
+
+@router.get("/ratings")
+def export_ratings(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    after_id: int | None = Query(None, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Every rating, streamed in one pass; ratings never change, so ``after_id`` (the
+    ``X-Export-Last-Id`` of the previous export) selects those inserted since then.
+
+    Ids are taken at insert, so a rating import still running when an export starts can commit
+    ids below that export's watermark; run incremental exports outside bulk imports."""
+    last_id, items = RatingService(db).export_ratings(after_id=after_id)
+    headers = {"X-Export-Last-Id": str(last_id)}
+    return export_response(items, format, RATING_EXPORT_COLUMNS, "ratings", compress=gzip, headers=headers)
\ No newline at end of file
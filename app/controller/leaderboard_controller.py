@@ -0,0 +1,35 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.controller.responses import success_response
+from app.db.database import get_db
+from app.schemas.common import SuccessResponse
+from app.schemas.leaderboard import Leaderboard, Trending
+from app.services.leaderboard_service import LeaderboardService
+
+router = APIRouter(prefix="/api/v1/leaderboards", tags=["leaderboards"])
+
+
+@router.get("", response_model=SuccessResponse[Leaderboard])
+def get_leaderboard(
+    limit: int = Query(50, ge=1, le=100),
+    genre: str | None = Query(None, min_length=1, max_length=100),
+    decade: int | None = Query(None, ge=1800, le=3000),
+    db: Session = Depends(get_db),
+):
+    service = LeaderboardService(db)
+    data = service.get_leaderboard(limit=limit, genre=genre, decade=decade)
+    return success_response(data)
+
+
+@router.get("/trending", response_model=SuccessResponse[Trending])
+def get_trending(
+    window: Literal["1h", "24h", "7d", "30d"] = "24h",
+    limit: int = Query(50, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    service = LeaderboardService(db)
+    data = service.get_trending(window=window, limit=limit)
+    return success_response(data)
\ No newline at end of file
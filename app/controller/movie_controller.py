@@ -1,22 +1,50 @@
-from fastapi import APIRouter, Depends, Query, Response, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
+from app.config import IMPORT_CHUNK_SIZE
+from app.controller.conditional import (
+    catalog_validators,
+    is_conditional,
+    is_not_modified,
+    movie_body_validators,
+    movie_validators,
+    not_modified_response,
+    validator_headers,
+)
+from app.controller.responses import success_response
+from app.controller.streaming import CSV_MEDIA_TYPE, NDJSON_MEDIA_TYPE, line_batches
 from app.db.database import get_db
 from app.schemas.common import SuccessResponse
-from app.schemas.movie import MovieCreate, MovieUpdate
+from app.schemas.movie import (
+    MovieBatch,
+    MovieCreate,
+    MovieDetail,
+    MovieImportSummary,
+    MoviePage,
+    MovieUpdate,
+    SimilarMovies,
+)
 from app.exceptions.http_exceptions import unprocessable
+from app.services.import_service import CatalogImporter
 from app.services.movie_service import MovieService
 
 router = APIRouter(prefix="/api/v1/movies", tags=["movies"])
 
 
-@router.get("", response_model=SuccessResponse)
+@router.get("", response_model=SuccessResponse[MoviePage])
 def list_movies(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     title: str | None = None,
     release_year: str | None = None,
     genre: str | None = None,
+    q: str | None = Query(None, min_length=1, max_length=255),
+    cursor: str | None = None,
+    total: Literal["exact", "estimate", "cached", "none"] = "exact",
     db: Session = Depends(get_db),
 ):
     year: int | None = None
@@ -26,35 +54,112 @@ def list_movies(
         year = int(release_year)
 
     service = MovieService(db)
-    data = service.list_movies(
+    # listings validate on the ETag alone: If-Modified-Since has one-second resolution, so a
+    # write in the same second as the client's copy would still answer 304. Only If-None-Match
+    # pays for reading the catalog version (one primary key read).
+    catalog_state = None
+    if "if-none-match" in request.headers:
+        catalog_state = service.get_catalog_state()
+        etag, last_modified = catalog_validators(*catalog_state)
+        if is_not_modified(request, etag, None):
+            return not_modified_response(etag, last_modified)
+
+    data, catalog_state = service.list_movies(
         page=page,
         page_size=page_size,
         title=title,
         release_year=year,
         genre=genre,
+        cursor=cursor,
+        total_mode=total,
+        search=q,
+        catalog_state=catalog_state,
     )
-    return {"status": "success", "data": data}
+    return success_response(data, headers=validator_headers(*catalog_validators(*catalog_state)))
 
 
-@router.post("", response_model=SuccessResponse, status_code=status.HTTP_201_CREATED)
+@router.post("", response_model=SuccessResponse[MovieDetail], status_code=status.HTTP_201_CREATED)
 def create_movie(payload: MovieCreate, db: Session = Depends(get_db)):
     service = MovieService(db)
     movie = service.create_movie(payload)
-    return {"status": "success", "data": movie}
+    return success_response(movie, status_code=status.HTTP_201_CREATED)
+
+
+@router.post(
+    "/import",
+    response_model=SuccessResponse[MovieImportSummary],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}},
+                CSV_MEDIA_TYPE.split(";")[0]: {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_movies(request: Request, format: Literal["ndjson", "csv"] = "ndjson", db: Session = Depends(get_db)):
+    """Bulk-load movies from the request body, one record per line (see
+    app/services/import_service.py). The body is read as it arrives and imported a chunk at a
+    time, so its size is not bounded by memory."""
+    importer = CatalogImporter(db, format)
+    async for lines in line_batches(request.stream(), IMPORT_CHUNK_SIZE):
+        await run_in_threadpool(importer.import_lines, lines)
+    return success_response(importer.finish())
+
+
+# registered before /{movie_id}, which would otherwise capture "batch"
+@router.get("/batch", response_model=SuccessResponse[MovieBatch])
+def get_movies_batch(
+    ids: str = Query(..., min_length=1, description="Comma-separated movie ids, e.g. 3,1,2"),
+    db: Session = Depends(get_db),
+):
+    try:
+        movie_ids = [int(part) for part in ids.split(",")]
+    except ValueError:
+        raise unprocessable("Invalid ids")
+
+    service = MovieService(db)
+    data = service.get_movies(movie_ids)
+    return success_response(data)
+
+
+@router.get("/{movie_id}", response_model=SuccessResponse[MovieDetail])
+def get_movie(movie_id: int, request: Request, db: Session = Depends(get_db)):
+    service = MovieService(db)
+    min_version = None
+    if is_conditional(request):
+        state = service.get_movie_state(movie_id)
+        if state is not None:
+            etag, last_modified = movie_validators(movie_id, *state)
+            if is_not_modified(request, etag, last_modified):
+                return not_modified_response(etag, last_modified)
+            min_version = state[0]
+
+    movie = service.get_movie(movie_id, min_version=min_version)
+    return success_response(movie, headers=validator_headers(*movie_body_validators(movie)))
 
 
-@router.get("/{movie_id}", response_model=SuccessResponse)
-def get_movie(movie_id: int, db: Session = Depends(get_db)):
+# sync in both DB modes: ranking (and the occasional index build) is CPU-bound, so it runs in
+# the threadpool instead of on the event loop
+@router.get("/{movie_id}/similar", response_model=SuccessResponse[SimilarMovies])
+def get_similar_movies(movie_id: int, limit: int = Query(10, ge=1, le=50), db: Session = Depends(get_db)):
     service = MovieService(db)
-    movie = service.get_movie(movie_id)
-    return {"status": "success", "data": movie}
+    return success_response(service.get_similar_movies(movie_id, limit))
 
 
-@router.put("/{movie_id}", response_model=SuccessResponse)
+@router.put("/{movie_id}", response_model=SuccessResponse[MovieDetail])
 def update_movie(movie_id: int, payload: MovieUpdate, db: Session = Depends(get_db)):
     service = MovieService(db)
     movie = service.update_movie(movie_id, payload)
-    return {"status": "success", "data": movie}
+    return success_response(movie, headers=validator_headers(*movie_body_validators(movie)))
+
+
+@router.patch("/{movie_id}", response_model=SuccessResponse[MovieDetail])
+def patch_movie(movie_id: int, payload: MovieUpdate, db: Session = Depends(get_db)):
+    service = MovieService(db)
+    movie = service.update_movie(movie_id, payload)
+    return success_response(movie, headers=validator_headers(*movie_body_validators(movie)))
 
 
 @router.delete("/{movie_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -1,23 +1,74 @@
-from fastapi import APIRouter, Depends, status
+from typing import List, Literal, Union
+
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
+from app.controller.responses import success_response
+from app.controller.streaming import ndjson_response
 from app.db.database import get_db
 from app.schemas.common import SuccessResponse
-from app.schemas.rating import RatingCreate
+from app.schemas.rating import (
+    BulkRatingCreate,
+    BulkRatingSummary,
+    MovieRatingDistribution,
+    RatingCreate,
+    RatingCreated,
+    RatingOut,
+    RatingPage,
+    RatingTimeseries,
+)
 from app.services.rating_service import RatingService
 
 router = APIRouter(prefix="/api/v1/movies", tags=["ratings"])
+bulk_router = APIRouter(prefix="/api/v1/ratings", tags=["ratings"])
 
 
-@router.post("/{movie_id}/ratings", response_model=SuccessResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/{movie_id}/ratings", response_model=SuccessResponse[RatingCreated], status_code=status.HTTP_201_CREATED)
 def create_rating(movie_id: int, payload: RatingCreate, db: Session = Depends(get_db)):
     service = RatingService(db)
     data = service.create_rating(movie_id=movie_id, score=payload.score)
-    return {"status": "success", "data": data}
+    return success_response(data, status_code=status.HTTP_201_CREATED)
+
+
+@router.get("/{movie_id}/ratings", response_model=SuccessResponse[Union[List[RatingOut], RatingPage]])
+def list_ratings(
+    movie_id: int,
+    limit: int | None = Query(None, ge=1, le=1000),
+    cursor: str | None = None,
+    format: Literal["json", "ndjson"] = "json",
+    db: Session = Depends(get_db),
+):
+    service = RatingService(db)
+    if format == "ndjson":
+        return ndjson_response(service.stream_ratings(movie_id=movie_id))
+    if limit is not None or cursor is not None:
+        data = service.list_ratings_page(movie_id=movie_id, limit=limit or 100, cursor=cursor)
+    else:
+        data = service.list_ratings(movie_id=movie_id)
+    return success_response(data)
+
+
+@router.get("/{movie_id}/ratings/distribution", response_model=SuccessResponse[MovieRatingDistribution])
+def get_rating_distribution(movie_id: int, db: Session = Depends(get_db)):
+    service = RatingService(db)
+    data = service.get_rating_distribution(movie_id=movie_id)
+    return success_response(data)
+
+
+@router.get("/{movie_id}/ratings/timeseries", response_model=SuccessResponse[RatingTimeseries])
+def get_rating_timeseries(
+    movie_id: int,
+    interval: Literal["hour", "day"] = "hour",
+    days: int = Query(7, ge=1, le=365),
+    db: Session = Depends(get_db),
+):
+    service = RatingService(db)
+    data = service.get_rating_timeseries(movie_id=movie_id, interval=interval, days=days)
+    return success_response(data)
 
 
-@router.get("/{movie_id}/ratings", response_model=SuccessResponse)
-def list_ratings(movie_id: int, db: Session = Depends(get_db)):
+@bulk_router.post("/bulk", response_model=SuccessResponse[BulkRatingSummary])
+def bulk_create_ratings(payload: BulkRatingCreate, db: Session = Depends(get_db)):
     service = RatingService(db)
-    data = service.list_ratings(movie_id=movie_id)
-    return {"status": "success", "data": data}
\ No newline at end of file
+    data = service.bulk_create_ratings(payload.ratings)
+    return success_response(data)
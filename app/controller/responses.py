@@ -0,0 +1,29 @@
+"""Single-pass JSON responses for the API routes, shared by the sync and async controllers.
+
+Returning a plain dict from a route with a ``response_model`` makes FastAPI validate the
+dict against the model, re-serialize it through pydantic and only then encode it. The
+services already build plain JSON-ready dicts, so the routes return ``success_response``
+instead: the envelope is encoded once, with orjson. The typed
+``response_model`` still documents the payload in the OpenAPI schema, but is not applied
+at runtime.
+"""
+from typing import Any
+
+import orjson
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def success_response(
+    data: Any, status_code: int = status.HTTP_200_OK, headers: dict[str, str] | None = None
+) -> FastJSONResponse:
+    return FastJSONResponse({"status": "success", "data": data}, status_code=status_code, headers=headers)
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""Streaming response helpers shared by the sync and async controllers."""
+import codecs
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Literal
+
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+GZIP_MEDIA_TYPE = "application/gzip"
+
+
+def _batched_lines(items: Iterable[dict], batch_size: int):
+    batch = []
+    for item in items:
+        batch.append(json.dumps(item, separators=(",", ":")))
+        if len(batch) >= batch_size:
+            yield "\n".join(batch) + "\n"
+            batch = []
+    if batch:
+        yield "\n".join(batch) + "\n"
+
+
+async def _async_batched_lines(items: AsyncIterable[dict], batch_size: int):
+    batch = []
+    async for item in items:
+        batch.append(json.dumps(item, separators=(",", ":")))
+        if len(batch) >= batch_size:
+            yield "\n".join(batch) + "\n"
+            batch = []
+    if batch:
+        yield "\n".join(batch) + "\n"
+
+
+def ndjson_response(items: Iterable[dict] | AsyncIterable[dict], batch_size: int = 500) -> StreamingResponse:
+    """Stream ``items`` as newline-delimited JSON, writing ``batch_size`` lines per chunk so a
+    large listing costs neither one huge body in memory nor one socket write per row."""
+    if hasattr(items, "__aiter__"):
+        body = _async_batched_lines(items, batch_size)
+    else:
+        body = _batched_lines(items, batch_size)
+    return StreamingResponse(body, media_type=NDJSON_MEDIA_TYPE)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "|".join(str(v) for v in value)
+    return value
+
+
+def _batched_csv(items: Iterable[dict], columns: list[str], batch_size: int):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    rows = 0
+    for item in items:
+        writer.writerow([_csv_value(item[column]) for column in columns])
+        rows += 1
+        if rows >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def gzipped(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Compress a text stream into one gzip member chunk by chunk."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(
+    items: Iterable[dict],
+    format: Literal["ndjson", "csv"],
+    columns: list[str],
+    compress: bool = False,
+    batch_size: int = 500,
+) -> Iterator[str] | Iterator[bytes]:
+    """``items`` encoded as NDJSON or as CSV (header row first, lists joined with ``|``),
+    optionally gzip-compressed; shared by the export endpoint and ``scripts.export_catalog``."""
+    chunks = _batched_lines(items, batch_size) if format == "ndjson" else _batched_csv(items, columns, batch_size)
+    return gzipped(chunks) if compress else chunks
+
+
+def export_response(
+    items: Iterable[dict],
+    format: Literal["ndjson", "csv"],
+    columns: list[str],
+    filename: str,
+    compress: bool = False,
+    headers: dict[str, str] | None = None,
+) -> StreamingResponse:
+    """Stream ``items`` as a file download, ``filename`` plus the format (and ``.gz``) extension."""
+    filename = f"{filename}.{format}" + (".gz" if compress else "")
+    media_type = GZIP_MEDIA_TYPE if compress else (NDJSON_MEDIA_TYPE if format == "ndjson" else CSV_MEDIA_TYPE)
+    return StreamingResponse(
+        export_chunks(items, format, columns, compress),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', **(headers or {})},
+    )
+
+
+async def line_batches(chunks: AsyncIterable[bytes], batch_size: int) -> AsyncIterator[list[str]]:
+    """Split a streamed UTF-8 request body into lists of up to ``batch_size`` lines, holding
+    back a line cut off at a chunk boundary until the rest of it arrives."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    batch: list[str] = []
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        batch.extend(lines)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        batch.append(pending)
+    if batch:
+        yield batch
\ No newline at end of file
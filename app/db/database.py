@@ -1,24 +1,108 @@
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from app.config import (
+    ASYNC_DATABASE_URL,
+    DATABASE_REPLICA_URLS,
+    DB_MODE,
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS,
+    REPLICA_MAX_LAG_SECONDS,
+)
+from app.db.pool import pool_options
+from app.db.replicas import Replica, ReplicaSet, RoutingSession
+from app.middleware.read_routing import reads_from_replica
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL is not set. Create a .env file based on .env.example")
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f"No async driver configured for {parsed.get_backend_name()}; set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are switched on per connection.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _create_engine(url: str):
+    created = create_engine(url, **pool_options(url))
+    if created.dialect.name == "sqlite":
+        event.listen(created, "connect", _enable_sqlite_foreign_keys)
+    return created
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _create_async_engine(url: str):
+    created = create_async_engine(url, **pool_options(url))
+    if created.dialect.name == "sqlite":
+        event.listen(created.sync_engine, "connect", _enable_sqlite_foreign_keys)
+    return created
+
+
+engine = _create_engine(DATABASE_URL)
+
+# None without DATABASE_REPLICA_URLS: every session then reads from the primary
+replica_set = None
+if DATABASE_REPLICA_URLS:
+    replica_set = ReplicaSet(
+        [
+            Replica(
+                url,
+                _create_engine(url),
+                _create_async_engine(to_async_url(url)) if DB_MODE == "async" else None,
+            )
+            for url in DATABASE_REPLICA_URLS
+        ],
+        check_interval=REPLICA_HEALTH_CHECK_INTERVAL_SECONDS,
+        max_lag_seconds=REPLICA_MAX_LAG_SECONDS,
+    )
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=RoutingSession, replicas=replica_set)
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_MODE == "async":
+    _async_url = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+    async_engine = _create_async_engine(_async_url)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=True,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        replicas=replica_set,
+        async_engines=True,
+    )
 
 Base = declarative_base()
 
 
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
+    db.use_primary = not reads_from_replica(request)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        db.sync_session.use_primary = not reads_from_replica(request)
+        yield db
\ No newline at end of file
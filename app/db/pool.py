@@ -0,0 +1,84 @@
+"""Connection pools that report how long a checkout took.
+
+``instrumented_pool_class(url)`` returns the pool class SQLAlchemy would pick for ``url``
+with ``connect()`` timed, so the wait for a free connection (plus opening a new one and the
+pre-ping) is added to the active statement counters and shows up in the request metrics.
+The same hook keeps process-wide checkout statistics, see ``pool_stats``.
+"""
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.config import DB_MAX_OVERFLOW, DB_POOL_RECYCLE_SECONDS, DB_POOL_SIZE, DB_POOL_TIMEOUT_SECONDS
+from app.db.statement_counter import record_pool_wait
+
+
+class TimedCheckoutMixin:
+    # class-level defaults; the first checkout gives each pool its own values
+    checkouts = 0
+    checkout_timeouts = 0
+    wait_seconds_total = 0.0
+    wait_seconds_max = 0.0
+    _stats_lock = threading.Lock()
+
+    def connect(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            record_pool_wait(waited)
+            with self._stats_lock:
+                self.checkouts += 1
+                self.checkout_timeouts += timed_out
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+_instrumented: dict[type, type] = {}
+
+
+def instrumented_pool_class(url: str) -> type[Pool]:
+    parsed = make_url(url)
+    base = parsed.get_dialect().get_pool_class(parsed)
+    if base not in _instrumented:
+        _instrumented[base] = type(f"Timed{base.__name__}", (TimedCheckoutMixin, base), {})
+    return _instrumented[base]
+
+
+def pool_options(url: str) -> dict:
+    """``create_engine``/``create_async_engine`` pool arguments from the DB_POOL_* settings."""
+    poolclass = instrumented_pool_class(url)
+    options = {"poolclass": poolclass, "pool_pre_ping": True, "pool_recycle": DB_POOL_RECYCLE_SECONDS}
+    if issubclass(poolclass, QueuePool):
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT_SECONDS)
+    return options
+
+
+def pool_stats(pool: Pool) -> dict:
+    stats = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            timeout_seconds=pool.timeout(),
+        )
+    if isinstance(pool, TimedCheckoutMixin):
+        with pool._stats_lock:
+            stats.update(
+                checkouts=pool.checkouts,
+                checkout_timeouts=pool.checkout_timeouts,
+                wait_seconds_total=round(pool.wait_seconds_total, 6),
+                wait_seconds_max=round(pool.wait_seconds_max, 6),
+            )
+    return stats
\ No newline at end of file
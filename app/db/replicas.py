@@ -0,0 +1,185 @@
+"""Read replicas and the session that routes to them.
+
+``RoutingSession`` sends its statements to the primary unless it is told it may read from a
+replica (``use_primary = False``), which ``get_db`` does for GET requests. Such a session
+takes one replica from ``ReplicaSet.pick`` (round-robin over the healthy ones) and keeps it
+for its lifetime, so a request reads one consistent snapshot. Anything that writes (a flush,
+an INSERT/UPDATE/DELETE, a SELECT carrying a DML CTE) pins the session to the primary from
+then on, and with no healthy replica every read falls back to the primary.
+
+A background thread pings each replica every ``REPLICA_HEALTH_CHECK_INTERVAL_SECONDS`` and,
+on PostgreSQL, takes it out of rotation while its replay lag exceeds
+``REPLICA_MAX_LAG_SECONDS``. A replica that drops its connections mid-request is taken out
+immediately and put back by the next successful check.
+
+Replicas lag: a client that just wrote is pinned to the primary for a short window (see
+``app/middleware/read_routing.py``), but other clients, and the response cache filled by
+their reads, may see data up to the replication lag old. Sessions pinned that way
+(``pinned_to_primary``) therefore read around the caches instead of from them.
+"""
+import itertools
+import logging
+import threading
+import time
+
+from sqlalchemy import event, select, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+logger = logging.getLogger(__name__)
+
+
+class Replica:
+    def __init__(self, url: str, engine: Engine, async_engine=None):
+        self.url = url
+        self.engine = engine
+        self.async_engine = async_engine
+        self.healthy = True
+        self.lag_seconds: float | None = None
+        self.last_error: str | None = None
+        self.checked_at: float | None = None
+        for bound in (engine, async_engine.sync_engine if async_engine is not None else None):
+            if bound is not None:
+                event.listen(bound, "handle_error", self._on_error)
+
+    def _on_error(self, context) -> None:
+        if context.is_disconnect:
+            self.mark_down(str(context.original_exception))
+
+    def mark_down(self, reason: str) -> None:
+        if self.healthy:
+            logger.warning("read replica %s taken out of rotation: %s", self.display_url, reason)
+        self.healthy = False
+        self.last_error = reason
+
+    @property
+    def display_url(self) -> str:
+        return make_url(self.url).render_as_string(hide_password=True)
+
+    def check(self, max_lag_seconds: float) -> None:
+        """Ping the replica (and read its replay lag on PostgreSQL), updating ``healthy``."""
+        try:
+            with self.engine.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    self.lag_seconds = conn.scalar(
+                        text(
+                            "SELECT CASE WHEN pg_is_in_recovery() "
+                            "THEN EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+                        )
+                    )
+                else:
+                    conn.execute(select(1))
+        except Exception as exc:
+            self.mark_down(str(exc))
+            return
+        finally:
+            self.checked_at = time.monotonic()
+
+        if max_lag_seconds > 0 and self.lag_seconds is not None and self.lag_seconds > max_lag_seconds:
+            self.mark_down(f"replay lag {self.lag_seconds:.1f}s exceeds {max_lag_seconds:g}s")
+            return
+        if not self.healthy:
+            logger.info("read replica %s back in rotation", self.display_url)
+        self.healthy = True
+        self.last_error = None
+
+    def stats(self) -> dict:
+        return {
+            "url": self.display_url,
+            "healthy": self.healthy,
+            "lag_seconds": None if self.lag_seconds is None else round(float(self.lag_seconds), 3),
+            "last_error": self.last_error,
+            "checked_seconds_ago": None if self.checked_at is None else round(time.monotonic() - self.checked_at, 3),
+        }
+
+
+class ReplicaSet:
+    def __init__(self, replicas: list[Replica], check_interval: float, max_lag_seconds: float):
+        self.replicas = replicas
+        self.check_interval = check_interval
+        self.max_lag_seconds = max_lag_seconds
+        self._next = itertools.count()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.picks = 0
+        self.fallbacks = 0
+
+    def pick(self) -> Replica | None:
+        """The next healthy replica in round-robin order, or None when all are down."""
+        start = next(self._next)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.healthy:
+                self.picks += 1
+                return replica
+        self.fallbacks += 1
+        return None
+
+    def check(self) -> None:
+        for replica in self.replicas:
+            replica.check(self.max_lag_seconds)
+
+    def start_health_checks(self) -> None:
+        if self._thread is not None or self.check_interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run_health_checks, name="replica-health", daemon=True)
+        self._thread.start()
+
+    def stop_health_checks(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.check_interval)
+            self._thread = None
+
+    def _run_health_checks(self) -> None:
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.check_interval)
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [replica.stats() for replica in self.replicas],
+            "picks": self.picks,
+            "fallbacks": self.fallbacks,
+        }
+
+
+def writes(clause) -> bool:
+    if clause is None:
+        return False
+    # raw SQL could be anything (LOCK TABLE, setval), so it stays on the primary
+    if isinstance(clause, TextClause) or getattr(clause, "is_dml", False):
+        return True
+    # a SELECT can still write through a data-modifying CTE
+    return any(getattr(cte.element, "is_dml", False) for cte in getattr(clause, "_independent_ctes", ()))
+
+
+class RoutingSession(Session):
+    def __init__(self, *args, replicas: ReplicaSet | None = None, async_engines: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        # the AsyncSession wrapper needs the replicas' async engines, seen through sync_engine
+        self.async_engines = async_engines
+        self.use_primary = True
+        self._replica_bind = None
+
+    @property
+    def pinned_to_primary(self) -> bool:
+        """Reads go to the primary although replicas exist: a write, or a client inside its
+        read-your-writes window. Cached responses may come from another client's replica read
+        older than this client's last write, so such a session must not be answered from them."""
+        return self.use_primary and self.replicas is not None
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if not self.use_primary and (self._flushing or writes(clause)):
+            self.use_primary = True
+        if self.use_primary or self.replicas is None:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        if self._replica_bind is None:
+            replica = self.replicas.pick()
+            if replica is None:
+                return super().get_bind(mapper, clause=clause, **kwargs)
+            self._replica_bind = replica.async_engine.sync_engine if self.async_engines else replica.engine
+        return self._replica_bind
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""Count the SQL statements a block of code sends to the database.
+
+Two entry points share one engine hook:
+
+* ``count_statements(engine)`` counts everything executed on ``engine`` while the block runs,
+  whatever thread executes it. Use it in tests and benchmarks around a client call.
+* ``track_statements()`` counts only statements issued from the current context, which is
+  what a per-request middleware needs when many requests run concurrently.
+
+``STATEMENT_BUDGETS`` holds the agreed maximum per endpoint, so a regression such as a
+lazy load inside a loop fails loudly instead of quietly multiplying round-trips.
+
+Context counters also record how long each statement took and how long the context waited
+for a pooled connection (see ``app/db/pool.py``), which the request metrics report.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Endpoints that validate or filter against the reference-data cache (app/cache/reference_data.py)
+# may reload it first: genres + directors.
+REFERENCE_RELOAD = 2
+
+# Maximum statements per endpoint, keyed by endpoint function name.
+STATEMENT_BUDGETS: dict[str, int] = {
+    # catalog version (primary key read) + count + page (director joined) + genres selectin
+    "list_movies": 4 + REFERENCE_RELOAD,
+    "get_movie": 2,  # version lookup (conditional requests only) + the joined detail query
+    "get_movies_batch": 2,  # the uncached movies (director joined) + genres selectin
+    # load of a movie written by another worker since the last build (movie + genres), then as
+    # get_movies_batch; index builds read through a session of their own
+    "get_similar_movies": 2 + 2,
+    # every movie write also bumps the catalog version (app/models/catalog_version.py)
+    # movie INSERT + genre links INSERT + catalog bump + the joined detail query
+    "create_movie": 4 + REFERENCE_RELOAD,
+    # UPDATE ... RETURNING + stale links DELETE + missing links INSERT + director/genres SELECT
+    # + catalog bump
+    "update_movie": 5 + REFERENCE_RELOAD,
+    "patch_movie": 5 + REFERENCE_RELOAD,
+    "delete_movie": 3,  # existence check + DELETE + catalog bump
+    # one INSERT on PostgreSQL; guarded INSERT + aggregate UPDATE + rollup upsert + catalog bump
+    # on SQLite (a bucket lookup more on dialects without ON CONFLICT)
+    "create_rating": 4,
+    "list_ratings": 2,
+    "get_rating_distribution": 1,
+    "get_rating_timeseries": 2,  # existence check + rollup range scan
+    # existence check + INSERT pages (1000 rows each on PostgreSQL) + one executemany UPDATE
+    # + rollup upsert pages + catalog bump
+    "bulk_create_ratings": 23,
+    "get_leaderboard": 1 + REFERENCE_RELOAD,  # top N off ix_movies_weighted_score
+    "get_trending": 1,
+}
+
+
+class StatementBudgetExceeded(AssertionError):
+    pass
+
+
+@dataclass
+class StatementCounter:
+    statements: list[str] = field(default_factory=list)
+    # seconds per completed statement, in execution order (context counters only)
+    durations: list[float] = field(default_factory=list)
+    pool_wait_seconds: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def sql_seconds(self) -> float:
+        return sum(self.durations)
+
+    def check(self, budget: int, name: str = "block") -> None:
+        if self.count > budget:
+            listing = "\n".join(f"  {i + 1}. {s}" for i, s in enumerate(self.statements))
+            raise StatementBudgetExceeded(
+                f"{name} issued {self.count} SQL statements, budget is {budget}:\n{listing}"
+            )
+
+
+_context_counters: ContextVar[tuple[StatementCounter, ...]] = ContextVar("sql_statement_counters", default=())
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_context_statement(conn, cursor, statement, parameters, context, executemany):
+    counters = _context_counters.get()
+    for counter in counters:
+        counter.statements.append(statement)
+    if counters and context is not None:
+        context._statement_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_context_duration(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_statement_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    for counter in _context_counters.get():
+        counter.durations.append(elapsed)
+
+
+def record_pool_wait(seconds: float) -> None:
+    for counter in _context_counters.get():
+        counter.pool_wait_seconds += seconds
+
+
+@contextmanager
+def track_statements() -> Iterator[StatementCounter]:
+    counter = StatementCounter()
+    token = _context_counters.set(_context_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _context_counters.reset(token)
+
+
+@contextmanager
+def count_statements(engine: Engine) -> Iterator[StatementCounter]:
+    counter = StatementCounter()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@contextmanager
+def statement_budget(engine: Engine, endpoint: str, budget: int | None = None) -> Iterator[StatementCounter]:
+    """Fail with ``StatementBudgetExceeded`` if the block issues more statements than allowed.
+
+    Usage in a test::
+
+        with statement_budget(engine, "list_movies"):
+            client.get("/api/v1/movies", params={"page_size": 100})
+    """
+    limit = STATEMENT_BUDGETS[endpoint] if budget is None else budget
+    with count_statements(engine) as counter:
+        yield counter
+    counter.check(limit, endpoint)
@@ -1,8 +1,11 @@
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from app.config import ADMISSION_RETRY_AFTER_SECONDS
+
 
 def http_exception_handler(request: Request, exc: StarletteHTTPException):
     return JSONResponse(
@@ -21,4 +24,16 @@ def validation_exception_handler(request: Request, exc: RequestValidationError):
             "status": "failure",
             "error": {"code": 422, "message": "Invalid request data"},
         },
+    )
+
+
+def pool_timeout_exception_handler(request: Request, exc: PoolTimeoutError):
+    # no pooled connection within DB_POOL_TIMEOUT_SECONDS: the database is saturated, not broken
+    return JSONResponse(
+        status_code=503,
+        content={
+            "status": "failure",
+            "error": {"code": 503, "message": "Database is busy, retry later"},
+        },
+        headers={"Retry-After": str(ADMISSION_RETRY_AFTER_SECONDS)},
     )
\ No newline at end of file
@@ -1,19 +1,130 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.exceptions.handlers import http_exception_handler, validation_exception_handler
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.exceptions.handlers import http_exception_handler, pool_timeout_exception_handler, validation_exception_handler
+from app.middleware.admission import admission_control_middleware, admission_controller
+from app.middleware.instrumentation import instrumentation_middleware
+from app.middleware.read_routing import read_routing_middleware
+from app.middleware.statement_budget import statement_budget_middleware
 
+from app.cache.reference_data import reference_data
+from app.cache.response_cache import response_cache
+from app.config import DB_MODE
+from app.db.database import SessionLocal, async_engine, engine, replica_set
+from app.db.pool import pool_stats
+from app.metrics.registry import metrics
+from app.search.ngram_index import movie_search_index
+from app.search.similarity_index import movie_similarity_index
 from app.controller.movie_controller import router as movie_router
-from app.controller.rating_controller import router as rating_router
-app = FastAPI(title="Movie Rating System", version="1.0.0")
+from app.controller.rating_controller import bulk_router as bulk_rating_router, router as rating_router
+from app.controller.leaderboard_controller import router as leaderboard_router
+from app.controller.export_controller import router as export_router
+from app.controller.async_movie_controller import router as async_movie_router
+from app.controller.async_rating_controller import router as async_rating_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # load genres and director ids before the first request instead of during it
+    db = SessionLocal()
+    try:
+        reference_data.load(db)
+    finally:
+        db.close()
+    # built in the background; a request needing an index before then waits for this build
+    if engine.dialect.name != "postgresql":
+        movie_search_index.warm()
+    movie_similarity_index.warm()
+    if replica_set is not None:
+        replica_set.start_health_checks()
+    yield
+    if replica_set is not None:
+        replica_set.stop_health_checks()
+
+
+app = FastAPI(title="Movie Rating System", version="1.0.0", lifespan=lifespan)
 
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
+app.add_exception_handler(PoolTimeoutError, pool_timeout_exception_handler)
+
+app.middleware("http")(read_routing_middleware)
+app.middleware("http")(statement_budget_middleware)
+app.middleware("http")(admission_control_middleware)
+# added last so it is outermost and its timings include the other middleware
+app.middleware("http")(instrumentation_middleware)
 
+if DB_MODE == "async":
+    # registered first, so these take precedence over their sync twins below
+    app.include_router(async_movie_router)
+    app.include_router(async_rating_router)
 app.include_router(movie_router)
 app.include_router(rating_router)
+app.include_router(bulk_rating_router)
+app.include_router(leaderboard_router)
+app.include_router(export_router)
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@app.get("/cache/stats")
+def cache_stats():
+    return {"status": "success", "data": {**response_cache.stats(), "reference_data": reference_data.stats()}}
+
+
+@app.get("/db/pool/stats")
+def db_pool_stats():
+    data = {"sync": pool_stats(engine.pool), "admission": admission_controller.stats()}
+    if async_engine is not None:
+        data["async"] = pool_stats(async_engine.pool)
+    if replica_set is not None:
+        data["replicas"] = replica_set.stats()
+        for replica, stats in zip(replica_set.replicas, data["replicas"]["replicas"]):
+            stats["sync"] = pool_stats(replica.engine.pool)
+            if replica.async_engine is not None:
+                stats["async"] = pool_stats(replica.async_engine.pool)
+    return {"status": "success", "data": data}
+
+
+for _name, _type, _doc in (
+    ("entries", "gauge", "Entries held by the response cache."),
+    ("hits", "counter", "Response cache hits."),
+    ("misses", "counter", "Response cache misses."),
+    ("evictions", "counter", "Entries evicted to stay under the size bound."),
+    ("expirations", "counter", "Entries dropped after their TTL."),
+    ("invalidations", "counter", "Tag invalidations."),
+):
+    _metric = f"response_cache_{_name}" + ("_total" if _type == "counter" else "")
+    metrics.register_callback(_metric, _type, _doc, lambda key=_name: response_cache.stats().get(key))
+
+
+for _name, _type, _doc in (
+    ("checked_out", "gauge", "Connections currently checked out of the sync pool."),
+    ("overflow", "gauge", "Overflow connections currently open in the sync pool."),
+    ("checkouts", "counter", "Connection checkouts from the sync pool."),
+    ("checkout_timeouts", "counter", "Checkouts that gave up after DB_POOL_TIMEOUT_SECONDS."),
+    ("wait_seconds_total", "counter", "Total time spent obtaining connections from the sync pool."),
+):
+    _metric = f"db_pool_{_name}" + ("_total" if _type == "counter" and not _name.endswith("_total") else "")
+    metrics.register_callback(_metric, _type, _doc, lambda key=_name: pool_stats(engine.pool).get(key))
+
+for _name, _type, _doc in (
+    ("in_flight", "gauge", "API requests currently admitted."),
+    ("admitted", "counter", "API requests admitted."),
+    ("rejected", "counter", "API requests shed with 503 by admission control."),
+):
+    _metric = f"admission_{_name}" + ("_total" if _type == "counter" else "")
+    metrics.register_callback(_metric, _type, _doc, lambda key=_name: admission_controller.stats().get(key))
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
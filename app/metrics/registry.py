@@ -0,0 +1,113 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Kept dependency-free: a handful of labelled histograms and gauges is all ``/metrics`` needs.
+Values live per worker process; scrape every worker (or run one) to see all traffic.
+"""
+import bisect
+import math
+import threading
+from typing import Callable, Iterable
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...], buckets: Iterable[float]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # labels -> [per-bucket counts (non-cumulative, last is +Inf), sum, count]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = sorted((labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items())
+        for labels, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._histograms: list[Histogram] = []
+        # name -> (type, documentation, callback returning the current value)
+        self._callbacks: list[tuple[str, str, str, Callable[[], float | None]]] = []
+
+    def histogram(self, name: str, documentation: str, label_names: tuple[str, ...], buckets: Iterable[float]) -> Histogram:
+        histogram = Histogram(name, documentation, label_names, buckets)
+        self._histograms.append(histogram)
+        return histogram
+
+    def register_callback(self, name: str, metric_type: str, documentation: str, callback: Callable[[], float | None]) -> None:
+        """Expose a value read at scrape time (``metric_type`` is "gauge" or "counter")."""
+        self._callbacks.append((name, metric_type, documentation, callback))
+
+    def render(self) -> str:
+        lines = []
+        for histogram in self._histograms:
+            lines.extend(histogram.render())
+        for name, metric_type, documentation, callback in self._callbacks:
+            value = callback()
+            if value is None:
+                continue
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+REQUEST_LABELS = ("method", "route")
+
+request_duration = metrics.histogram(
+    "http_request_duration_seconds", "Time to produce the response headers.", REQUEST_LABELS + ("status",), LATENCY_BUCKETS
+)
+request_sql_statements = metrics.histogram(
+    "http_request_sql_statements", "SQL statements issued per request.", REQUEST_LABELS, STATEMENT_BUCKETS
+)
+request_sql_duration = metrics.histogram(
+    "http_request_sql_duration_seconds", "Cumulative SQL execution time per request.", REQUEST_LABELS, LATENCY_BUCKETS
+)
+request_pool_wait = metrics.histogram(
+    "http_request_db_pool_wait_seconds", "Time spent obtaining pooled connections per request.", REQUEST_LABELS,
+    POOL_WAIT_BUCKETS,
+)
\ No newline at end of file
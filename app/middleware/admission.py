@@ -0,0 +1,118 @@
+import asyncio
+import weakref
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+from app.config import ADMISSION_MAX_IN_FLIGHT, ADMISSION_QUEUE_TIMEOUT_MS, ADMISSION_RETRY_AFTER_SECONDS
+
+# only API routes touch the database; /health and /metrics must answer while saturated
+ADMITTED_PREFIX = "/api/"
+
+
+class AdmissionController:
+    """Bound the DB-bound requests in flight in this worker.
+
+    Matching the limit to the connection pool keeps requests from piling up on pool checkout
+    until ``pool_timeout``: beyond it a request waits at most ``queue_timeout`` seconds for a
+    slot and is then shed with a 503, which clients and load balancers can retry elsewhere.
+    A request keeps its slot until its body has been sent: streamed exports hold a pooled
+    connection for as long as they stream.
+    """
+
+    def __init__(self, max_in_flight: int, queue_timeout: float, retry_after: int):
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._slots = asyncio.Semaphore(max_in_flight) if max_in_flight > 0 else None
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._slots is not None
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting at most ``queue_timeout``; False means shed the request."""
+        if self._slots.locked():
+            if self.queue_timeout <= 0:
+                self.rejected += 1
+                return False
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                return False
+        else:
+            await self._slots.acquire()
+        self.in_flight += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+admission_controller = AdmissionController(
+    ADMISSION_MAX_IN_FLIGHT, ADMISSION_QUEUE_TIMEOUT_MS / 1000, ADMISSION_RETRY_AFTER_SECONDS
+)
+
+
+def overloaded_response(retry_after: int, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"status": "failure", "error": {"code": 503, "message": message}},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+async def admission_control_middleware(request: Request, call_next):
+    if not admission_controller.enabled or not request.url.path.startswith(ADMITTED_PREFIX):
+        return await call_next(request)
+
+    if not await admission_controller.acquire():
+        return overloaded_response(admission_controller.retry_after, "Server is busy, retry later")
+
+    try:
+        response = await call_next(request)
+    except BaseException:
+        admission_controller.release()
+        raise
+    return hold_slot_while_sending(response)
+
+
+def hold_slot_while_sending(response: Response) -> Response:
+    """Release the request's slot once the body has been sent (or sending it failed), not when
+    the handler returns; ``call_next`` hands every response back as a stream."""
+    released = False
+
+    def release() -> None:
+        nonlocal released
+        if not released:
+            released = True
+            admission_controller.release()
+
+    body = response.body_iterator
+
+    async def body_then_release():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            release()
+
+    response.body_iterator = body_then_release()
+    # a body never iterated (the client left before the headers went out) releases with the response
+    weakref.finalize(response, release)
+    return response
\ No newline at end of file
@@ -0,0 +1,67 @@
+import logging
+import time
+
+from fastapi import Request
+
+from app.config import SLOW_REQUEST_THRESHOLD_MS
+from app.db.statement_counter import track_statements
+from app.metrics.registry import request_duration, request_pool_wait, request_sql_duration, request_sql_statements
+
+logger = logging.getLogger(__name__)
+
+# longest statement text kept per line of the slow-request log
+MAX_LOGGED_STATEMENT_CHARS = 1000
+
+
+async def instrumentation_middleware(request: Request, call_next):
+    """Time each request and the SQL it issues; report through ``Server-Timing`` and ``/metrics``.
+
+    Records the route template (so ``/movies/1`` and ``/movies/2`` share one series), total
+    latency, SQL statement count and time, and pool checkout wait. For streamed responses the
+    timings stop when the headers are sent.
+    """
+    started = time.perf_counter()
+    status = 500
+    with track_statements() as counter:
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            elapsed = time.perf_counter() - started
+            route = request.scope.get("route")
+            # unmatched paths are collapsed so scanners cannot blow up the label cardinality
+            template = getattr(route, "path", "unmatched")
+            labels = (request.method, template)
+            request_duration.observe(labels + (str(status),), elapsed)
+            request_sql_statements.observe(labels, counter.count)
+            request_sql_duration.observe(labels, counter.sql_seconds)
+            request_pool_wait.observe(labels, counter.pool_wait_seconds)
+            if SLOW_REQUEST_THRESHOLD_MS and elapsed * 1000 >= SLOW_REQUEST_THRESHOLD_MS:
+                _log_slow_request(request, template, status, elapsed, counter)
+
+    response.headers["Server-Timing"] = (
+        f"app;dur={elapsed * 1000:.1f}, "
+        f'db;dur={counter.sql_seconds * 1000:.1f};desc="{counter.count} statements", '
+        f"pool;dur={counter.pool_wait_seconds * 1000:.1f}"
+    )
+    return response
+
+
+def _log_slow_request(request: Request, template: str, status: int, elapsed: float, counter) -> None:
+    durations = counter.durations + [None] * (counter.count - len(counter.durations))
+    lines = [
+        f"  {i + 1}. {'?' if d is None else f'{d * 1000:.1f}'} ms {' '.join(s.split())[:MAX_LOGGED_STATEMENT_CHARS]}"
+        for i, (s, d) in enumerate(zip(counter.statements, durations))
+    ]
+    logger.warning(
+        "Slow request %s %s (%s) -> %d in %.1f ms; %d SQL statements in %.1f ms, pool wait %.1f ms%s",
+        request.method,
+        request.url.path,
+        template,
+        status,
+        elapsed * 1000,
+        counter.count,
+        counter.sql_seconds * 1000,
+        counter.pool_wait_seconds * 1000,
+        "".join("\n" + line for line in lines),
+    )
\ No newline at end of file
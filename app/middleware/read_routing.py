@@ -0,0 +1,42 @@
+import time
+
+from fastapi import Request
+
+from app.config import DATABASE_REPLICA_URLS, READ_YOUR_WRITES_SECONDS
+
+# holds the unix time until which the client's reads go to the primary
+READ_YOUR_WRITES_COOKIE = "read_primary_until"
+READ_METHODS = ("GET", "HEAD")
+
+
+def reads_from_replica(request: Request) -> bool:
+    """Whether this request's session may read from a replica: a read, and not within the
+    read-your-writes window of the client's last write."""
+    if request.method not in READ_METHODS:
+        return False
+    try:
+        pinned_until = float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0))
+    except ValueError:
+        pinned_until = 0
+    return pinned_until <= time.time()
+
+
+async def read_routing_middleware(request: Request, call_next):
+    """After a successful write, pin the client's reads to the primary for
+    ``READ_YOUR_WRITES_SECONDS`` via a cookie, so it never reads a replica that has not
+    replayed its own write yet. Does nothing without replicas."""
+    response = await call_next(request)
+    if (
+        DATABASE_REPLICA_URLS
+        and READ_YOUR_WRITES_SECONDS > 0
+        and request.method not in READ_METHODS + ("OPTIONS",)
+        and response.status_code < 400
+    ):
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            f"{time.time() + READ_YOUR_WRITES_SECONDS:.3f}",
+            max_age=max(1, round(READ_YOUR_WRITES_SECONDS)),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
\ No newline at end of file
@@ -0,0 +1,32 @@
+import logging
+
+from fastapi import Request
+
+from app.config import SQL_STATEMENT_BUDGET_MODE
+from app.db.statement_counter import STATEMENT_BUDGETS, track_statements
+
+logger = logging.getLogger(__name__)
+
+
+async def statement_budget_middleware(request: Request, call_next):
+    """Count SQL statements per request and hold each endpoint to its ``STATEMENT_BUDGETS`` entry.
+
+    ``SQL_STATEMENT_BUDGET_MODE=warn`` logs overruns, ``enforce`` raises (so a test client fails
+    the test), ``off`` skips counting entirely.
+    """
+    if SQL_STATEMENT_BUDGET_MODE == "off":
+        return await call_next(request)
+
+    with track_statements() as counter:
+        response = await call_next(request)
+
+    response.headers["X-SQL-Statements"] = str(counter.count)
+
+    endpoint = request.scope.get("endpoint")
+    name = getattr(endpoint, "__name__", None)
+    budget = STATEMENT_BUDGETS.get(name)
+    if budget is not None and counter.count > budget:
+        if SQL_STATEMENT_BUDGET_MODE == "enforce":
+            counter.check(budget, name)
+        logger.warning("%s %s issued %d SQL statements (budget %d)", request.method, request.url.path, counter.count, budget)
+    return response
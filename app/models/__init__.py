@@ -2,4 +2,6 @@ from app.models.director import Director  # noqa: F401
 from app.models.genre import Genre  # noqa: F401
 from app.models.movie import Movie  # noqa: F401
 from app.models.movie_rating import MovieRating  # noqa: F401
-from app.models.association import genres_movie  # noqa: F401
\ No newline at end of file
+from app.models.association import genres_movie  # noqa: F401
+from app.models.movie_rating_rollup import MovieRatingRollup  # noqa: F401
+from app.models.catalog_version import CatalogVersion  # noqa: F401
\ No newline at end of file
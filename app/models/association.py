@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Table, Column, Index, Integer, ForeignKey, UniqueConstraint
 from app.db.database import Base
 
 genres_movie = Table(
@@ -7,4 +7,6 @@ genres_movie = Table(
     Column("movie_id", Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True),
     Column("genre_id", Integer, ForeignKey("genres.id", ondelete="CASCADE"), primary_key=True),
     UniqueConstraint("movie_id", "genre_id", name="uq_genres_movie_movie_genre"),
+    # genre filters look movies up by genre_id, which the (movie_id, genre_id) key cannot serve
+    Index("ix_genres_movie_genre_id", "genre_id", "movie_id"),
 )
\ No newline at end of file
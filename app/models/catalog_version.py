@@ -0,0 +1,33 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, event, func, update
+from app.db.database import Base
+
+CATALOG_VERSION_ID = 1
+
+
+def catalog_bump():
+    """UPDATE marking the catalog as changed; every write that changes how a movie is listed
+    (create, update, delete, ratings, imports) runs it in its own transaction."""
+    table = CatalogVersion.__table__
+    return (
+        update(table)
+        .where(table.c.id == CATALOG_VERSION_ID)
+        .values(version=table.c.version + 1, updated_at=func.now())
+    )
+
+
+class CatalogVersion(Base):
+    """A single row versioning the whole catalog, so the ETag of listing pages is one primary
+    key read rather than a scan of ``movies``. Writers update it before committing, which
+    makes concurrent writes on PostgreSQL queue on its row lock until each commits."""
+
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+@event.listens_for(CatalogVersion.__table__, "after_create")
+def _insert_catalog_row(table, connection, **kw):
+    # databases built with create_all (tests, scripts) get the row the migration inserts
+    connection.execute(table.insert().values(id=CATALOG_VERSION_ID))
\ No newline at end of file
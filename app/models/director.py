@@ -6,7 +6,8 @@ class Director(Base):
     __tablename__ = "directors"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False)
+    # indexed for bulk imports, which resolve directors by name
+    name = Column(String(255), nullable=False, index=True)
     birth_year = Column(Integer, nullable=True)
     description = Column(Text, nullable=True)
 
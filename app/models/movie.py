@@ -1,8 +1,21 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String, Text, ForeignKey, func
 from sqlalchemy.orm import relationship
+from app.config import LEADERBOARD_PRIOR_MEAN
 from app.db.database import Base
 from app.models.association import genres_movie
 
+SCORES = range(1, 11)
+
+
+def score_count_column(score: int) -> str:
+    return f"score_{score}_count"
+
+
+def version_bump(movies) -> dict:
+    """UPDATE ... SET values marking a movie row as changed (next version, modified now)."""
+    return {"version": movies.c.version + 1, "updated_at": func.now()}
+
+
 class Movie(Base):
     __tablename__ = "movies"
 
@@ -13,6 +26,47 @@ class Movie(Base):
 
     director_id = Column(Integer, ForeignKey("directors.id", ondelete="RESTRICT"), nullable=False)
 
+    # Rating aggregates, maintained by every rating write path so reads never scan movie_ratings.
+    ratings_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    # Ratings per score; movie_ratings.score is constrained to 1..10, so these ten buckets are the
+    # full distribution (median, percentiles) of a movie's ratings.
+    score_1_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_2_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_3_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_4_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_5_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_6_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_7_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_8_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_9_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_10_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Bayesian average kept in step with the aggregates above; see weighted_score_expression. An
+    # unrated movie scores the prior mean, inserted through the ORM or not (COPY, raw SQL).
+    weighted_score = Column(
+        Float, nullable=False, default=LEADERBOARD_PRIOR_MEAN, server_default=str(LEADERBOARD_PRIOR_MEAN)
+    )
+
+    # Bumped by every write that changes the movie's representation (fields, genres, ratings);
+    # the ETag and Last-Modified validators of the movie endpoints are derived from them.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
     director = relationship("Director", back_populates="movies")
-    genres = relationship("Genre", secondary=genres_movie, back_populates="movies")
-    ratings = relationship("MovieRating", back_populates="movie", cascade="all, delete-orphan")
\ No newline at end of file
+    # passive_deletes: the FKs cascade on delete, so the ORM must not load ratings/links to remove them
+    genres = relationship("Genre", secondary=genres_movie, back_populates="movies", passive_deletes=True)
+    ratings = relationship("MovieRating", back_populates="movie", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        # leaderboards read the top N movies straight off this index
+        Index("ix_movies_weighted_score", weighted_score.desc(), id),
+        # natural key bulk imports deduplicate on (not unique: existing catalogs may repeat it)
+        Index("ix_movies_natural_key", title, director_id, release_year),
+        # pg_trgm indexes serving substring (ILIKE '%q%') search; PostgreSQL only
+        Index(
+            "ix_movies_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_movies_cast_trgm", "cast", postgresql_using="gin", postgresql_ops={"cast": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
\ No newline at end of file
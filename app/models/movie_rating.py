@@ -1,18 +1,29 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, CheckConstraint, func
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, CheckConstraint, Index, func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class MovieRating(Base):
     __tablename__ = "movie_ratings"
 
     id = Column(Integer, primary_key=True, index=True)
-    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), nullable=False, index=True)
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), nullable=False)
 
     score = Column(Integer, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # The Python default keeps every row in one stored format (SQLite's CURRENT_TIMESTAMP drops
+    # microseconds), which the (created_at, id) keyset comparisons rely on.
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now(), nullable=False)
 
     __table_args__ = (
         CheckConstraint("score >= 1 AND score <= 10", name="ck_movie_ratings_score_range"),
+        # serves "ratings of a movie, newest first" pages and covers plain movie_id lookups
+        Index("ix_movie_ratings_movie_created_id", movie_id, created_at.desc(), id),
     )
 
     movie = relationship("Movie", back_populates="ratings")
\ No newline at end of file
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from app.db.database import Base
+
+BUCKET = timedelta(hours=1)
+
+
+def bucket_start(value: datetime) -> datetime:
+    """The UTC hour ``value`` falls in: the rollup bucket a rating created then belongs to."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+class hour_bucket(FunctionElement):
+    """SQL counterpart of ``bucket_start`` for rebuilding rollups from ``movie_ratings``."""
+
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(hour_bucket, "postgresql")
+def _hour_bucket_postgresql(element, compiler, **kw):
+    # truncate in UTC whatever the session's TimeZone is
+    return f"(date_trunc('hour', {compiler.process(element.clauses, **kw)} AT TIME ZONE 'UTC') AT TIME ZONE 'UTC')"
+
+
+@compiles(hour_bucket, "sqlite")
+def _hour_bucket_sqlite(element, compiler, **kw):
+    # the same text format SQLAlchemy stores DateTime values in on SQLite
+    return f"strftime('%Y-%m-%d %H:00:00.000000', {compiler.process(element.clauses, **kw)})"
+
+
+class MovieRatingRollup(Base):
+    """Ratings of a movie per UTC hour, maintained in the same transaction as every rating
+    insert so trending lists and time series never scan ``movie_ratings``."""
+
+    __tablename__ = "movie_rating_rollups"
+
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(DateTime(timezone=True), primary_key=True)
+
+    ratings_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    score_1_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_2_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_3_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_4_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_5_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_6_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_7_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_8_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_9_count = Column(Integer, nullable=False, default=0, server_default="0")
+    score_10_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        # trending: every movie's buckets inside a recent window (the primary key serves time series)
+        Index("ix_movie_rating_rollups_bucket_movie", bucket, movie_id),
+    )
\ No newline at end of file
@@ -0,0 +1,88 @@
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.association import genres_movie
+from app.models.catalog_version import catalog_bump
+from app.models.director import Director
+from app.models.genre import Genre
+from app.models.movie import Movie
+
+# (title, director_id, release_year): what makes two imported movies the same movie
+MovieKey = tuple[str, int, int | None]
+
+
+class CatalogRepository:
+    """Set-based lookups and inserts for bulk catalog imports: each method is one statement
+    however many names or rows it is given (inserts are paged into multi-row VALUES)."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def director_ids_by_name(self, names: set[str]) -> dict[str, int]:
+        """Name -> id of the directors called exactly that; the oldest wins when several share a name."""
+        if not names:
+            return {}
+        return dict(
+            self.db.execute(
+                select(Director.name, func.min(Director.id)).where(Director.name.in_(names)).group_by(Director.name)
+            ).tuples().all()
+        )
+
+    def create_directors(self, names: list[str]) -> dict[str, int]:
+        if not names:
+            return {}
+        rows = self.db.execute(
+            insert(Director.__table__).returning(Director.id, Director.name),
+            [{"name": name} for name in names],
+        )
+        return {name: director_id for director_id, name in rows}
+
+    def genre_ids_by_name(self, names: set[str]) -> dict[str, int]:
+        """Lower-cased name -> id of the genres matching ``names`` (lower-cased) case-insensitively."""
+        if not names:
+            return {}
+        rows = self.db.execute(select(Genre.id, Genre.name).where(func.lower(Genre.name).in_(names)))
+        return {name.lower(): genre_id for genre_id, name in rows}
+
+    def create_genres(self, names: list[str]) -> dict[str, int]:
+        """Lower-cased name -> id of the genres created as ``names``."""
+        if not names:
+            return {}
+        rows = self.db.execute(
+            insert(Genre.__table__).returning(Genre.id, Genre.name),
+            [{"name": name} for name in names],
+        )
+        return {name.lower(): genre_id for genre_id, name in rows}
+
+    def existing_movie_keys(self, keys: set[MovieKey]) -> set[MovieKey]:
+        """The subset of ``keys`` already in the catalog, looked up through ix_movies_natural_key."""
+        if not keys:
+            return set()
+        # title and director_id are never NULL, so a row-value IN on them walks the index; the
+        # release_year is matched here, where NULL equals NULL
+        rows = self.db.execute(
+            select(Movie.title, Movie.director_id, Movie.release_year).where(
+                tuple_(Movie.title, Movie.director_id).in_({key[:2] for key in keys})
+            )
+        )
+        return {tuple(row) for row in rows} & keys
+
+    def insert_movies(self, rows: list[dict]) -> dict[MovieKey, int]:
+        """Insert ``rows`` (movies table columns, distinct natural keys), bump the catalog
+        version and return key -> new id.
+
+        Keying the ids instead of asking for RETURNING in parameter order keeps the insert
+        batched on SQLite, which otherwise falls back to one statement per row.
+        """
+        if not rows:
+            return {}
+        result = self.db.execute(
+            insert(Movie.__table__).returning(Movie.id, Movie.title, Movie.director_id, Movie.release_year), rows
+        )
+        movie_ids = {(title, director_id, release_year): movie_id for movie_id, title, director_id, release_year in result}
+        self.db.execute(catalog_bump())
+        return movie_ids
+
+    def link_genres(self, links: list[dict]) -> None:
+        if links:
+            self.db.execute(insert(genres_movie), links)
\ No newline at end of file
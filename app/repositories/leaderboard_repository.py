@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from sqlalchemy import Float, func, literal, select
+from sqlalchemy.orm import Session
+
+from app.config import LEADERBOARD_MIN_RATINGS, LEADERBOARD_PRIOR_MEAN, LEADERBOARD_PRIOR_WEIGHT
+from app.models.association import genres_movie
+from app.models.movie import Movie
+from app.models.movie_rating_rollup import MovieRatingRollup
+
+
+def weighted_score_expression(ratings_count, rating_sum):
+    """SQL for a movie's Bayesian average given its rating count and sum.
+
+    Every write that changes ``ratings_count``/``rating_sum`` sets ``weighted_score`` from this
+    in the same UPDATE, so the stored score never lags the aggregates.
+    """
+    prior_total = literal(LEADERBOARD_PRIOR_WEIGHT * LEADERBOARD_PRIOR_MEAN, Float)
+    return (rating_sum + prior_total) / (ratings_count + LEADERBOARD_PRIOR_WEIGHT)
+
+
+class LeaderboardRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def top_movies(self, limit: int, genre_id: int | None = None, decade: int | None = None):
+        """The ``limit`` best movies by weighted score, walking ix_movies_weighted_score."""
+        q = select(
+            Movie.id, Movie.title, Movie.release_year, Movie.ratings_count, Movie.rating_sum, Movie.weighted_score
+        ).where(Movie.ratings_count >= LEADERBOARD_MIN_RATINGS)
+        if genre_id is not None:
+            q = q.where(Movie.id.in_(select(genres_movie.c.movie_id).where(genres_movie.c.genre_id == genre_id)))
+        if decade is not None:
+            q = q.where(Movie.release_year >= decade, Movie.release_year < decade + 10)
+        return self.db.execute(q.order_by(Movie.weighted_score.desc(), Movie.id).limit(limit)).all()
+
+    def trending_movies(self, since: datetime, limit: int):
+        """The ``limit`` movies rated most often in the rollup buckets from ``since`` on, with
+        their rating count and sum inside that window; reads ``movie_rating_rollups`` only."""
+        rollups = MovieRatingRollup.__table__
+        window = (
+            select(
+                rollups.c.movie_id,
+                func.sum(rollups.c.ratings_count).label("ratings_count"),
+                func.sum(rollups.c.rating_sum).label("rating_sum"),
+            )
+            .where(rollups.c.bucket >= since)
+            .group_by(rollups.c.movie_id)
+            .subquery()
+        )
+        return self.db.execute(
+            select(Movie.id, Movie.title, Movie.release_year, window.c.ratings_count, window.c.rating_sum)
+            .join(window, window.c.movie_id == Movie.id)
+            .order_by(window.c.ratings_count.desc(), window.c.rating_sum.desc(), Movie.id)
+            .limit(limit)
+        ).all()
\ No newline at end of file
@@ -1,27 +1,89 @@
+import json
+import math
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import case, delete, false, func, insert, literal, or_, select, update
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models.movie import Movie
+from app.config import MOVIE_COUNT_CACHE_TTL_SECONDS, SEARCH_MAX_RESULTS
+from app.models.association import genres_movie
+from app.models.catalog_version import CATALOG_VERSION_ID, CatalogVersion, catalog_bump
+from app.models.movie import SCORES, Movie, score_count_column, version_bump
 from app.models.genre import Genre
-from app.models.movie_rating import MovieRating
 from app.models.director import Director
 from app.schemas.movie import MovieCreate, MovieUpdate
-from sqlalchemy.orm import joinedload
+from app.repositories.pagination import CountCache
+from app.search.ngram_index import movie_search_index, tokenize
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+
+movie_count_cache = CountCache(ttl_seconds=MOVIE_COUNT_CACHE_TTL_SECONDS)
+
+
+RATING_PERCENTILES = (10, 25, 75, 90)
+
+
+def average_rating(ratings_count: int, rating_sum: int) -> float | None:
+    if not ratings_count:
+        return None
+    return round(rating_sum / ratings_count, 2)
+
+
+def score_counts(movie) -> list[int]:
+    """The movie's ratings per score, index 0 holding score 1."""
+    return [getattr(movie, score_count_column(score)) for score in SCORES]
+
+
+def _score_at_rank(counts: list[int], rank: int) -> int:
+    cumulative = 0
+    for score, count in zip(SCORES, counts):
+        cumulative += count
+        if cumulative >= rank:
+            return score
+    raise ValueError(f"rank {rank} exceeds {cumulative} ratings")
+
+
+def rating_distribution(counts: list[int]) -> dict:
+    """Histogram, median and nearest-rank percentiles from the ten per-score counts, in O(10)."""
+    total = sum(counts)
+    histogram = [{"score": score, "count": count} for score, count in zip(SCORES, counts)]
+    if not total:
+        return {"histogram": histogram, "median": None, "percentiles": None}
+    # mean of the two middle ratings when the count is even
+    median = (_score_at_rank(counts, (total + 1) // 2) + _score_at_rank(counts, total // 2 + 1)) / 2
+    return {
+        "histogram": histogram,
+        "median": median,
+        "percentiles": {f"p{p}": _score_at_rank(counts, max(1, math.ceil(p * total / 100))) for p in RATING_PERCENTILES},
+    }
+
+
+def as_utc(value: datetime | None) -> datetime | None:
+    """SQLite hands back naive datetimes; every timestamp the app stores is UTC."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
 
 
 class MovieRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def list_movies(self, page: int, page_size: int, title: str | None, release_year: int | None, genre: str | None):
+    def list_movies(
+        self,
+        page: int,
+        page_size: int,
+        title: str | None,
+        release_year: int | None,
+        genre_ids: list[int] | None,
+        after_id: int | None = None,
+        total_mode: str = "exact",
+        search: str | None = None,
+    ):
+        # director comes from the join below and genres from one batched SELECT ... IN,
+        # so a page costs the same number of statements whatever its size
         q = (
-            self.db.query(
-                Movie,
-                func.count(MovieRating.id).label("ratings_count"),
-                func.avg(MovieRating.score).label("average_rating"),
-            )
-            .outerjoin(MovieRating, MovieRating.movie_id == Movie.id)
+            self.db.query(Movie)
             .join(Director, Director.id == Movie.director_id)
-            .group_by(Movie.id)
+            .options(contains_eager(Movie.director), selectinload(Movie.genres))
         )
 
         # filters (AND)
@@ -29,112 +91,291 @@ class MovieRepository:
             q = q.filter(Movie.title.ilike(f"%{title}%"))
         if release_year is not None:
             q = q.filter(Movie.release_year == release_year)
-        if genre:
-            q = q.join(Movie.genres).filter(Genre.name.ilike(f"%{genre}%"))
+        if genre_ids is not None:
+            # names were resolved to ids up front (app/cache/reference_data.py), so this is an
+            # IN over ix_genres_movie_genre_id instead of a join through genres; a movie with
+            # several matching genres still appears once
+            q = q.filter(
+                Movie.id.in_(select(genres_movie.c.movie_id).where(genres_movie.c.genre_id.in_(genre_ids)))
+                if genre_ids
+                else false()
+            )
 
-        total = q.count()
+        order_by = [Movie.id]
+        if search and tokenize(search):
+            if self.db.get_bind().dialect.name == "postgresql":
+                q, order_by = self._apply_trigram_search(q, search)
+            else:
+                movie_search_index.ensure_built()
+                ranked_ids = movie_search_index.search(search)
+                if not (title or release_year is not None or genre_ids is not None):
+                    # the index alone decides membership and order, so only this page is loaded
+                    return self._search_page(q, ranked_ids, page, page_size, total_mode)
+                q, order_by = self._restrict_to_ranked(q, ranked_ids[:SEARCH_MAX_RESULTS])
 
-        rows = (
-            q.order_by(Movie.id)
-            .offset((page - 1) * page_size)
-            .limit(page_size)
-            .all()
-        )
+        total = self._count_movies(q, total_mode, key=(title, release_year, genre_ids and tuple(genre_ids), search))
+
+        # keyset mode seeks past the last seen id instead of skipping rows with OFFSET
+        q = q.order_by(*order_by)
+        if after_id is not None:
+            q = q.filter(Movie.id > after_id)
+        else:
+            q = q.offset((page - 1) * page_size)
+
+        # one extra row tells us whether there is a next page without a second query
+        rows = q.limit(page_size + 1).all()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
 
-        items = []
-        for movie, ratings_count, average_rating in rows:
-            items.append(
-                {
-                    "id": movie.id,
-                    "title": movie.title,
-                    "release_year": movie.release_year,
-                    "cast": movie.cast,
-                    "director": {"id": movie.director.id, "name": movie.director.name},
-                    "genres": [{"id": g.id, "name": g.name} for g in movie.genres],
-                    "ratings_count": int(ratings_count or 0),
-                    "average_rating": round(float(average_rating), 2) if average_rating is not None else None,
-                }
+        return [self._list_item(movie) for movie in rows], total, has_more
+
+    @staticmethod
+    def _list_item(movie: Movie) -> dict:
+        return {
+            "id": movie.id,
+            "title": movie.title,
+            "release_year": movie.release_year,
+            "cast": movie.cast,
+            "director": {"id": movie.director.id, "name": movie.director.name},
+            "genres": [{"id": g.id, "name": g.name} for g in movie.genres],
+            "ratings_count": movie.ratings_count,
+            "average_rating": average_rating(movie.ratings_count, movie.rating_sum),
+        }
+
+    @staticmethod
+    def _apply_trigram_search(q, search: str):
+        """Keep movies whose title, cast or a genre name contains every token of ``search``,
+        most similar title first. The pg_trgm GIN indexes on title and cast serve the
+        ILIKE '%token%' filters."""
+        for token in tokenize(search):
+            q = q.filter(
+                or_(
+                    Movie.title.icontains(token, autoescape=True),
+                    Movie.cast.icontains(token, autoescape=True),
+                    Movie.genres.any(Genre.name.icontains(token, autoescape=True)),
+                )
             )
+        relevance = func.similarity(Movie.title, search) * 3 + func.word_similarity(
+            search, func.coalesce(Movie.cast, "")
+        )
+        return q, [relevance.desc(), Movie.id]
+
+    @staticmethod
+    def _restrict_to_ranked(q, ranked_ids: list[int]):
+        if not ranked_ids:
+            return q.filter(false()), [Movie.id]
+        rank = case({movie_id: position for position, movie_id in enumerate(ranked_ids)}, value=Movie.id)
+        return q.filter(Movie.id.in_(ranked_ids)), [rank]
+
+    def _search_page(self, q, ranked_ids: list[int], page: int, page_size: int, total_mode: str):
+        offset = (page - 1) * page_size
+        page_ids = ranked_ids[offset:offset + page_size]
+        position = {movie_id: i for i, movie_id in enumerate(page_ids)}
+        rows = q.filter(Movie.id.in_(page_ids)).all() if page_ids else []
+        rows.sort(key=lambda movie: position[movie.id])
+        total = None if total_mode == "none" else len(ranked_ids)
+        return [self._list_item(movie) for movie in rows], total, len(ranked_ids) > offset + page_size
 
-        return items, total
+    def _count_movies(self, q, total_mode: str, key: tuple) -> int | None:
+        if total_mode == "none":
+            return None
+        if total_mode == "estimate":
+            estimate = self._estimate_rows(q)
+            if estimate is not None:
+                return estimate
+            total_mode = "cached"
+        if total_mode == "cached" and not self.db.pinned_to_primary:
+            return movie_count_cache.get_or_compute(key, q.count)
+        return q.count()
+
+    def _estimate_rows(self, q) -> int | None:
+        """Planner row estimate for the filtered query; only PostgreSQL exposes one."""
+        dialect = self.db.get_bind().dialect
+        if dialect.name != "postgresql":
+            return None
+        compiled = q.statement.compile(dialect=dialect)
+        params = compiled.params
+        if compiled.positional:
+            params = tuple(params[name] for name in compiled.positiontup)
+        plan = (
+            self.db.connection()
+            .exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), params)
+            .scalar()
+        )
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
     
     def get_movie(self, movie_id: int):
-        row = (
-            self.db.query(
-                Movie,
-                func.count(MovieRating.id).label("ratings_count"),
-                func.avg(MovieRating.score).label("average_rating"),
-            )
-            .outerjoin(MovieRating, MovieRating.movie_id == Movie.id)
+        movie = (
+            self.db.query(Movie)
             .filter(Movie.id == movie_id)
-            .group_by(Movie.id)
             .options(joinedload(Movie.director), joinedload(Movie.genres))
             .first()
         )
 
-        if not row:
+        if not movie:
             return None
 
-        movie, ratings_count, average_rating = row
+        return self._detail(movie, movie.director, [g.name for g in movie.genres])
+
+    def get_movies(self, movie_ids: list[int]) -> dict[int, dict]:
+        """``get_movie`` for many ids at once: movie id -> detail dict, leaving out ids that do
+        not exist. Two statements whatever the count (director joined, genres selectin)."""
+        if not movie_ids:
+            return {}
+        movies = (
+            self.db.query(Movie)
+            .filter(Movie.id.in_(movie_ids))
+            .options(joinedload(Movie.director), selectinload(Movie.genres))
+            .all()
+        )
+        return {movie.id: self._detail(movie, movie.director, [g.name for g in movie.genres]) for movie in movies}
 
+    @staticmethod
+    def _detail(movie, director, genre_names: list[str]) -> dict:
+        # ``movie`` and ``director`` may be ORM objects or plain rows with the same columns
         return {
             "id": movie.id,
             "title": movie.title,
             "release_year": movie.release_year,
             "cast": movie.cast,
-            "director": {"id": movie.director.id, "name": movie.director.name, "birth_year": movie.director.birth_year, "description": movie.director.description},
-            "genres": [g.name for g in movie.genres],
-            "ratings_count": int(ratings_count or 0),
-            "average_rating": round(float(average_rating), 2) if average_rating is not None else None,
+            "director": {"id": director.id, "name": director.name, "birth_year": director.birth_year, "description": director.description},
+            "genres": genre_names,
+            "ratings_count": movie.ratings_count,
+            "average_rating": average_rating(movie.ratings_count, movie.rating_sum),
+            "rating_distribution": rating_distribution(score_counts(movie)),
+            "version": movie.version,
+            "updated_at": as_utc(movie.updated_at).isoformat().replace("+00:00", "Z"),
         }
+
+    def iter_catalog(self, updated_since: datetime | None = None, batch_size: int = 1000):
+        """Every movie (changed at or after ``updated_since``) with its director name, one row per
+        genre (``genre_name`` NULL when it has none), ordered by movie id. A single query
+        fetched ``batch_size`` rows at a time through a server-side cursor; callers regroup
+        consecutive rows of the same movie."""
+        q = (
+            select(Movie.__table__, Director.name.label("director_name"), Genre.name.label("genre_name"))
+            .join(Director, Director.id == Movie.director_id)
+            .outerjoin(genres_movie, genres_movie.c.movie_id == Movie.id)
+            .outerjoin(Genre, Genre.id == genres_movie.c.genre_id)
+            .order_by(Movie.id, Genre.name)
+        )
+        if updated_since is not None:
+            q = q.where(Movie.updated_at >= updated_since)
+        return self.db.execute(q.execution_options(yield_per=batch_size))
+
+    def catalog_watermark(self, margin: timedelta) -> datetime:
+        """The database clock less ``margin``, the ``updated_since`` for the next incremental
+        export. ``updated_at`` comes from that clock (the transaction start on PostgreSQL, whole
+        seconds on SQLite), so the app server's own clock could run ahead of writes that have
+        not committed yet."""
+        return as_utc(self.db.execute(select(func.now())).scalar_one()) - margin
+
+    def get_movie_state(self, movie_id: int) -> tuple[int, datetime] | None:
+        """``(version, updated_at)`` of a movie, enough to answer a conditional GET."""
+        row = self.db.execute(select(Movie.version, Movie.updated_at).where(Movie.id == movie_id)).first()
+        if row is None:
+            return None
+        return row.version, as_utc(row.updated_at)
+
+    def get_catalog_state(self) -> tuple[int, datetime]:
+        """``(version, updated_at)`` of the catalog (see ``CatalogVersion``): one primary key
+        read, bumped by every write that changes a listing."""
+        row = self.db.execute(
+            select(CatalogVersion.version, CatalogVersion.updated_at).where(CatalogVersion.id == CATALOG_VERSION_ID)
+        ).one()
+        return row.version, as_utc(row.updated_at)
     
-    def create_movie(self, payload: MovieCreate, genres: list[Genre]):
+    def create_movie(self, payload: MovieCreate, genre_ids: list[int]):
         movie = Movie(
             title=payload.title,
             release_year=payload.release_year,
             cast=payload.cast,
             director_id=payload.director_id,
         )
-        movie.genres = genres
         self.db.add(movie)
+        self.db.flush()
+        movie_id = movie.id
+        self._link_genres(movie_id, genre_ids)
+        self.db.execute(catalog_bump())
         self.db.commit()
-        self.db.refresh(movie)
-        return self.get_movie(movie.id)
-
-    def update_movie(self, movie_id: int, payload: MovieUpdate, genres: list[Genre] | None):
-        movie_obj = self.db.query(Movie).filter(Movie.id == movie_id).first()
-        if movie_obj is None:
-            return None  
+        return self.get_movie(movie_id)
 
-        if payload.director_id is not None:
-            movie_obj.director_id = payload.director_id
+    def update_movie(self, movie_id: int, payload: MovieUpdate, genre_ids: list[int] | None):
+        """Apply the fields set in ``payload`` and replace the genres when ``genre_ids`` is given.
 
-        if payload.title is not None:
-            movie_obj.title = payload.title
-        if payload.release_year is not None:
-            movie_obj.release_year = payload.release_year
-        if payload.cast is not None:
-            movie_obj.cast = payload.cast
+        One UPDATE ... RETURNING writes the row and reports it (no row: the movie does not
+        exist), the genre links are diffed with one DELETE and one INSERT ... SELECT, and one
+        SELECT reads the director and the resulting genre names. With the catalog version bump
+        that is three statements, five with genres, and the aggregate detail query is never
+        re-run.
+        """
+        movies = Movie.__table__
+        values = {
+            name: getattr(payload, name)
+            for name in ("title", "release_year", "cast", "director_id")
+            if getattr(payload, name) is not None
+        }
+        row = self.db.execute(
+            update(movies).where(movies.c.id == movie_id).values(**values, **version_bump(movies)).returning(movies)
+        ).first()
+        if row is None:
+            return None
 
-        if genres is not None:
-            movie_obj.genres = genres
+        if genre_ids is not None:
+            self._replace_genres(movie_id, genre_ids)
 
+        related = self.db.execute(
+            select(Director.id, Director.name, Director.birth_year, Director.description, Genre.name.label("genre_name"))
+            .select_from(Director)
+            .outerjoin(genres_movie, genres_movie.c.movie_id == movie_id)
+            .outerjoin(Genre, Genre.id == genres_movie.c.genre_id)
+            .where(Director.id == row.director_id)
+            .order_by(genres_movie.c.genre_id)
+        ).all()
+        self.db.execute(catalog_bump())
         self.db.commit()
-        self.db.refresh(movie_obj)
-        return self.get_movie(movie_id)
+        genre_names = [item.genre_name for item in related if item.genre_name is not None]
+        return self._detail(row, related[0], genre_names)
+
+    def _replace_genres(self, movie_id: int, genre_ids: list[int]) -> None:
+        """Make ``genre_ids`` the movie's genres, touching only the links that change."""
+        stale = delete(genres_movie).where(genres_movie.c.movie_id == movie_id)
+        if genre_ids:
+            stale = stale.where(genres_movie.c.genre_id.not_in(genre_ids))
+        self.db.execute(stale)
+        if not genre_ids:
+            return
+        linked = select(genres_movie.c.genre_id).where(
+            genres_movie.c.movie_id == movie_id, genres_movie.c.genre_id == Genre.id
+        )
+        self.db.execute(
+            insert(genres_movie).from_select(
+                ["movie_id", "genre_id"],
+                select(literal(movie_id), Genre.id).where(Genre.id.in_(genre_ids), ~linked.exists()),
+            )
+        )
+
+    def _link_genres(self, movie_id: int, genre_ids: list[int]) -> None:
+        # the ids were validated against the reference-data cache, so no Genre rows are loaded
+        genre_ids = list(dict.fromkeys(genre_ids))
+        if genre_ids:
+            self.db.execute(insert(genres_movie), [{"movie_id": movie_id, "genre_id": genre_id} for genre_id in genre_ids])
 
     def delete_movie(self, movie_id: int):
         movie_obj = self.db.query(Movie).filter(Movie.id == movie_id).first()
         if movie_obj is None:
             return False
         self.db.delete(movie_obj)
+        self.db.execute(catalog_bump())
         self.db.commit()
         return True
     
-    def get_director_by_id(self, director_id: int):
-        return self.db.query(Director).filter(Director.id == director_id).first()
+    def movie_exists(self, movie_id: int) -> bool:
+        return self.db.scalar(select(Movie.id).where(Movie.id == movie_id)) is not None
 
-    def get_genres_by_ids(self, genre_ids: list[int]):
-        if not genre_ids:
-            return []
-        return self.db.query(Genre).filter(Genre.id.in_(genre_ids)).all()
\ No newline at end of file
+    def existing_movie_ids(self, movie_ids: set[int]) -> set[int]:
+        if not movie_ids:
+            return set()
+        return set(self.db.scalars(select(Movie.id).where(Movie.id.in_(movie_ids))))
\ No newline at end of file
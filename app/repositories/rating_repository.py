@@ -1,22 +1,340 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Integer, Row, and_, bindparam, case, delete, exists, func, insert, literal, or_, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from app.models.catalog_version import catalog_bump
+from app.models.movie import SCORES, Movie, score_count_column, version_bump
 from app.models.movie_rating import MovieRating
+from app.models.movie_rating_rollup import MovieRatingRollup, bucket_start, hour_bucket
+from app.repositories.leaderboard_repository import weighted_score_expression
+
+ROLLUP_COUNTERS = ["ratings_count", "rating_sum", *(score_count_column(score) for score in SCORES)]
+# dialects with INSERT ... ON CONFLICT DO UPDATE; the others read the existing rollups first
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def aggregate_values(movies, count, total, score_counts: dict) -> dict:
+    """UPDATE ... SET values shifting a movie's aggregates by ``count`` ratings summing to
+    ``total``, ``score_counts`` of them per score (literals or bind parameters). SET
+    expressions see the pre-update row, so the score is computed from the shifted values
+    explicitly. New ratings change the movie's representation, so its version is bumped too."""
+    values = {
+        **version_bump(movies),
+        "ratings_count": movies.c.ratings_count + count,
+        "rating_sum": movies.c.rating_sum + total,
+        "weighted_score": weighted_score_expression(movies.c.ratings_count + count, movies.c.rating_sum + total),
+    }
+    for score, delta in score_counts.items():
+        column = score_count_column(score)
+        values[column] = movies.c[column] + delta
+    return values
+
+
+def rollup_upsert(dialect_name: str, rows=None):
+    """INSERT into ``movie_rating_rollups`` that adds to the counters of an existing
+    ``(movie_id, bucket)`` row instead of failing; values come from ``rows`` (a SELECT of
+    ``movie_id, bucket`` followed by ``ROLLUP_COUNTERS``) or from executemany parameters.
+    Only for the dialects in ``UPSERT_INSERTS``."""
+    stmt = UPSERT_INSERTS[dialect_name](MovieRatingRollup.__table__)
+    if rows is not None:
+        stmt = stmt.from_select(["movie_id", "bucket", *ROLLUP_COUNTERS], rows)
+    rollups = MovieRatingRollup.__table__
+    return stmt.on_conflict_do_update(
+        index_elements=[rollups.c.movie_id, rollups.c.bucket],
+        set_={name: rollups.c[name] + stmt.excluded[name] for name in ROLLUP_COUNTERS},
+    )
+
+
+def rollups_from_ratings():
+    """SELECT of ``movie_id, bucket`` and ``ROLLUP_COUNTERS`` computed from ``movie_ratings``:
+    what ``movie_rating_rollups`` must contain."""
+    ratings = MovieRating.__table__
+    bucket = hour_bucket(ratings.c.created_at)
+    return select(
+        ratings.c.movie_id,
+        bucket.label("bucket"),
+        func.count(ratings.c.id).label("ratings_count"),
+        func.sum(ratings.c.score).label("rating_sum"),
+        *(
+            func.sum(case((ratings.c.score == score, 1), else_=0)).label(score_count_column(score))
+            for score in SCORES
+        ),
+    ).group_by(ratings.c.movie_id, bucket)
+
+
+def rebuild_rollups(db, dialect_name: str) -> None:
+    """Recompute every rollup from ``movie_ratings`` inside the caller's transaction (``db`` is
+    a Session or Connection). On PostgreSQL rating writers wait until the caller commits, so
+    none can land between the DELETE and the INSERT."""
+    if dialect_name == "postgresql":
+        db.execute(text("LOCK TABLE movie_ratings IN SHARE MODE"))
+    db.execute(delete(MovieRatingRollup.__table__))
+    db.execute(
+        insert(MovieRatingRollup.__table__).from_select(
+            ["movie_id", "bucket", *ROLLUP_COUNTERS], rollups_from_ratings()
+        )
+    )
 
 
 class RatingRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create_rating(self, movie_id: int, score: int) -> MovieRating:
-        rating = MovieRating(movie_id=movie_id, score=score)
-        self.db.add(rating)
-        self.db.commit()
-        self.db.refresh(rating)
+    def create_rating(self, movie_id: int, score: int) -> Row | None:
+        """Insert a rating and bump the movie's aggregates, then commit.
+
+        Returns the inserted ``(id, movie_id, score, created_at)`` row, or ``None`` when the movie
+        does not exist. On PostgreSQL this is a single statement: the aggregate UPDATE runs in a
+        CTE, the rollup upsert, the catalog version bump and the INSERT read its RETURNING, so a
+        missing movie changes nothing. Other dialects cannot put DML in a CTE and use a guarded
+        INSERT followed by the UPDATE, the upsert and the bump.
+        """
+        movies = Movie.__table__
+        ratings = MovieRating.__table__
+        created_at = datetime.now(timezone.utc)
+        values = [literal(score, Integer), literal(created_at, ratings.c.created_at.type)]
+        returning = (ratings.c.id, ratings.c.movie_id, ratings.c.score, ratings.c.created_at)
+
+        try:
+            if self.db.get_bind().dialect.name == "postgresql":
+                bumped = (
+                    update(movies)
+                    .where(movies.c.id == movie_id)
+                    .values(**aggregate_values(movies, 1, score, {score: 1}))
+                    .returning(movies.c.id)
+                    .cte("bumped")
+                )
+                rollup = {"ratings_count": 1, "rating_sum": score, score_count_column(score): 1}
+                rolled = rollup_upsert(
+                    "postgresql",
+                    select(
+                        bumped.c.id,
+                        literal(bucket_start(created_at), MovieRatingRollup.bucket.type),
+                        *(literal(rollup.get(name, 0), Integer) for name in ROLLUP_COUNTERS),
+                    ),
+                ).cte("rolled")
+                catalog = catalog_bump().where(select(bumped.c.id).exists()).cte("catalog_bumped")
+                rating = self.db.execute(
+                    insert(ratings)
+                    .from_select(["movie_id", "score", "created_at"], select(bumped.c.id, *values))
+                    .returning(*returning)
+                    # not referenced by the INSERT; PostgreSQL runs data-modifying CTEs regardless
+                    .add_cte(rolled, catalog)
+                ).first()
+            else:
+                rating = self.db.execute(
+                    insert(ratings)
+                    .from_select(
+                        ["movie_id", "score", "created_at"],
+                        select(literal(movie_id, Integer), *values).where(
+                            exists().where(movies.c.id == movie_id)
+                        ),
+                    )
+                    .returning(*returning)
+                ).first()
+                if rating is not None:
+                    self.apply_aggregate_delta(movie_id, {score: 1})
+                    self.apply_rollup_deltas({(movie_id, bucket_start(created_at)): {score: 1}})
+                    self.db.execute(catalog_bump())
+            self.db.commit()
+        except IntegrityError:
+            # the movie was deleted between the existence check and the insert
+            self.db.rollback()
+            return None
         return rating
 
+    def bulk_create_ratings(self, rows: list[dict]) -> None:
+        """Insert ``{"movie_id", "score", "created_at"}`` rows as one executemany (multi-row
+        INSERT pages on PostgreSQL) and update the aggregates and rollups; the caller commits.
+
+        No RETURNING: asking for ids in input order makes SQLAlchemy fall back to one INSERT
+        per row on drivers that cannot guarantee that order."""
+        if not rows:
+            return
+        self.db.execute(insert(MovieRating.__table__), rows)
+
+        deltas: dict[int, dict[int, int]] = {}
+        rollup_deltas: dict[tuple[int, datetime], dict[int, int]] = {}
+        for row in rows:
+            for histogram in (
+                deltas.setdefault(row["movie_id"], {}),
+                rollup_deltas.setdefault((row["movie_id"], bucket_start(row["created_at"])), {}),
+            ):
+                histogram[row["score"]] = histogram.get(row["score"], 0) + 1
+        self.apply_aggregate_deltas(deltas)
+        self.apply_rollup_deltas(rollup_deltas)
+        self.db.execute(catalog_bump())
+
+    def apply_aggregate_delta(self, movie_id: int, score_counts: dict[int, int]) -> None:
+        """Shift a movie's stored rating aggregates by ``score_counts`` (score -> number of
+        ratings added, negative when removing) inside the current transaction.
+
+        Every path that inserts or deletes ratings must call this (or ``apply_aggregate_deltas``)
+        before committing, so that ``movies.ratings_count``/``rating_sum`` and the per-score
+        counts always match ``movie_ratings`` and ``movies.weighted_score`` matches them. The
+        same goes for ``apply_rollup_deltas`` and the hourly rollups.
+        """
+        movies = Movie.__table__
+        count = sum(score_counts.values())
+        total = sum(score * n for score, n in score_counts.items())
+        self.db.execute(
+            update(movies)
+            .where(movies.c.id == movie_id)
+            .values(**aggregate_values(movies, count, total, score_counts))
+        )
+
+    def apply_aggregate_deltas(self, deltas: dict[int, dict[int, int]]) -> None:
+        """``apply_aggregate_delta`` for many movies in one executemany round-trip."""
+        if not deltas:
+            return
+        movies = Movie.__table__
+        self.db.execute(
+            update(movies)
+            .where(movies.c.id == bindparam("b_movie_id"))
+            .values(
+                **aggregate_values(
+                    movies,
+                    bindparam("b_count"),
+                    bindparam("b_sum"),
+                    {score: bindparam(f"b_score_{score}") for score in SCORES},
+                )
+            ),
+            # fixed order so concurrent batches lock movie rows in the same sequence
+            [
+                {
+                    "b_movie_id": movie_id,
+                    "b_count": sum(histogram.values()),
+                    "b_sum": sum(score * n for score, n in histogram.items()),
+                    **{f"b_score_{score}": histogram.get(score, 0) for score in SCORES},
+                }
+                for movie_id, histogram in sorted(deltas.items())
+            ],
+        )
+
+    def apply_rollup_deltas(self, deltas: dict[tuple[int, datetime], dict[int, int]]) -> None:
+        """Add ``(movie_id, bucket) -> {score: ratings}`` to ``movie_rating_rollups`` in one
+        executemany upsert inside the current transaction; buckets come from ``bucket_start``.
+
+        Dialects without ON CONFLICT read which of the buckets already exist and run an UPDATE
+        for those and an INSERT for the rest. Two transactions creating the same bucket at once
+        can then conflict on its primary key; the second one fails and is rolled back whole,
+        so the rollups never drift from ``movie_ratings``."""
+        if not deltas:
+            return
+        # fixed order so concurrent batches lock rollup rows in the same sequence
+        params = [
+            {
+                "movie_id": movie_id,
+                "bucket": bucket,
+                "ratings_count": sum(histogram.values()),
+                "rating_sum": sum(score * n for score, n in histogram.items()),
+                **{score_count_column(score): histogram.get(score, 0) for score in SCORES},
+            }
+            for (movie_id, bucket), histogram in sorted(deltas.items())
+        ]
+        dialect_name = self.db.get_bind().dialect.name
+        if dialect_name in UPSERT_INSERTS:
+            self.db.execute(rollup_upsert(dialect_name), params)
+        else:
+            self.merge_rollups(params)
+
+    def merge_rollups(self, params: list[dict]) -> None:
+        """Portable ``rollup_upsert``: add ``params`` (rows of ``movie_id``, ``bucket`` and
+        ``ROLLUP_COUNTERS``) to the existing rollups and insert the missing ones."""
+        rollups = MovieRatingRollup.__table__
+        existing = {
+            (movie_id, bucket_start(bucket))
+            for movie_id, bucket in self.db.execute(
+                select(rollups.c.movie_id, rollups.c.bucket).where(
+                    rollups.c.movie_id.in_({row["movie_id"] for row in params}),
+                    rollups.c.bucket.between(
+                        min(row["bucket"] for row in params), max(row["bucket"] for row in params)
+                    ),
+                )
+            )
+        }
+        updates = [
+            {f"b_{key}": value for key, value in row.items()}
+            for row in params
+            if (row["movie_id"], row["bucket"]) in existing
+        ]
+        inserts = [row for row in params if (row["movie_id"], row["bucket"]) not in existing]
+        if updates:
+            self.db.execute(
+                update(rollups)
+                .where(rollups.c.movie_id == bindparam("b_movie_id"), rollups.c.bucket == bindparam("b_bucket"))
+                .values({name: rollups.c[name] + bindparam(f"b_{name}") for name in ROLLUP_COUNTERS}),
+                updates,
+            )
+        if inserts:
+            self.db.execute(insert(rollups), inserts)
+
+    def get_score_counts(self, movie_id: int) -> Row | None:
+        """``(ratings_count, rating_sum, score_1_count, ..., score_10_count)`` of a movie."""
+        movies = Movie.__table__
+        return self.db.execute(
+            select(
+                movies.c.ratings_count,
+                movies.c.rating_sum,
+                *(movies.c[score_count_column(score)] for score in SCORES),
+            ).where(movies.c.id == movie_id)
+        ).first()
+
+    def list_rollups(self, movie_id: int, since: datetime):
+        """``(bucket, ratings_count, rating_sum)`` of a movie's non-empty hourly buckets from
+        ``since`` on, oldest first; a primary key range scan."""
+        rollups = MovieRatingRollup.__table__
+        return self.db.execute(
+            select(rollups.c.bucket, rollups.c.ratings_count, rollups.c.rating_sum)
+            .where(rollups.c.movie_id == movie_id, rollups.c.bucket >= since)
+            .order_by(rollups.c.bucket)
+        ).all()
+
     def list_ratings(self, movie_id: int):
         return (
             self.db.query(MovieRating)
             .filter(MovieRating.movie_id == movie_id)
-            .order_by(MovieRating.created_at.desc())
+            .order_by(MovieRating.created_at.desc(), MovieRating.id)
             .all()
-        )
\ No newline at end of file
+        )
+
+    def list_ratings_page(self, movie_id: int, limit: int, after: tuple[datetime, int] | None = None):
+        """Up to ``limit`` ratings newest first, resuming after the ``(created_at, id)`` of the
+        last rating already returned; served by ix_movie_ratings_movie_created_id."""
+        q = self.db.query(MovieRating).filter(MovieRating.movie_id == movie_id)
+        if after is not None:
+            created_at, rating_id = after
+            q = q.filter(
+                or_(
+                    MovieRating.created_at < created_at,
+                    and_(MovieRating.created_at == created_at, MovieRating.id > rating_id),
+                )
+            )
+        return q.order_by(MovieRating.created_at.desc(), MovieRating.id).limit(limit).all()
+
+    def iter_ratings(self, movie_id: int, batch_size: int = 1000):
+        """Every rating of a movie, newest first, fetched ``batch_size`` rows at a time through a
+        server-side cursor. Yields plain rows, so nothing accumulates in the identity map."""
+        return (
+            self.db.query(MovieRating.id, MovieRating.movie_id, MovieRating.score, MovieRating.created_at)
+            .filter(MovieRating.movie_id == movie_id)
+            .order_by(MovieRating.created_at.desc(), MovieRating.id)
+            .yield_per(batch_size)
+        )
+
+    def last_rating_id(self) -> int:
+        """The highest rating id, 0 without ratings; the end of the primary key index."""
+        return self.db.execute(select(func.coalesce(func.max(MovieRating.id), 0))).scalar_one()
+
+    def iter_all_ratings(self, after_id: int | None = None, up_to_id: int | None = None, batch_size: int = 1000):
+        """Every rating with ``after_id < id <= up_to_id`` (either bound optional) in id order,
+        fetched ``batch_size`` rows at a time through a server-side cursor."""
+        ratings = MovieRating.__table__
+        q = select(ratings.c.id, ratings.c.movie_id, ratings.c.score, ratings.c.created_at).order_by(ratings.c.id)
+        if after_id is not None:
+            q = q.where(ratings.c.id > after_id)
+        if up_to_id is not None:
+            q = q.where(ratings.c.id <= up_to_id)
+        return self.db.execute(q.execution_options(yield_per=batch_size))
\ No newline at end of file
@@ -1,6 +1,8 @@
-from typing import Any, Optional
+from typing import Generic, TypeVar
 from pydantic import BaseModel
 
+DataT = TypeVar("DataT")
+
 
 class ErrorModel(BaseModel):
     code: int
@@ -12,6 +14,9 @@ class FailureResponse(BaseModel):
     error: ErrorModel
 
 
-class SuccessResponse(BaseModel):
+class SuccessResponse(BaseModel, Generic[DataT]):
+    """``{"status": "success", "data": ...}``; parametrize (``SuccessResponse[MovieDetail]``)
+    to document the payload. Unparametrized, ``data`` is ``Any``."""
+
     status: str = "success"
-    data: Any
\ No newline at end of file
+    data: DataT
\ No newline at end of file
@@ -0,0 +1,35 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    id: int
+    title: str
+    release_year: Optional[int] = None
+    ratings_count: int
+    average_rating: Optional[float] = None
+    weighted_score: float
+
+
+class Leaderboard(BaseModel):
+    genre: Optional[str] = None
+    decade: Optional[int] = None
+    items: List[LeaderboardEntry]
+
+
+class TrendingEntry(BaseModel):
+    rank: int
+    id: int
+    title: str
+    release_year: Optional[int] = None
+    # within the window
+    ratings_count: int
+    average_rating: Optional[float] = None
+
+
+class Trending(BaseModel):
+    window: str
+    since: datetime
+    items: List[TrendingEntry]
\ No newline at end of file
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from datetime import datetime
+from typing import Annotated, Dict, List, Optional
 
 
 class MovieCreate(BaseModel):
@@ -15,4 +16,113 @@ class MovieUpdate(BaseModel):
     release_year: Optional[int] = Field(None, ge=1800, le=3000)
     cast: Optional[str] = None
     director_id: Optional[int] = Field(None, ge=1)
-    genre_ids: Optional[List[int]] = None
\ No newline at end of file
+    genre_ids: Optional[List[int]] = None
+
+
+class MovieImportRecord(BaseModel):
+    """One line of a bulk import. The director is given by id or by name (created when no
+    director has that name); genres by name, created when missing."""
+
+    title: str = Field(..., min_length=1, max_length=255)
+    release_year: Optional[int] = Field(None, ge=1800, le=3000)
+    cast: Optional[str] = None
+    director_id: Optional[int] = Field(None, ge=1)
+    director: Optional[str] = Field(None, min_length=1, max_length=255)
+    genres: List[Annotated[str, Field(min_length=1, max_length=100)]] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def one_director(self):
+        if (self.director_id is None) == (self.director is None):
+            raise ValueError("give exactly one of director_id and director")
+        return self
+
+
+class DirectorSummary(BaseModel):
+    id: int
+    name: str
+
+
+class DirectorOut(DirectorSummary):
+    birth_year: Optional[int] = None
+    description: Optional[str] = None
+
+
+class GenreOut(BaseModel):
+    id: int
+    name: str
+
+
+class HistogramBucket(BaseModel):
+    score: int
+    count: int
+
+
+class RatingDistribution(BaseModel):
+    histogram: List[HistogramBucket]
+    median: Optional[float] = None
+    percentiles: Optional[Dict[str, int]] = None
+
+
+class MovieListItem(BaseModel):
+    id: int
+    title: str
+    release_year: Optional[int] = None
+    cast: Optional[str] = None
+    director: DirectorSummary
+    genres: List[GenreOut]
+    ratings_count: int
+    average_rating: Optional[float] = None
+
+
+class MoviePage(BaseModel):
+    # absent in cursor mode
+    page: Optional[int] = None
+    page_size: int
+    total_items: Optional[int] = None
+    next_cursor: Optional[str] = None
+    items: List[MovieListItem]
+
+
+class MovieDetail(BaseModel):
+    id: int
+    title: str
+    release_year: Optional[int] = None
+    cast: Optional[str] = None
+    director: DirectorOut
+    genres: List[str]
+    ratings_count: int
+    average_rating: Optional[float] = None
+    rating_distribution: RatingDistribution
+    version: int
+    updated_at: datetime
+
+
+class MovieBatch(BaseModel):
+    items: List[MovieDetail]
+    missing_ids: List[int]
+
+
+class SimilarMovie(MovieDetail):
+    # cosine similarity of the feature vectors, see app/search/similarity_index.py
+    similarity: float
+
+
+class SimilarMovies(BaseModel):
+    items: List[SimilarMovie]
+
+
+class MovieImportError(BaseModel):
+    line: int
+    error: str
+
+
+class MovieImportSummary(BaseModel):
+    created: int
+    # natural key (title, director, release_year) already in the catalog or earlier in the input
+    existing: int
+    rejected: int
+    directors_created: int
+    genres_created: int
+    errors: List[MovieImportError]
+    # more rows were rejected than IMPORT_MAX_REPORTED_ERRORS lists
+    errors_truncated: bool
\ No newline at end of file
@@ -1,5 +1,9 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import List, Optional
+
+from app.config import BULK_RATINGS_MAX_RECORDS
+from app.schemas.movie import RatingDistribution
 
 
 class RatingCreate(BaseModel):
@@ -10,4 +14,58 @@ class RatingOut(BaseModel):
     id: int
     movie_id: int
     score: int
-    created_at: datetime
\ No newline at end of file
+    created_at: datetime
+
+
+class RatingCreated(BaseModel):
+    rating_id: int
+    movie_id: int
+    score: int
+    created_at: datetime
+
+
+class RatingPage(BaseModel):
+    limit: int
+    next_cursor: Optional[str] = None
+    items: List[RatingOut]
+
+
+class MovieRatingDistribution(RatingDistribution):
+    movie_id: int
+    ratings_count: int
+    average_rating: Optional[float] = None
+
+
+class BulkRatingRecord(BaseModel):
+    movie_id: int
+    score: int
+    created_at: Optional[datetime] = None
+
+
+class BulkRatingCreate(BaseModel):
+    ratings: List[BulkRatingRecord] = Field(..., min_length=1, max_length=BULK_RATINGS_MAX_RECORDS)
+
+
+class TimeseriesPoint(BaseModel):
+    bucket: datetime
+    ratings_count: int
+    average_rating: Optional[float] = None
+
+
+class RatingTimeseries(BaseModel):
+    movie_id: int
+    interval: str
+    since: datetime
+    points: List[TimeseriesPoint]
+
+
+class BulkRatingResult(BaseModel):
+    index: int
+    status: str
+    error: Optional[str] = None
+
+
+class BulkRatingSummary(BaseModel):
+    accepted: int
+    rejected: int
+    results: List[BulkRatingResult]
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""In-process trigram inverted index for movie search.
+
+Used when the database has no trigram support (SQLite, tests). The index maps every
+3-character gram of the title, cast and genre names to the movies containing it, so a
+query only verifies the movies whose grams all match instead of scanning the catalog.
+It is built and kept fresh as described in app/search/rebuild.py.
+"""
+import re
+from collections import defaultdict
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import SEARCH_INDEX_MAX_AGE_SECONDS
+from app.models.association import genres_movie
+from app.models.genre import Genre
+from app.models.movie import Movie
+from app.search.rebuild import RebuildableIndex
+
+NGRAM_SIZE = 3
+
+# A token found in the title outranks one found in a genre name, which outranks the cast.
+FIELD_WEIGHTS = {"title": 3.0, "genres": 2.0, "cast": 1.0}
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str | None) -> list[str]:
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def ngrams(text: str) -> set[str]:
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class MovieSearchIndex(RebuildableIndex):
+    STATE = ("_docs", "_postings")
+
+    def __init__(self, max_age_seconds: float | None = None):
+        super().__init__(max_age_seconds)
+        self._docs: dict[int, dict[str, str]] = {}
+        self._postings: dict[str, dict[str, set[int]]] = {field: defaultdict(set) for field in FIELD_WEIGHTS}
+
+    def upsert(self, movie_id: int, title: str, cast: str | None, genres: list[str]) -> None:
+        """Reflect a created or updated movie; a no-op until the index has been built."""
+        with self._lock:
+            if self._record("_upsert", movie_id, title, cast, genres):
+                self._upsert(movie_id, title, cast, genres)
+
+    def remove(self, movie_id: int) -> None:
+        with self._lock:
+            if self._record("_remove", movie_id):
+                self._remove(movie_id)
+
+    def search(self, query: str, limit: int | None = None) -> list[int]:
+        """Return ids of movies whose fields contain every query token, best match first."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            scores: dict[int, float] | None = None
+            # indexed (longer) tokens first, so short ones only scan the surviving candidates
+            for token in sorted(tokens, key=len, reverse=True):
+                # lowest weight first, so a movie keeps the best field the token appears in
+                token_scores: dict[int, float] = {}
+                for field, weight in sorted(FIELD_WEIGHTS.items(), key=lambda item: item[1]):
+                    token_scores.update(dict.fromkeys(self._match(field, token, scores), weight))
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {movie_id: s + token_scores[movie_id] for movie_id, s in scores.items() if movie_id in token_scores}
+                if not scores:
+                    return []
+
+            phrase = " ".join(tokens)
+            for movie_id in scores:
+                title = self._docs[movie_id]["title"]
+                if title == phrase:
+                    scores[movie_id] += 2.0
+                elif title.startswith(phrase):
+                    scores[movie_id] += 1.0
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [movie_id for movie_id, _ in ranked]
+
+    def _match(self, field: str, token: str, within: dict[int, float] | None) -> set[int]:
+        grams = ngrams(token)
+        if not grams:
+            # too short to have been indexed
+            movie_ids = self._docs if within is None else within
+            return {movie_id for movie_id in movie_ids if token in self._docs[movie_id][field]}
+        postings = self._postings[field]
+        lists = sorted((postings.get(g, set()) for g in grams), key=len)
+        matched = set(lists[0]).intersection(*lists[1:])
+        if len(token) > NGRAM_SIZE:
+            # sharing every gram does not guarantee the grams are adjacent
+            matched = {movie_id for movie_id in matched if token in self._docs[movie_id][field]}
+        return matched
+
+    def _load(self, session: Session) -> None:
+        genre_names: dict[int, list[str]] = defaultdict(list)
+        for movie_id, name in session.execute(
+            select(genres_movie.c.movie_id, Genre.name).join(Genre, Genre.id == genres_movie.c.genre_id)
+        ):
+            genre_names[movie_id].append(name)
+        for movie_id, title, cast in session.execute(select(Movie.id, Movie.title, Movie.cast)):
+            self._add(movie_id, title, cast, genre_names.get(movie_id, []))
+
+    def _upsert(self, movie_id: int, title: str, cast: str | None, genres: list[str]) -> None:
+        self._remove(movie_id)
+        self._add(movie_id, title, cast, genres)
+
+    def _add(self, movie_id: int, title: str, cast: str | None, genres: list[str]) -> None:
+        doc = {
+            "title": " ".join(tokenize(title)),
+            "cast": " ".join(tokenize(cast)),
+            "genres": " ".join(tokenize(" ".join(genres))),
+        }
+        self._docs[movie_id] = doc
+        for field, text in doc.items():
+            postings = self._postings[field]
+            for g in set().union(*(ngrams(token) for token in text.split())):
+                postings[g].add(movie_id)
+
+    def _remove(self, movie_id: int) -> None:
+        doc = self._docs.pop(movie_id, None)
+        if doc is None:
+            return
+        for field, text in doc.items():
+            postings = self._postings[field]
+            for g in set().union(*(ngrams(token) for token in text.split())):
+                movie_ids = postings.get(g)
+                if movie_ids is not None:
+                    movie_ids.discard(movie_id)
+                    if not movie_ids:
+                        del postings[g]
+
+
+movie_search_index = MovieSearchIndex(max_age_seconds=SEARCH_INDEX_MAX_AGE_SECONDS)
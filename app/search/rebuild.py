@@ -0,0 +1,108 @@
+"""Build-and-swap lifecycle shared by the in-process search indexes.
+
+An index is built by one thread at a time (``_build_lock``) into a fresh instance, reading
+the database through a session of its own, and swapped in whole under ``_lock``; queries and
+writes keep using the previous contents meanwhile instead of queueing behind the read.
+Writes made while a build runs are journaled and replayed onto the fresh contents just
+before the swap, so none is lost whichever side of the build's read it committed on.
+
+The first build runs at startup (``warm``); a request that needs the index before that
+finishes waits for it rather than starting another. Once the index is ``max_age_seconds``
+old, the next request starts a background rebuild and is answered from the current contents.
+"""
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class RebuildableIndex(ABC):
+    # attributes holding the indexed contents, taken over from the freshly built instance
+    STATE: tuple[str, ...] = ()
+
+    def __init__(self, max_age_seconds: float | None = None):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        # (method name, args) of the writes made while a build runs
+        self._journal: list[tuple[str, tuple]] | None = None
+        self._built_at: float | None = None
+        self.builds = 0
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def is_stale(self) -> bool:
+        built_at = self._built_at
+        return built_at is None or (
+            self.max_age_seconds is not None and time.monotonic() - built_at > self.max_age_seconds
+        )
+
+    def ensure_built(self) -> None:
+        """Build now if the index never was (or wait for the build under way); when it is only
+        stale, start a rebuild in the background and return straight away."""
+        if self._built_at is None:
+            with self._build_lock:
+                if self._built_at is None:
+                    self._build()
+        elif self.is_stale():
+            self.warm()
+
+    def warm(self) -> None:
+        """Build (or rebuild, when stale) in a background thread, unless a build is under way."""
+        if not self._build_lock.locked():
+            threading.Thread(target=self._build_if_stale, name=f"{type(self).__name__}-build", daemon=True).start()
+
+    def build(self, session: Session | None = None) -> None:
+        with self._build_lock:
+            self._build(session)
+
+    def _build_if_stale(self) -> None:
+        if not self._build_lock.acquire(blocking=False):
+            return
+        try:
+            if self.is_stale():
+                self._build()
+        except Exception:
+            logger.exception("building %s failed", type(self).__name__)
+        finally:
+            self._build_lock.release()
+
+    def _build(self, session: Session | None = None) -> None:
+        fresh = type(self)()
+        with self._lock:
+            self._journal = []
+        try:
+            if session is None:
+                with SessionLocal() as own_session:
+                    fresh._load(own_session)
+            else:
+                fresh._load(session)
+            with self._lock:
+                for name, args in self._journal:
+                    getattr(fresh, name)(*args)
+                for attr in self.STATE:
+                    setattr(self, attr, getattr(fresh, attr))
+                self._built_at = time.monotonic()
+                self.builds += 1
+        finally:
+            with self._lock:
+                self._journal = None
+
+    @abstractmethod
+    def _load(self, session: Session) -> None:
+        """Fill this (fresh, unshared) instance from the database."""
+
+    def _record(self, name: str, *args) -> bool:
+        """Journal a write for the build under way; whether the current contents take it too
+        (not before the first build, which will include it). Call with ``_lock`` held."""
+        if self._journal is not None:
+            self._journal.append((name, args))
+        return self._built_at is not None
\ No newline at end of file
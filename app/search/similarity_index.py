@@ -0,0 +1,295 @@
+"""In-process index answering "movies like this one" by cosine similarity.
+
+Every movie is a sparse binary feature vector: its director, each cast member, each genre
+and its release decade, scaled by ``FEATURE_WEIGHTS``. Fixed weights (rather than ones
+derived from the catalog, like idf) mean a create, update or delete only touches that movie's
+own entries, so writes are reflected immediately instead of forcing a rebuild.
+
+Scoring every movie sharing a feature with the query would walk the postings of its genres
+and decade, tens of thousands of movies each on a large catalog. Instead:
+
+* genres and decade have few combinations. Movies with the same (decade, genres) signature
+  share the same dot product with the query, so within a signature group the best match is
+  simply the movie with the smallest vector norm. Groups are kept sorted by norm and taken in
+  classes (which of the query's genres they share, and whether its decade), best first, each
+  one found by intersecting the per-genre and per-decade group sets;
+* the director and cast member postings are kept sorted by norm too. A movie's score is at
+  most (everything it could share) / (query norm * its norm), so each list is only walked
+  over the norms at which a movie can still beat the current ``limit``-th best, and groups
+  and classes are dropped on the same bound.
+
+The ranking is exact (ties broken by movie id). The index is built and kept fresh as
+described in app/search/rebuild.py.
+"""
+import heapq
+import itertools
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import SIMILARITY_INDEX_MAX_AGE_SECONDS
+from app.models.association import genres_movie
+from app.models.genre import Genre
+from app.models.movie import Movie
+from app.search.ngram_index import tokenize
+from app.search.rebuild import RebuildableIndex
+
+FEATURE_WEIGHTS = {"director": 2.0, "cast": 1.5, "genre": 1.0, "decade": 0.75}
+# what one shared feature adds to a dot product
+SQUARED_WEIGHTS = {feature: weight * weight for feature, weight in FEATURE_WEIGHTS.items()}
+
+# (decade or None, lower-cased genre names)
+Signature = tuple[int | None, frozenset[str]]
+
+
+class MovieVector(NamedTuple):
+    director_id: int
+    cast: frozenset[str]
+    signature: Signature
+    norm: float
+
+
+class SignatureGroup:
+    """The movies sharing one signature. Hashed by identity, so sets of groups combine fast."""
+
+    __slots__ = ("signature", "members")
+
+    def __init__(self, signature: Signature):
+        self.signature = signature
+        # (norm, movie id), sorted
+        self.members: list[tuple[float, int]] = []
+
+
+def cast_members(cast: str | None) -> frozenset[str]:
+    """The comma-separated cast list as normalized names ("Tom  Hanks" and "tom hanks" match)."""
+    if not cast:
+        return frozenset()
+    return frozenset(name for name in (" ".join(tokenize(part)) for part in cast.split(",")) if name)
+
+
+def make_vector(director_id: int, release_year: int | None, cast: str | None, genres: list[str]) -> MovieVector:
+    members = cast_members(cast)
+    decade = release_year // 10 * 10 if release_year is not None else None
+    genre_names = frozenset(name.lower() for name in genres)
+    norm = math.sqrt(
+        SQUARED_WEIGHTS["director"]
+        + len(members) * SQUARED_WEIGHTS["cast"]
+        + len(genre_names) * SQUARED_WEIGHTS["genre"]
+        + (SQUARED_WEIGHTS["decade"] if decade is not None else 0.0)
+    )
+    return MovieVector(director_id, members, (decade, genre_names), norm)
+
+
+def cosine(a: MovieVector, b: MovieVector) -> float:
+    dot = (
+        (SQUARED_WEIGHTS["director"] if a.director_id == b.director_id else 0.0)
+        + len(a.cast & b.cast) * SQUARED_WEIGHTS["cast"]
+        + len(a.signature[1] & b.signature[1]) * SQUARED_WEIGHTS["genre"]
+        + (SQUARED_WEIGHTS["decade"] if a.signature[0] is not None and a.signature[0] == b.signature[0] else 0.0)
+    )
+    return dot / (a.norm * b.norm)
+
+
+def _discard(members: list[tuple[float, int]], entry: tuple[float, int]) -> None:
+    position = bisect_left(members, entry)
+    if position < len(members) and members[position] == entry:
+        del members[position]
+
+
+class MovieSimilarityIndex(RebuildableIndex):
+    STATE = ("_vectors", "_postings", "_groups", "_signatures")
+
+    def __init__(self, max_age_seconds: float | None = None):
+        super().__init__(max_age_seconds)
+        self._vectors: dict[int, MovieVector] = {}
+        # ("director", id) / ("cast", name) -> [(norm, movie id)], sorted
+        self._postings: dict[tuple, list[tuple[float, int]]] = defaultdict(list)
+        self._groups: dict[Signature, SignatureGroup] = {}
+        # ("genre", name) / ("decade", decade) -> groups whose signature contains it
+        self._signatures: dict[tuple, set[SignatureGroup]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def load(self, session: Session, movie_id: int) -> bool:
+        """Index one movie straight from the database (one written by another worker since the
+        last build); False when it does not exist."""
+        row = session.execute(
+            select(Movie.director_id, Movie.release_year, Movie.cast).where(Movie.id == movie_id)
+        ).first()
+        if row is None:
+            return False
+        self.upsert(movie_id, *row, self._genre_names(session, movie_id).get(movie_id, []))
+        return True
+
+    def upsert(self, movie_id: int, director_id: int, release_year: int | None, cast: str | None, genres: list[str]) -> None:
+        """Reflect a created or updated movie; a no-op until the index has been built."""
+        with self._lock:
+            if self._record("_upsert", movie_id, director_id, release_year, cast, genres):
+                self._upsert(movie_id, director_id, release_year, cast, genres)
+
+    def remove(self, movie_id: int) -> None:
+        with self._lock:
+            if self._record("_remove", movie_id):
+                self._remove(movie_id)
+
+    def similar(self, movie_id: int, limit: int) -> list[tuple[int, float]] | None:
+        """The ``limit`` movies most similar to ``movie_id`` as (id, cosine similarity), best
+        first; None when the movie is not indexed. Movies sharing no feature are left out."""
+        with self._lock:
+            query = self._vectors.get(movie_id)
+            if query is None:
+                return None
+
+            scores: dict[int, float] = {}
+            # the best ``limit`` scores so far, as a min-heap
+            best: list[float] = []
+
+            def score(other: int) -> None:
+                value = scores[other] = cosine(query, self._vectors[other])
+                if len(best) < limit:
+                    heapq.heappush(best, value)
+                elif value > best[0]:
+                    heapq.heapreplace(best, value)
+
+            def cut() -> float:
+                """The dot product over its norm a movie needs to beat the ``limit``-th best score,
+                a hair low so rounding never drops a movie that ties it; 0 until there are enough."""
+                return best[0] * query.norm * (1 - 1e-9) if len(best) == limit else 0.0
+
+            def walk(feature: tuple, most: float, unshared: float) -> None:
+                """Score the movies of a posting list that can still make the cut. A movie's dot
+                product is at most ``most`` and at most its own squared norm less ``unshared``;
+                over its norm, that rules out both ends of the (norm-sorted) list."""
+                members = self._postings.get(feature, [])
+                start, end = 0, len(members)
+                needed = cut()
+                if needed:
+                    start = bisect_left(members, ((needed + math.sqrt(needed * needed + 4 * unshared)) / 2, -1))
+                    end = bisect_right(members, (most / needed, math.inf))
+                for i in range(start, end):
+                    other = members[i][1]
+                    if other not in scores and other != movie_id:
+                        score(other)
+
+            decade, genres = query.signature
+            most_shared = len(genres) * SQUARED_WEIGHTS["genre"] + (SQUARED_WEIGHTS["decade"] if decade is not None else 0.0)
+            cast_left = len(query.cast) * SQUARED_WEIGHTS["cast"]
+            # the director's movies first: few, and the highest weight sets a threshold soonest
+            walk(("director", query.director_id), SQUARED_WEIGHTS["director"] + cast_left + most_shared, 0.0)
+
+            # then the signature groups, in classes by which of the query's genres they share and
+            # whether they share its decade, the highest dot product first. A movie sharing only
+            # those scores dot / (query norm * its norm): a group is walked from its smallest norm
+            # while that can make the cut, and the classes stop once even the smallest norm such a
+            # movie can have, sqrt(director weight + dot), cannot
+            by_genre = {name: self._signatures.get(("genre", name), set()) for name in genres}
+            same_decade = self._signatures.get(("decade", decade), set()) if decade is not None else set()
+            classes = [
+                (len(shared) * SQUARED_WEIGHTS["genre"] + (SQUARED_WEIGHTS["decade"] if in_decade else 0.0), shared, in_decade)
+                for size in range(len(genres) + 1)
+                for shared in itertools.combinations(sorted(genres), size)
+                for in_decade in ((True, False) if decade is not None else (False,))
+                if shared or in_decade
+            ]
+            for dot, shared, in_decade in sorted(classes, key=lambda item: -item[0]):
+                if dot / math.sqrt(SQUARED_WEIGHTS["director"] + dot) < cut():
+                    break
+                groups = set.intersection(*(by_genre[name] for name in shared)) if shared else set(same_decade)
+                if shared:
+                    groups = groups & same_decade if in_decade else groups - same_decade
+                for name in genres.difference(shared):
+                    groups -= by_genre[name]
+                for group in groups:
+                    needed = cut()
+                    for norm, other in group.members:
+                        if dot / norm < needed:
+                            break
+                        if other not in scores and other != movie_id:
+                            score(other)
+                            needed = cut()
+
+            # and last the movies sharing a cast member. One not scored yet does not share the
+            # director or an earlier cast member, or it could not make the cut anyway
+            for name in query.cast:
+                walk(("cast", name), cast_left + most_shared, SQUARED_WEIGHTS["director"])
+                cast_left -= SQUARED_WEIGHTS["cast"]
+
+        ranked = heapq.nsmallest(limit, ((-value, other) for other, value in scores.items()))
+        return [(other, round(-value, 6)) for value, other in ranked]
+
+    def _load(self, session: Session) -> None:
+        genre_names = self._genre_names(session)
+        for movie_id, director_id, release_year, cast in session.execute(
+            select(Movie.id, Movie.director_id, Movie.release_year, Movie.cast)
+        ):
+            self._add(movie_id, make_vector(director_id, release_year, cast, genre_names.get(movie_id, [])), sort=False)
+        for members in self._postings.values():
+            members.sort()
+        for group in self._groups.values():
+            group.members.sort()
+
+    @staticmethod
+    def _genre_names(session: Session, movie_id: int | None = None) -> dict[int, list[str]]:
+        q = select(genres_movie.c.movie_id, Genre.name).join(Genre, Genre.id == genres_movie.c.genre_id)
+        if movie_id is not None:
+            q = q.where(genres_movie.c.movie_id == movie_id)
+        genre_names: dict[int, list[str]] = defaultdict(list)
+        for genre_movie_id, name in session.execute(q):
+            genre_names[genre_movie_id].append(name)
+        return genre_names
+
+    @staticmethod
+    def _specific_features(vector: MovieVector) -> list[tuple]:
+        # director first: the highest weight raises the threshold for the cast lists soonest
+        return [("director", vector.director_id)] + [("cast", name) for name in vector.cast]
+
+    @staticmethod
+    def _shared_features(signature: Signature) -> list[tuple]:
+        decade, genres = signature
+        return [("genre", name) for name in genres] + ([("decade", decade)] if decade is not None else [])
+
+    def _upsert(self, movie_id: int, director_id: int, release_year: int | None, cast: str | None, genres: list[str]) -> None:
+        self._remove(movie_id)
+        self._add(movie_id, make_vector(director_id, release_year, cast, genres))
+
+    def _add(self, movie_id: int, vector: MovieVector, sort: bool = True) -> None:
+        group = self._groups.get(vector.signature)
+        if group is None:
+            group = self._groups[vector.signature] = SignatureGroup(vector.signature)
+            for feature in self._shared_features(vector.signature):
+                self._signatures[feature].add(group)
+        self._vectors[movie_id] = vector
+        entry = (vector.norm, movie_id)
+        for members in [group.members, *(self._postings[feature] for feature in self._specific_features(vector))]:
+            if sort:
+                insort(members, entry)
+            else:
+                members.append(entry)
+
+    def _remove(self, movie_id: int) -> None:
+        vector = self._vectors.pop(movie_id, None)
+        if vector is None:
+            return
+        entry = (vector.norm, movie_id)
+        for feature in self._specific_features(vector):
+            members = self._postings[feature]
+            _discard(members, entry)
+            if not members:
+                del self._postings[feature]
+        group = self._groups[vector.signature]
+        _discard(group.members, entry)
+        if not group.members:
+            del self._groups[vector.signature]
+            for feature in self._shared_features(vector.signature):
+                groups = self._signatures[feature]
+                groups.discard(group)
+                if not groups:
+                    del self._signatures[feature]
+
+
+movie_similarity_index = MovieSimilarityIndex(max_age_seconds=SIMILARITY_INDEX_MAX_AGE_SECONDS)
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""Bulk catalog import: movies from NDJSON or CSV lines, resolved and inserted a chunk at a time.
+
+Each chunk of ``IMPORT_CHUNK_SIZE`` records is one transaction and a handful of statements:
+directors and genres named in the chunk are looked up (and the missing ones created) in one
+statement each, movies already in the catalog are found by their natural key
+(title, director, release_year) in one more, and the new movies and their genre links are
+inserted with multi-row statements. Records whose key already exists are skipped, so
+re-running an import only adds what is new. Invalid records are rejected with their line
+number and do not stop the import.
+
+Two imports running at once can both insert the same new movie: the natural key is indexed
+but, because older catalogs may already repeat it, not unique.
+"""
+import csv
+import json
+from typing import Iterable, Literal
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.cache.reference_data import reference_data
+from app.cache.response_cache import LIST_TAG, response_cache
+from app.config import IMPORT_CHUNK_SIZE, IMPORT_MAX_REPORTED_ERRORS
+from app.repositories.catalog_repository import CatalogRepository, MovieKey
+from app.schemas.movie import MovieImportRecord
+from app.search.ngram_index import movie_search_index
+from app.search.similarity_index import movie_similarity_index
+
+ImportFormat = Literal["ndjson", "csv"]
+
+
+def validation_message(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    location = ".".join(str(part) for part in error["loc"])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+class RecordParser:
+    """Turns input lines into ``(line number, record dict or error message)`` pairs. Keeps the
+    line count and the CSV header between calls, so a stream can be parsed piece by piece.
+    CSV records must fit on one line; ``genres`` cells separate names with ``|``."""
+
+    def __init__(self, format: ImportFormat):
+        self.format = format
+        self.line = 0
+        self.header: list[str] | None = None
+
+    def parse(self, lines: Iterable[str]):
+        for line in lines:
+            self.line += 1
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            if self.format == "ndjson":
+                try:
+                    record = json.loads(line)
+                except ValueError as exc:
+                    yield self.line, f"Invalid JSON: {exc}"
+                    continue
+                if not isinstance(record, dict):
+                    yield self.line, "Expected a JSON object"
+                    continue
+                yield self.line, record
+                continue
+
+            values = next(csv.reader([line]))
+            if self.header is None:
+                self.header = [name.strip() for name in values]
+                continue
+            record = {name: value for name, value in zip(self.header, values) if value != ""}
+            if "genres" in record:
+                record["genres"] = [name for name in record["genres"].split("|") if name.strip()]
+            yield self.line, record
+
+
+class CatalogImporter:
+    def __init__(self, db: Session, format: ImportFormat = "ndjson", chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.db = db
+        self.repo = CatalogRepository(db)
+        self.parser = RecordParser(format)
+        self.chunk_size = chunk_size
+        self.created = 0
+        self.existing = 0
+        self.rejected = 0
+        self.directors_created = 0
+        self.genres_created = 0
+        self.errors: list[dict] = []
+
+    def import_lines(self, lines: Iterable[str]) -> None:
+        """Parse and import ``lines``; may be called repeatedly with consecutive parts of one input."""
+        chunk = []
+        for item in self.parser.parse(lines):
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk)
+
+    def import_chunk(self, items: list[tuple[int, dict | str]]) -> None:
+        """Import one chunk of parsed ``(line, record or error)`` pairs in one transaction."""
+        records = []
+        for line, raw in items:
+            if isinstance(raw, str):
+                self._reject(line, raw)
+                continue
+            try:
+                records.append((line, MovieImportRecord.model_validate(raw)))
+            except ValidationError as exc:
+                self._reject(line, validation_message(exc))
+        if not records:
+            return
+
+        try:
+            outcome = self._import_records(records)
+            self.db.commit()
+        except SQLAlchemyError as exc:
+            self.db.rollback()
+            reason = f"Chunk not imported: {type(exc).__name__}: {str(exc).splitlines()[0]}"
+            for line, _ in records:
+                self._reject(line, reason)
+            return
+
+        created, rejected, existing, directors_created, genres_created = outcome
+        for line, error in rejected:
+            self._reject(line, error)
+        self.existing += existing
+        self.created += len(created)
+        self.directors_created += directors_created
+        self.genres_created += genres_created
+        if directors_created or genres_created:
+            reference_data.invalidate()
+        for movie_id, director_id, record in created:
+            movie_search_index.upsert(movie_id, record.title, record.cast, record.genres)
+            movie_similarity_index.upsert(movie_id, director_id, record.release_year, record.cast, record.genres)
+
+    def _import_records(self, records: list[tuple[int, MovieImportRecord]]):
+        rejected = []
+
+        director_ids = self.repo.director_ids_by_name({record.director for _, record in records if record.director})
+        new_directors = sorted({record.director for _, record in records if record.director} - director_ids.keys())
+        director_ids.update(self.repo.create_directors(new_directors))
+
+        wanted = {name: None for _, record in records for name in record.genres}
+        known = {name.lower(): genre_id for genre_id, name in reference_data.snapshot(self.db).genre_names.items()}
+        genre_ids = {name.lower(): known[name.lower()] for name in wanted if name.lower() in known}
+        genre_ids.update(self.repo.genre_ids_by_name({name.lower() for name in wanted} - genre_ids.keys()))
+        new_genres = list({name.lower(): name for name in wanted if name.lower() not in genre_ids}.values())
+        genre_ids.update(self.repo.create_genres(new_genres))
+
+        keyed: dict[MovieKey, tuple[int, MovieImportRecord]] = {}
+        duplicates = 0
+        for line, record in records:
+            if record.director_id is not None:
+                if not reference_data.director_exists(self.db, record.director_id):
+                    rejected.append((line, "Director not found"))
+                    continue
+                director_id = record.director_id
+            else:
+                director_id = director_ids[record.director]
+            key = (record.title, director_id, record.release_year)
+            if key in keyed:
+                duplicates += 1
+                continue
+            keyed[key] = (line, record)
+
+        present = self.repo.existing_movie_keys(set(keyed))
+        new = [(key, record) for key, (_, record) in keyed.items() if key not in present]
+        movie_ids = self.repo.insert_movies(
+            [
+                {"title": title, "release_year": release_year, "cast": record.cast, "director_id": director_id}
+                for (title, director_id, release_year), record in new
+            ]
+        )
+        created = [(movie_ids[key], key[1], record) for key, record in new]
+        self.repo.link_genres(
+            [
+                {"movie_id": movie_id, "genre_id": genre_id}
+                for movie_id, _, record in created
+                for genre_id in dict.fromkeys(genre_ids[name.lower()] for name in record.genres)
+            ]
+        )
+        return created, rejected, len(present) + duplicates, len(new_directors), len(new_genres)
+
+    def _reject(self, line: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+    def finish(self) -> dict:
+        """Invalidate what the import changed and return the summary."""
+        if self.created:
+            response_cache.invalidate(LIST_TAG)
+        return {
+            "created": self.created,
+            "existing": self.existing,
+            "rejected": self.rejected,
+            "directors_created": self.directors_created,
+            "genres_created": self.genres_created,
+            "errors": self.errors,
+            "errors_truncated": self.rejected > len(self.errors),
+        }
\ No newline at end of file
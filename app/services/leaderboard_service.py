@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from app.cache.reference_data import reference_data
+from app.exceptions.http_exceptions import not_found, unprocessable
+from app.repositories.leaderboard_repository import LeaderboardRepository
+from app.models.movie_rating_rollup import BUCKET, bucket_start
+from app.repositories.movie_repository import average_rating
+
+# trending window -> hourly rollup buckets it spans, the current (partial) hour included
+TRENDING_WINDOWS = {"1h": 1, "24h": 24, "7d": 7 * 24, "30d": 30 * 24}
+
+
+class LeaderboardService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = LeaderboardRepository(db)
+
+    def get_leaderboard(self, limit: int, genre: str | None = None, decade: int | None = None) -> dict:
+        if decade is not None and decade % 10:
+            raise unprocessable("decade must be a multiple of 10, e.g. 1990")
+
+        genre_id = None
+        if genre is not None:
+            genre_id = reference_data.genre_id(self.db, genre)
+            if genre_id is None:
+                raise not_found("Genre not found")
+
+        rows = self.repo.top_movies(limit, genre_id=genre_id, decade=decade)
+        return {
+            "genre": genre,
+            "decade": decade,
+            "items": [
+                {
+                    "rank": rank,
+                    "id": row.id,
+                    "title": row.title,
+                    "release_year": row.release_year,
+                    "ratings_count": row.ratings_count,
+                    "average_rating": average_rating(row.ratings_count, row.rating_sum),
+                    "weighted_score": round(row.weighted_score, 4),
+                }
+                for rank, row in enumerate(rows, start=1)
+            ],
+        }
+
+    def get_trending(self, window: str, limit: int) -> dict:
+        since = bucket_start(datetime.now(timezone.utc)) - (TRENDING_WINDOWS[window] - 1) * BUCKET
+        rows = self.repo.trending_movies(since, limit)
+        return {
+            "window": window,
+            "since": since.isoformat().replace("+00:00", "Z"),
+            "items": [
+                {
+                    "rank": rank,
+                    "id": row.id,
+                    "title": row.title,
+                    "release_year": row.release_year,
+                    "ratings_count": row.ratings_count,
+                    "average_rating": average_rating(row.ratings_count, row.rating_sum),
+                }
+                for rank, row in enumerate(rows, start=1)
+            ],
+        }
\ No newline at end of file
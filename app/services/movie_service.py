@@ -1,12 +1,46 @@
 from __future__ import annotations
 
+import json
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.repositories.movie_repository import MovieRepository
+from app.cache.reference_data import reference_data
+from app.cache.response_cache import LIST_TAG, movie_tag, response_cache
+from app.config import EXPORT_BATCH_SIZE, EXPORT_WATERMARK_MARGIN_SECONDS, MOVIE_BATCH_MAX_IDS
+from app.models.movie import SCORES, score_count_column
+from app.repositories.movie_repository import MovieRepository, as_utc, average_rating
+from app.repositories.pagination import decode_cursor, encode_cursor
 from app.schemas.movie import MovieCreate, MovieUpdate
+from app.search.ngram_index import movie_search_index
+from app.search.similarity_index import movie_similarity_index
 from app.exceptions.http_exceptions import not_found, unprocessable
 
 
+SCORE_COLUMNS = [score_count_column(score) for score in SCORES]
+MOVIE_EXPORT_COLUMNS = [
+    "id",
+    "title",
+    "release_year",
+    "cast",
+    "director_id",
+    "director_name",
+    "genres",
+    "ratings_count",
+    "rating_sum",
+    "average_rating",
+    "weighted_score",
+    *SCORE_COLUMNS,
+    "version",
+    "updated_at",
+]
+
+
 class MovieService:
     def __init__(self, db: Session):
         self.db = db
@@ -20,58 +54,294 @@ class MovieService:
         title: str | None,
         release_year: int | None,
         genre: str | None,
-    ) -> dict:
-        items, total = self.repo.list_movies(
+        cursor: str | None = None,
+        total_mode: str = "exact",
+        search: str | None = None,
+        catalog_state: tuple[int, datetime] | None = None,
+    ) -> tuple[dict, tuple[int, datetime]]:
+        """The page, and the catalog state (see ``get_catalog_state``) to derive its validators
+        from. A cached page keeps the state read before it was built, so a page cached before a
+        write made elsewhere (another worker) is never served under the newer ETag.
+
+        Pass the exact ``catalog_state`` just read (a conditional request that did not match)
+        to rebuild the page under it rather than serve a cached copy under an older ETag.
+
+        Sessions ``pinned_to_primary`` are never answered from the cache (here and in the other
+        getters): its entries may come from another client's read of a lagging replica."""
+        cache_key = "movies:list:" + json.dumps(
+            [page, page_size, title, release_year, genre, cursor, total_mode, search]
+        )
+        if catalog_state is None and not self.db.pinned_to_primary:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        generation = response_cache.generation()
+        if catalog_state is None:
+            catalog_state = self.repo.get_catalog_state()
+
+        after_id = None
+        if cursor is not None:
+            if search:
+                raise unprocessable("cursor cannot be combined with q")
+            try:
+                after_id = int(decode_cursor(cursor)["after_id"])
+            except (ValueError, KeyError, TypeError):
+                raise unprocessable("Invalid cursor")
+
+        # genre names are matched against the cached genres, leaving the query an id filter
+        genre_ids = reference_data.genre_ids_matching(self.db, genre) if genre else None
+        items, total, has_more = self.repo.list_movies(
             page=page,
             page_size=page_size,
             title=title,
             release_year=release_year,
-            genre=genre,
+            genre_ids=genre_ids,
+            after_id=after_id,
+            total_mode=total_mode,
+            search=search,
         )
-        return {
-            "page": page,
-            "page_size": page_size,
-            "total_items": total,
-            "items": items,
-        }
+        # search results are ranked by relevance, which an id cursor cannot resume
+        next_cursor = encode_cursor({"after_id": items[-1]["id"]}) if has_more and not search else None
+
+        if cursor is not None:
+            data = {
+                "page_size": page_size,
+                "total_items": total,
+                "next_cursor": next_cursor,
+                "items": items,
+            }
+        else:
+            data = {
+                "page": page,
+                "page_size": page_size,
+                "total_items": total,
+                "next_cursor": next_cursor,
+                "items": items,
+            }
+        tags = [LIST_TAG, *(movie_tag(item["id"]) for item in items)]
+        response_cache.set(cache_key, (data, catalog_state), tags=tags, generation=generation)
+        return data, catalog_state
 
     def create_movie(self, payload: MovieCreate) -> dict:
-        director = self.repo.get_director_by_id(payload.director_id)
-        if director is None:
-            raise unprocessable("Invalid director_id or genres")
+        movie = self._create_movie(payload)
+        self._movie_changed(movie)
+        return movie
 
+    def _create_movie(self, payload: MovieCreate) -> dict:
         genre_ids = getattr(payload, "genre_ids", None) or getattr(payload, "genres", [])
-        genres = self.repo.get_genres_by_ids(genre_ids)
-        if len(genres) != len(set(genre_ids)):
+        if not (
+            reference_data.director_exists(self.db, payload.director_id)
+            and reference_data.genres_exist(self.db, genre_ids)
+        ):
             raise unprocessable("Invalid director_id or genres")
 
-        return self.repo.create_movie(payload, genres)        
+        try:
+            return self.repo.create_movie(payload, genre_ids)
+        except IntegrityError:
+            raise self._stale_references()
+
+    def get_movie(self, movie_id: int, min_version: int | None = None) -> dict:
+        """The movie's detail representation; a cached copy older than ``min_version`` (the
+        version a conditional GET just read) is rebuilt rather than served."""
+        cache_key = movie_tag(movie_id)
+        cached = None if self.db.pinned_to_primary else response_cache.get(cache_key)
+        if cached is not None and (min_version is None or cached["version"] >= min_version):
+            return cached
+        generation = response_cache.generation()
 
-    def get_movie(self, movie_id: int) -> dict:
         movie = self.repo.get_movie(movie_id)
         if movie is None:
             raise not_found("Movie not found")
+        response_cache.set(cache_key, movie, tags=[cache_key], generation=generation)
         return movie
 
-    def update_movie(self, movie_id: int, payload: MovieUpdate) -> dict:
-        if self.repo.get_movie(movie_id) is None:
+    def get_movies(self, movie_ids: list[int]) -> dict:
+        """Details of ``movie_ids`` in request order (repeats dropped) plus the ids that do not
+        exist. Cached details are reused; the rest load in one batch and are cached in turn."""
+        if len(movie_ids) > MOVIE_BATCH_MAX_IDS:
+            raise unprocessable(f"At most {MOVIE_BATCH_MAX_IDS} ids per request")
+        movie_ids = list(dict.fromkeys(movie_ids))
+
+        found = {}
+        if not self.db.pinned_to_primary:
+            for movie_id in movie_ids:
+                cached = response_cache.get(movie_tag(movie_id))
+                if cached is not None:
+                    found[movie_id] = cached
+        generation = response_cache.generation()
+        loaded = self.repo.get_movies([movie_id for movie_id in movie_ids if movie_id not in found])
+        for movie_id, movie in loaded.items():
+            response_cache.set(movie_tag(movie_id), movie, tags=[movie_tag(movie_id)], generation=generation)
+        found.update(loaded)
+
+        return {
+            "items": [found[movie_id] for movie_id in movie_ids if movie_id in found],
+            "missing_ids": [movie_id for movie_id in movie_ids if movie_id not in found],
+        }
+
+    def get_similar_movies(self, movie_id: int, limit: int) -> dict:
+        """The ``limit`` movies most like ``movie_id`` (see app/search/similarity_index.py), best
+        first, each detail with its ``similarity`` in (0, 1]."""
+        movie_similarity_index.ensure_built()
+        ranked = movie_similarity_index.similar(movie_id, limit)
+        if ranked is None:
+            # created by another worker since the index was built, or not there at all
+            if not movie_similarity_index.load(self.db, movie_id):
+                raise not_found("Movie not found")
+            ranked = movie_similarity_index.similar(movie_id, limit)
+
+        # the movie itself rides along in the batch, so one deleted by another worker is a 404
+        found = self.get_movies([movie_id, *(other for other, _ in ranked)])
+        for missing in found["missing_ids"]:
+            movie_similarity_index.remove(missing)
+        if movie_id in found["missing_ids"]:
             raise not_found("Movie not found")
+        details = {movie["id"]: movie for movie in found["items"]}
+        return {
+            "items": [{**details[other], "similarity": score} for other, score in ranked if other in details]
+        }
+
+    def export_catalog(self, updated_since: datetime | None = None) -> tuple[datetime, Iterator[dict]]:
+        """``(watermark, records)``: every movie changed at or after ``updated_since`` as a flat
+        record keyed by ``MOVIE_EXPORT_COLUMNS``, in id order, and the ``updated_since`` for the
+        next incremental export. The watermark is read from the database before the export and
+        trails it by ``EXPORT_WATERMARK_MARGIN_SECONDS``, so consecutive exports overlap rather
+        than leave a gap; records are keyed by id, so the overlap is harmless."""
+        watermark = self.repo.catalog_watermark(timedelta(seconds=EXPORT_WATERMARK_MARGIN_SECONDS))
+        return watermark, self._catalog_records(updated_since)
+
+    def _catalog_records(self, updated_since: datetime | None) -> Iterator[dict]:
+        # one streamed query; memory stays at one fetch batch however large the catalog
+        record = None
+        for row in self.repo.iter_catalog(updated_since, EXPORT_BATCH_SIZE):
+            if record is not None and row.id == record["id"]:
+                # further genres of the movie just started
+                record["genres"].append(row.genre_name)
+                continue
+            if record is not None:
+                yield record
+            movie = row._mapping
+            record = {name: movie[name] for name in ("id", "title", "release_year", "cast", "director_id", "director_name")}
+            record["genres"] = [row.genre_name] if row.genre_name is not None else []
+            record["ratings_count"] = row.ratings_count
+            record["rating_sum"] = row.rating_sum
+            record["average_rating"] = average_rating(row.ratings_count, row.rating_sum)
+            record["weighted_score"] = round(row.weighted_score, 4)
+            for name in SCORE_COLUMNS:
+                record[name] = movie[name]
+            record["version"] = row.version
+            record["updated_at"] = as_utc(row.updated_at).isoformat().replace("+00:00", "Z")
+        if record is not None:
+            yield record
+
+    def get_movie_state(self, movie_id: int) -> tuple[int, datetime] | None:
+        return self.repo.get_movie_state(movie_id)
+
+    def get_catalog_state(self) -> tuple[int, datetime]:
+        return self.repo.get_catalog_state()
+
+    def update_movie(self, movie_id: int, payload: MovieUpdate) -> dict:
+        """Partial update (PUT and PATCH alike): fields left out of ``payload`` keep their value."""
+        updated = self._update_movie(movie_id, payload)
+        self._movie_changed(updated)
+        return updated
+
+    def _update_movie(self, movie_id: int, payload: MovieUpdate) -> dict:
+        if payload.director_id is not None and not reference_data.director_exists(self.db, payload.director_id):
+            raise unprocessable("Invalid director_id or genres")
 
-        if payload.director_id is not None:
-            director = self.repo.get_director_by_id(payload.director_id)
-            if director is None:
-                raise unprocessable("Invalid director_id or genres")
-
-        genres = None
-        if hasattr(payload, "genre_ids") and payload.genre_ids is not None:
-            gids = payload.genre_ids
-            genres = self.repo.get_genres_by_ids(gids) if gids else []
-            if len(genres) != len(set(gids)):
-                raise unprocessable("Invalid director_id or genres")
-        updated = self.repo.update_movie(movie_id, payload, genres)
+        genre_ids = getattr(payload, "genre_ids", None)
+        if genre_ids is not None and not reference_data.genres_exist(self.db, genre_ids):
+            raise unprocessable("Invalid director_id or genres")
+        try:
+            updated = self.repo.update_movie(movie_id, payload, genre_ids)
+        except IntegrityError:
+            raise self._stale_references()
+        if updated is None:
+            raise not_found("Movie not found")
         return updated
 
+    def _stale_references(self) -> HTTPException:
+        """The write hit a foreign key: a director or genre the reference data snapshot still
+        lists was deleted by another worker. Drop the snapshot so the next lookup reloads,
+        and answer as if the lookup had missed."""
+        self.db.rollback()
+        reference_data.invalidate()
+        return unprocessable("Invalid director_id or genres")
+
     def delete_movie(self, movie_id: int) -> None:
+        self._delete_movie(movie_id)
+        self._movie_deleted(movie_id)
+
+    def _delete_movie(self, movie_id: int) -> None:
         ok = self.repo.delete_movie(movie_id)
         if not ok:
-            raise not_found("Movie not found")
\ No newline at end of file
+            raise not_found("Movie not found")
+
+    # index and cache upkeep after a committed write (run in the threadpool on the async stack)
+    @staticmethod
+    def _movie_deleted(movie_id: int) -> None:
+        movie_search_index.remove(movie_id)
+        movie_similarity_index.remove(movie_id)
+        response_cache.invalidate(movie_tag(movie_id), LIST_TAG)
+
+    @staticmethod
+    def _movie_changed(movie: dict) -> None:
+        movie_search_index.upsert(movie["id"], movie["title"], movie["cast"], movie["genres"])
+        movie_similarity_index.upsert(
+            movie["id"], movie["director"]["id"], movie["release_year"], movie["cast"], movie["genres"]
+        )
+        # any field change can move the movie in or out of a filtered listing
+        response_cache.invalidate(movie_tag(movie["id"]), LIST_TAG)
+
+
+class AsyncMovieService:
+    """``MovieService`` for the async stack: the same methods, awaited.
+
+    Each call runs the sync service on the AsyncSession's connection through ``run_sync``,
+    so every query goes through the async driver while both stacks share one repository.
+
+    ``run_sync`` keeps the service's in-process work on the event loop, so what could wait
+    on a lock or a build runs in the threadpool instead: the n-gram index build before a
+    search, and the index upserts and cache invalidation after a write. Still on the loop:
+    response cache gets and sets (short; their lock is never held across I/O), reference
+    data lookups (a reload is two queries awaited through the driver like any other) and,
+    on dialects without trigram search, ranking ``q`` against the built n-gram index, which
+    grows with the catalog. ``scripts/bench_async.py --mix catalog`` measures the stacks
+    under searches and writes.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_movies(self, **filters) -> tuple[dict, tuple[int, datetime]]:
+        if filters.get("search") and self.db.bind.dialect.name != "postgresql":
+            # a cold n-gram index is built in the threadpool, not on the event loop inside run_sync
+            await run_in_threadpool(movie_search_index.ensure_built)
+        return await self.db.run_sync(lambda session: MovieService(session).list_movies(**filters))
+
+    async def create_movie(self, payload: MovieCreate) -> dict:
+        movie = await self.db.run_sync(lambda session: MovieService(session)._create_movie(payload))
+        await run_in_threadpool(MovieService._movie_changed, movie)
+        return movie
+
+    async def get_movie(self, movie_id: int, min_version: int | None = None) -> dict:
+        return await self.db.run_sync(lambda session: MovieService(session).get_movie(movie_id, min_version))
+
+    async def get_movies(self, movie_ids: list[int]) -> dict:
+        return await self.db.run_sync(lambda session: MovieService(session).get_movies(movie_ids))
+
+    async def get_movie_state(self, movie_id: int) -> tuple[int, datetime] | None:
+        return await self.db.run_sync(lambda session: MovieService(session).get_movie_state(movie_id))
+
+    async def get_catalog_state(self) -> tuple[int, datetime]:
+        return await self.db.run_sync(lambda session: MovieService(session).get_catalog_state())
+
+    async def update_movie(self, movie_id: int, payload: MovieUpdate) -> dict:
+        updated = await self.db.run_sync(lambda session: MovieService(session)._update_movie(movie_id, payload))
+        await run_in_threadpool(MovieService._movie_changed, updated)
+        return updated
+
+    async def delete_movie(self, movie_id: int) -> None:
+        await self.db.run_sync(lambda session: MovieService(session)._delete_movie(movie_id))
+        await run_in_threadpool(MovieService._movie_deleted, movie_id)
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Iterator
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.repositories.movie_repository import MovieRepository
+from app.cache.response_cache import movie_tag, response_cache
+from app.config import EXPORT_BATCH_SIZE
+from app.models.movie_rating_rollup import bucket_start
+from app.repositories.movie_repository import MovieRepository, average_rating, rating_distribution
+from app.repositories.pagination import decode_cursor, encode_cursor
 from app.repositories.rating_repository import RatingRepository
 from app.exceptions.http_exceptions import not_found, unprocessable
+from app.schemas.rating import BulkRatingRecord
 
 
 def _to_iso_z(dt):
@@ -14,6 +24,18 @@ def _to_iso_z(dt):
     return s.replace("+00:00", "Z")
 
 
+RATING_EXPORT_COLUMNS = ["id", "movie_id", "score", "created_at"]
+
+
+def _rating_dict(r) -> dict:
+    return {
+        "id": r.id,
+        "movie_id": r.movie_id,
+        "score": r.score,
+        "created_at": _to_iso_z(r.created_at),
+    }
+
+
 class RatingService:
     def __init__(self, db: Session):
         self.db = db
@@ -21,13 +43,18 @@ class RatingService:
         self.rating_repo = RatingRepository(db)
 
     def create_rating(self, movie_id: int, score: int) -> dict:
-        if self.movie_repo.get_movie(movie_id) is None:
-            raise not_found("Movie not found")
+        created = self._create_rating(movie_id, score)
+        # only the movie's aggregates changed: drop its detail and the pages that show it
+        response_cache.invalidate(movie_tag(movie_id))
+        return created
 
+    def _create_rating(self, movie_id: int, score: int) -> dict:
         if score < 1 or score > 10:
             raise unprocessable("Score must be an integer between 1 and 10")
 
         rating = self.rating_repo.create_rating(movie_id=movie_id, score=score)
+        if rating is None:
+            raise not_found("Movie not found")
         return {
             "rating_id": rating.id,
             "movie_id": rating.movie_id,
@@ -35,17 +62,167 @@ class RatingService:
             "created_at": _to_iso_z(rating.created_at),
         }
 
-    def list_ratings(self, movie_id: int) -> list[dict]:
-        if self.movie_repo.get_movie(movie_id) is None:
+    def get_rating_distribution(self, movie_id: int) -> dict:
+        row = self.rating_repo.get_score_counts(movie_id)
+        if row is None:
             raise not_found("Movie not found")
+        ratings_count, rating_sum, *counts = row
+        return {
+            "movie_id": movie_id,
+            "ratings_count": ratings_count,
+            "average_rating": average_rating(ratings_count, rating_sum),
+            **rating_distribution(counts),
+        }
+
+    def get_rating_timeseries(self, movie_id: int, interval: str, days: int) -> dict:
+        """Ratings per hour or per UTC day over the last ``days`` days, read from the hourly
+        rollups; empty buckets are omitted."""
+        self._ensure_movie_exists(movie_id)
+        since = bucket_start(datetime.now(timezone.utc) - timedelta(days=days))
+        if interval == "day":
+            since = since.replace(hour=0)
 
+        points: dict[datetime, list[int]] = {}
+        for bucket, count, total in self.rating_repo.list_rollups(movie_id, since):
+            bucket = bucket_start(bucket)
+            if interval == "day":
+                bucket = bucket.replace(hour=0)
+            point = points.setdefault(bucket, [0, 0])
+            point[0] += count
+            point[1] += total
+        return {
+            "movie_id": movie_id,
+            "interval": interval,
+            "since": _to_iso_z(since),
+            "points": [
+                {"bucket": _to_iso_z(bucket), "ratings_count": count, "average_rating": average_rating(count, total)}
+                for bucket, (count, total) in points.items()
+            ],
+        }
+
+    def list_ratings(self, movie_id: int) -> list[dict]:
+        self._ensure_movie_exists(movie_id)
         ratings = self.rating_repo.list_ratings(movie_id)
-        return [
-            {
-                "id": r.id,
-                "movie_id": r.movie_id,
-                "score": r.score,
-                "created_at": _to_iso_z(r.created_at),
-            }
-            for r in ratings
-        ]
\ No newline at end of file
+        return [_rating_dict(r) for r in ratings]
+
+    def list_ratings_page(self, movie_id: int, limit: int, cursor: str | None = None) -> dict:
+        self._ensure_movie_exists(movie_id)
+        return self._ratings_page(movie_id, limit, cursor)
+
+    def stream_ratings(self, movie_id: int) -> Iterator[dict]:
+        """Check the movie exists now, then lazily yield every rating with flat memory use."""
+        self._ensure_movie_exists(movie_id)
+        return (_rating_dict(r) for r in self.rating_repo.iter_ratings(movie_id))
+
+    def export_ratings(self, after_id: int | None = None) -> tuple[int, Iterator[dict]]:
+        """``(last_id, records)``: the ratings with ``after_id < id <= last_id`` in id order, in
+        one streamed query; keys are ``RATING_EXPORT_COLUMNS``. Pass ``last_id`` as the next
+        ``after_id``.
+
+        The watermark is the id, not ``created_at``: bulk imports may carry any ``created_at``,
+        so a backdated rating would fall behind a timestamp watermark and never be exported."""
+        last_id = max(self.rating_repo.last_rating_id(), after_id or 0)
+        rows = self.rating_repo.iter_all_ratings(after_id, last_id, EXPORT_BATCH_SIZE)
+        return last_id, (_rating_dict(r) for r in rows)
+
+    def _ratings_page(self, movie_id: int, limit: int, cursor: str | None) -> dict:
+        after = None
+        if cursor is not None:
+            try:
+                payload = decode_cursor(cursor)
+                after = (datetime.fromisoformat(payload["created_at"]), int(payload["id"]))
+            except (ValueError, KeyError, TypeError):
+                raise unprocessable("Invalid cursor")
+
+        ratings = self.rating_repo.list_ratings_page(movie_id, limit + 1, after)
+        next_cursor = None
+        if len(ratings) > limit:
+            ratings = ratings[:limit]
+            last = ratings[-1]
+            next_cursor = encode_cursor({"created_at": last.created_at.isoformat(), "id": last.id})
+        return {"limit": limit, "next_cursor": next_cursor, "items": [_rating_dict(r) for r in ratings]}
+
+    def _ensure_movie_exists(self, movie_id: int) -> None:
+        if not self.movie_repo.movie_exists(movie_id):
+            raise not_found("Movie not found")
+
+    def bulk_create_ratings(self, records: list[BulkRatingRecord]) -> dict:
+        """Validate every record, insert the valid ones in one transaction and report each outcome."""
+        now = datetime.now(timezone.utc)
+        existing = self.movie_repo.existing_movie_ids({r.movie_id for r in records})
+
+        results: list[dict] = []
+        accepted_rows: list[dict] = []
+        for index, record in enumerate(records):
+            created_at = record.created_at
+            if created_at is not None and created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+
+            error = None
+            if record.score < 1 or record.score > 10:
+                error = "Score must be an integer between 1 and 10"
+            elif record.movie_id not in existing:
+                error = "Movie not found"
+            elif created_at is not None and created_at > now:
+                error = "created_at cannot be in the future"
+
+            if error is not None:
+                results.append({"index": index, "status": "rejected", "error": error})
+                continue
+            results.append({"index": index, "status": "accepted"})
+            accepted_rows.append({"movie_id": record.movie_id, "score": record.score, "created_at": created_at or now})
+
+        try:
+            self.rating_repo.bulk_create_ratings(accepted_rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        response_cache.invalidate(*(movie_tag(movie_id) for movie_id in {row["movie_id"] for row in accepted_rows}))
+        return {
+            "accepted": len(accepted_rows),
+            "rejected": len(results) - len(accepted_rows),
+            "results": results,
+        }
+
+
+class AsyncRatingService:
+    """``RatingService`` for the async stack; see ``AsyncMovieService``. The cache
+    invalidation after a rating runs in the threadpool."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_rating(self, movie_id: int, score: int) -> dict:
+        created = await self.db.run_sync(lambda session: RatingService(session)._create_rating(movie_id, score))
+        await run_in_threadpool(response_cache.invalidate, movie_tag(movie_id))
+        return created
+
+    async def list_ratings(self, movie_id: int) -> list[dict]:
+        return await self.db.run_sync(lambda session: RatingService(session).list_ratings(movie_id))
+
+    async def list_ratings_page(self, movie_id: int, limit: int, cursor: str | None = None) -> dict:
+        return await self.db.run_sync(
+            lambda session: RatingService(session).list_ratings_page(movie_id, limit, cursor)
+        )
+
+    async def stream_ratings(self, movie_id: int, page_size: int = 1000) -> AsyncIterator[dict]:
+        """Async counterpart of ``RatingService.stream_ratings``. Server-side cursors cannot be
+        driven through ``run_sync``, so this walks the keyset pages instead; memory stays at
+        one page."""
+        await self.db.run_sync(lambda session: RatingService(session)._ensure_movie_exists(movie_id))
+
+        async def pages():
+            cursor = None
+            while True:
+                page = await self.db.run_sync(
+                    lambda session: RatingService(session)._ratings_page(movie_id, page_size, cursor)
+                )
+                for item in page["items"]:
+                    yield item
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    return
+
+        return pages()
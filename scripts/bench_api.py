@@ -0,0 +1,197 @@
+"""Load-test every movie and rating endpoint and report the results as JSON.
+
+Usage:
+    python -m scripts.bench_api --movies 100000 --directors 10000 --genres 50 --ratings 10000000 > base.json
+    python -m scripts.bench_api --scenario get_movie --scenario list_movies > new.json
+    python -m scripts.bench_compare base.json new.json   # exit 1 on regressions
+
+DATABASE_URL is topped up with a synthetic dataset first (existing rows count towards the
+targets, so re-runs reuse it). Each scenario is then driven against a fresh uvicorn process
+and one JSON report is printed: req/s, latency percentiles and SQL statements per request
+(read from the X-SQL-Statements header, so the server runs with
+SQL_STATEMENT_BUDGET_MODE=warn). Write scenarios modify the benchmark database.
+"""
+import argparse
+import json
+import platform
+import sys
+from collections import deque
+
+from sqlalchemy import delete, func, insert, select
+
+from app.db.database import SessionLocal, engine
+from app.models.director import Director
+from app.models.genre import Genre
+from app.models.movie import Movie
+from scripts.bench_utils import (
+    TITLE_WORDS,
+    genre_name,
+    run_load,
+    running_server,
+    seed_synthetic_catalog,
+    seed_synthetic_ratings,
+)
+
+
+def build_scenarios(max_movie_id: int, max_director_id: int, genre_ids: list[int], genres: int, disposable: deque):
+    """Map scenario name -> ``make_request(rng)`` for ``run_load``."""
+
+    def movie_id(rng):
+        return rng.randint(1, max_movie_id)
+
+    def list_movies(rng):
+        return "GET", f"/api/v1/movies?page={rng.randint(1, 50)}&page_size=20", None
+
+    def list_movies_filtered(rng):
+        return "GET", f"/api/v1/movies?genre={genre_name(rng.randrange(genres))}&page_size=20", None
+
+    def search_movies(rng):
+        return "GET", f"/api/v1/movies?q={rng.choice(TITLE_WORDS)}&page_size=20", None
+
+    def get_movie(rng):
+        return "GET", f"/api/v1/movies/{movie_id(rng)}", None
+
+    def get_movies_batch(rng):
+        ids = ",".join(str(movie_id(rng)) for _ in range(20))
+        return "GET", f"/api/v1/movies/batch?ids={ids}", None
+
+    def create_movie(rng):
+        body = {
+            "title": f"Bench {rng.choice(TITLE_WORDS).title()} {rng.randint(1, 10**9)}",
+            "release_year": rng.randint(1920, 2025),
+            "director_id": rng.randint(1, max_director_id),
+            "genre_ids": rng.sample(genre_ids, min(2, len(genre_ids))),
+        }
+        return "POST", "/api/v1/movies", body
+
+    def update_movie(rng):
+        body = {"release_year": rng.randint(1920, 2025), "genre_ids": rng.sample(genre_ids, min(2, len(genre_ids)))}
+        return "PUT", f"/api/v1/movies/{movie_id(rng)}", body
+
+    def patch_movie(rng):
+        body = {"release_year": rng.randint(1920, 2025)}
+        return "PATCH", f"/api/v1/movies/{movie_id(rng)}", body
+
+    def delete_movie(rng):
+        # once the pool runs dry the requests turn into 404s, which the report still counts
+        target = disposable.popleft() if disposable else max_movie_id + 10**9
+        return "DELETE", f"/api/v1/movies/{target}", None
+
+    def create_rating(rng):
+        return "POST", f"/api/v1/movies/{movie_id(rng)}/ratings", {"score": rng.randint(1, 10)}
+
+    def list_ratings(rng):
+        return "GET", f"/api/v1/movies/{movie_id(rng)}/ratings?limit=50", None
+
+    def bulk_create_ratings(rng):
+        records = [{"movie_id": movie_id(rng), "score": rng.randint(1, 10)} for _ in range(500)]
+        return "POST", "/api/v1/ratings/bulk", {"ratings": records}
+
+    return {
+        "list_movies": list_movies,
+        "list_movies_genre": list_movies_filtered,
+        "search_movies": search_movies,
+        "get_movie": get_movie,
+        "get_movies_batch": get_movies_batch,
+        "create_movie": create_movie,
+        "update_movie": update_movie,
+        "patch_movie": patch_movie,
+        "delete_movie": delete_movie,
+        "create_rating": create_rating,
+        "list_ratings": list_ratings,
+        "bulk_create_ratings": bulk_create_ratings,
+    }
+
+
+def create_disposable_movies(count: int, director_id: int) -> deque:
+    """Insert movies that only exist to be deleted by the delete_movie scenario."""
+    db = SessionLocal()
+    try:
+        ids = db.scalars(
+            insert(Movie).returning(Movie.id),
+            [{"title": f"Disposable {i}", "director_id": director_id} for i in range(count)],
+        ).all()
+        db.commit()
+    finally:
+        db.close()
+    return deque(sorted(ids))
+
+
+def remove_movies(ids: list[int]) -> None:
+    if not ids:
+        return
+    db = SessionLocal()
+    try:
+        db.execute(delete(Movie).where(Movie.id.in_(ids)))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(args) -> dict:
+    db = SessionLocal()
+    try:
+        seed_synthetic_catalog(db, args.movies, seed=args.seed, directors=args.directors, genres=args.genres)
+        seed_synthetic_ratings(db, args.ratings, seed=args.seed)
+        max_movie_id = db.scalar(select(func.max(Movie.id)))
+        max_director_id = db.scalar(select(func.max(Director.id)))
+        genre_ids = list(db.scalars(select(Genre.id)))
+        genres = len(genre_ids)
+    finally:
+        db.close()
+
+    disposable = create_disposable_movies(args.delete_pool, max_director_id)
+    scenarios = build_scenarios(max_movie_id, max_director_id, genre_ids, genres, disposable)
+    selected = args.scenarios or list(scenarios)
+    unknown = sorted(set(selected) - set(scenarios))
+    if unknown:
+        raise SystemExit(f"unknown scenario(s): {', '.join(unknown)}; choose from {', '.join(scenarios)}")
+
+    report = {
+        "config": {
+            "movies": args.movies,
+            "directors": args.directors,
+            "genres": args.genres,
+            "ratings": args.ratings,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "seed": args.seed,
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+        },
+        "scenarios": {},
+    }
+    try:
+        with running_server(args.port, env={"SQL_STATEMENT_BUDGET_MODE": "warn"}) as base_url:
+            for name in selected:
+                if args.warmup > 0:
+                    run_load(base_url, scenarios[name], concurrency=2, duration=args.warmup, seed=args.seed)
+                result = run_load(base_url, scenarios[name], args.concurrency, args.duration, seed=args.seed)
+                report["scenarios"][name] = result
+                print(f"{name}: {result['req_per_s']} req/s, p99 {result['p99_ms']} ms", file=sys.stderr)
+    finally:
+        # leftovers would shift the id range the next run samples from
+        remove_movies(list(disposable))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=100_000)
+    parser.add_argument("--directors", type=int, default=10_000)
+    parser.add_argument("--genres", type=int, default=50)
+    parser.add_argument("--ratings", type=int, default=10_000_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--delete-pool", type=int, default=20_000, help="movies created for delete_movie")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--scenario", action="append", dest="scenarios", help="scenario to run (repeatable)")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compare throughput and tail latency of the sync and async (DB_MODE) stacks.
+
+Usage:
+    python -m scripts.bench_async --movies 10000 --concurrency 64 --duration 20 > async.json
+    python -m scripts.bench_async --mix catalog > async-catalog.json
+
+Each mode is served by its own single-worker uvicorn process against DATABASE_URL, which
+is topped up with a synthetic catalog first. The async mode needs the "async" extra
+(asyncpg for PostgreSQL, aiosqlite for SQLite): ``poetry install -E async``.
+"""
+import argparse
+import json
+
+from sqlalchemy import func, select
+
+from app.db.database import SessionLocal
+from app.models.movie import Movie
+from scripts.bench_utils import TITLE_WORDS, run_load, running_server, seed_synthetic_catalog
+
+
+def request_mix(max_movie_id: int):
+    def make_request(rng):
+        roll = rng.random()
+        movie_id = rng.randint(1, max_movie_id)
+        if roll < 0.45:
+            return "GET", f"/api/v1/movies/{movie_id}", None
+        if roll < 0.8:
+            return "GET", f"/api/v1/movies?page={rng.randint(1, 50)}&page_size=20", None
+        if roll < 0.9:
+            return "GET", f"/api/v1/movies/{movie_id}/ratings", None
+        return "POST", f"/api/v1/movies/{movie_id}/ratings", {"score": rng.randint(1, 10)}
+
+    return make_request
+
+
+def catalog_mix(max_movie_id: int):
+    """Searches and movie writes: the work the async stack still does on its event loop (n-gram
+    ranking without trigram search, cache lookups) next to what it hands to the threadpool
+    (index upserts and cache invalidation after each write)."""
+    def make_request(rng):
+        roll = rng.random()
+        movie_id = rng.randint(1, max_movie_id)
+        if roll < 0.35:
+            return "GET", f"/api/v1/movies?q={rng.choice(TITLE_WORDS)}&page_size=20", None
+        if roll < 0.65:
+            return "GET", f"/api/v1/movies/{movie_id}", None
+        if roll < 0.8:
+            return "GET", f"/api/v1/movies?page={rng.randint(1, 50)}&page_size=20", None
+        if roll < 0.9:
+            return "PATCH", f"/api/v1/movies/{movie_id}", {"release_year": rng.randint(1950, 2024)}
+        return "POST", f"/api/v1/movies/{movie_id}/ratings", {"score": rng.randint(1, 10)}
+
+    return make_request
+
+
+MIXES = {"read": request_mix, "catalog": catalog_mix}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    parser.add_argument("--mix", default="read", choices=sorted(MIXES))
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        seed_synthetic_catalog(db, args.movies)
+        max_movie_id = db.scalar(select(func.max(Movie.id)))
+    finally:
+        db.close()
+
+    mix = MIXES[args.mix]
+    report = {
+        "movies": args.movies,
+        "mix": args.mix,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "modes": {},
+    }
+    for mode in args.modes:
+        with running_server(args.port, env={"DB_MODE": mode}) as base_url:
+            run_load(base_url, mix(max_movie_id), concurrency=4, duration=2.0)  # warm-up
+            report["modes"][mode] = run_load(base_url, mix(max_movie_id), args.concurrency, args.duration)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Flag regressions between two ``scripts.bench_api`` reports.
+
+Usage:
+    python -m scripts.bench_compare base.json new.json --max-throughput-drop 0.1 --max-latency-increase 0.15
+
+Prints one REGRESSION line per worse metric and exits 1 if there is any, so it can gate CI.
+Only scenarios present in both reports are compared.
+"""
+import argparse
+import json
+import sys
+
+
+def compare(base: dict, new: dict, max_throughput_drop: float, max_latency_increase: float) -> list[str]:
+    """Return one line per regression of ``new`` against ``base``."""
+    regressions = []
+    for name, before in base["scenarios"].items():
+        after = new["scenarios"].get(name)
+        if after is None:
+            continue
+        if before["req_per_s"] and after["req_per_s"] < before["req_per_s"] * (1 - max_throughput_drop):
+            regressions.append(f"{name}: throughput {before['req_per_s']} -> {after['req_per_s']} req/s")
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if before[key] and after[key] > before[key] * (1 + max_latency_increase):
+                regressions.append(f"{name}: {key} {before[key]} -> {after[key]}")
+        if after["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {after['errors']}")
+        # statement counts are deterministic per request, so any increase is a real change
+        statements_before = before.get("sql_statements")
+        statements_after = after.get("sql_statements")
+        if statements_before and statements_after and statements_after["max"] > statements_before["max"]:
+            regressions.append(
+                f"{name}: SQL statements per request {statements_before['max']} -> {statements_after['max']} (max)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--max-throughput-drop", type=float, default=0.10)
+    parser.add_argument("--max-latency-increase", type=float, default=0.15)
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    regressions = compare(base, new, args.max_throughput_drop, args.max_latency_increase)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print("No regressions.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
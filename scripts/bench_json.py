@@ -0,0 +1,121 @@
+"""Benchmark the single-pass JSON response path against FastAPI's response_model path.
+
+Usage:
+    python -m scripts.bench_json --movies 1000 --page-size 100 --duration 5 > json.json
+
+A list page and a movie detail are read once from DATABASE_URL (topped up with synthetic
+movies first). Each body is then measured two ways:
+
+* encode: the per-response work only. "response_model" is what FastAPI does for a dict
+  returned from a route with ``response_model=SuccessResponse`` (validate, re-serialize
+  through pydantic, ``json.dumps``); "fast" is ``app.controller.responses.dumps``.
+* http: req/s and latency through a throwaway ASGI app with one route per path that returns
+  the prebuilt body, so database time does not hide the difference. End-to-end numbers come
+  from ``scripts.bench_api``.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import time
+
+import httpx
+from fastapi import FastAPI
+from pydantic import TypeAdapter
+
+from app.controller.responses import dumps, success_response
+from app.db.database import SessionLocal
+from app.schemas.common import SuccessResponse
+from app.services.movie_service import MovieService
+from scripts.bench_utils import seed_synthetic_catalog, summarize_ms
+
+
+def response_model_encode(adapter: TypeAdapter, content: dict) -> bytes:
+    # mirrors fastapi.routing.serialize_response + JSONResponse.render
+    validated = adapter.validate_python(content)
+    payload = adapter.dump_python(validated, mode="json")
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def time_encode(encode, content: dict, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode(content)
+        samples.append(time.perf_counter() - start)
+    return summarize_ms(samples)
+
+
+def build_app(bodies: dict[str, dict]) -> FastAPI:
+    # closures rather than default arguments, which FastAPI would treat as request parameters
+    def response_model_route(data: dict):
+        return lambda: {"status": "success", "data": data}
+
+    def fast_route(data: dict):
+        return lambda: success_response(data)
+
+    app = FastAPI()
+    for name, data in bodies.items():
+        app.add_api_route(f"/response_model/{name}", response_model_route(data), response_model=SuccessResponse)
+        app.add_api_route(f"/fast/{name}", fast_route(data))
+    return app
+
+
+async def drive(app: FastAPI, path: str, duration: float) -> dict:
+    samples = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            samples.append(time.perf_counter() - start)
+    return {"req_per_s": round(len(samples) / duration, 1), **summarize_ms(samples)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000, help="encodes per body and path")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of requests per route")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        seed_synthetic_catalog(db, args.movies)
+        service = MovieService(db)
+        page, _ = service.list_movies(page=1, page_size=args.page_size, title=None, release_year=None, genre=None)
+        detail = service.get_movie(page["items"][0]["id"])
+    finally:
+        db.close()
+
+    bodies = {"list": page, "detail": detail}
+    adapter = TypeAdapter(SuccessResponse)
+    app = build_app(bodies)
+    report = {
+        "config": {
+            "page_size": args.page_size,
+            "repeat": args.repeat,
+            "duration_s": args.duration,
+            "python": platform.python_version(),
+        },
+        "bodies": {},
+    }
+    for name, data in bodies.items():
+        content = {"status": "success", "data": data}
+        report["bodies"][name] = {
+            "bytes": len(dumps(content)),
+            "encode": {
+                "response_model": time_encode(lambda c: response_model_encode(adapter, c), content, args.repeat),
+                "fast": time_encode(dumps, content, args.repeat),
+            },
+            "http": {
+                path: asyncio.run(drive(app, f"/{path}/{name}", args.duration)) for path in ("response_model", "fast")
+            },
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
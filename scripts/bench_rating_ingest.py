@@ -0,0 +1,64 @@
+"""Compare sustained rating ingest through POST /movies/{id}/ratings and POST /ratings/bulk.
+
+Usage:
+    python -m scripts.bench_rating_ingest --batch-size 5000 --concurrency 8 --duration 15
+
+Both phases write real ratings into DATABASE_URL (topped up with a synthetic catalog first).
+"""
+import argparse
+import json
+
+from sqlalchemy import func, select
+
+from app.db.database import SessionLocal
+from app.models.movie import Movie
+from scripts.bench_utils import run_load, running_server, seed_synthetic_catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        seed_synthetic_catalog(db, args.movies)
+        max_movie_id = db.scalar(select(func.max(Movie.id)))
+    finally:
+        db.close()
+
+    def single(rng):
+        return "POST", f"/api/v1/movies/{rng.randint(1, max_movie_id)}/ratings", {"score": rng.randint(1, 10)}
+
+    def bulk(rng):
+        records = [
+            {"movie_id": rng.randint(1, max_movie_id), "score": rng.randint(1, 10)} for _ in range(args.batch_size)
+        ]
+        return "POST", "/api/v1/ratings/bulk", {"ratings": records}
+
+    with running_server(args.port) as base_url:
+        per_rating = run_load(base_url, single, args.concurrency, args.duration)
+        batched = run_load(base_url, bulk, args.concurrency, args.duration)
+
+    single_rate = per_rating["req_per_s"]
+    bulk_rate = batched["req_per_s"] * args.batch_size
+    print(
+        json.dumps(
+            {
+                "batch_size": args.batch_size,
+                "concurrency": args.concurrency,
+                "per_rating": {**per_rating, "ratings_per_s": single_rate},
+                "bulk": {**batched, "ratings_per_s": bulk_rate},
+                "speedup": round(bulk_rate / single_rate, 1) if single_rate else None,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
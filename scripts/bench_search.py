@@ -0,0 +1,68 @@
+"""Benchmark movie search (q=) against the title ILIKE filter on a large synthetic catalog.
+
+Usage:
+    python -m scripts.bench_search --movies 100000 --repeat 20 > search.json
+
+The catalog in DATABASE_URL is topped up with synthetic movies first. Note the two paths
+are not equivalent: the ILIKE filter only looks at titles, q= also matches cast and genres.
+"""
+import argparse
+import json
+import time
+
+from app.db.database import SessionLocal
+from app.repositories.movie_repository import MovieRepository
+from app.search.ngram_index import movie_search_index
+from scripts.bench_utils import seed_synthetic_catalog, summarize_ms
+
+DEFAULT_QUERIES = ["night", "dark river", "king", "ghost house", "ice", "garcia", "thriller", "no-such-title"]
+
+
+def time_calls(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--query", action="append", dest="queries", help="query to run (repeatable)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        seed_synthetic_catalog(db, args.movies)
+        repo = MovieRepository(db)
+        dialect = db.get_bind().dialect.name
+
+        report = {"dialect": dialect, "movies": args.movies, "page_size": args.page_size, "queries": {}}
+        if dialect != "postgresql":
+            start = time.perf_counter()
+            movie_search_index.build(db)
+            report["ngram_index_build_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+        for query in args.queries or DEFAULT_QUERIES:
+            common = dict(page=1, page_size=args.page_size, release_year=None, genre_ids=None)
+            ilike = time_calls(lambda: repo.list_movies(title=query, **common), args.repeat)
+            search = time_calls(lambda: repo.list_movies(title=None, search=query, **common), args.repeat)
+            _, ilike_total, _ = repo.list_movies(title=query, **common)
+            _, search_total, _ = repo.list_movies(title=None, search=query, **common)
+            report["queries"][query] = {
+                "ilike": {"total_items": ilike_total, **summarize_ms(ilike)},
+                "search": {"total_items": search_total, **summarize_ms(search)},
+            }
+            db.rollback()
+
+        print(json.dumps(report, indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
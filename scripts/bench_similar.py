@@ -0,0 +1,98 @@
+"""Benchmark the "similar movies" index on a large synthetic catalog.
+
+Usage:
+    python -m scripts.bench_similar --movies 100000 --queries 500 > similar.json
+    python -m scripts.bench_similar --verify 50   # check rankings against a brute-force scan
+
+The catalog in DATABASE_URL is topped up with synthetic movies first. Reports the index build
+time, top-k query latency over random movies, the cost of the incremental updates the write
+endpoints make, and how many --verify rankings match a brute-force cosine over every movie.
+"""
+import argparse
+import heapq
+import json
+import random
+import time
+
+from app.db.database import SessionLocal
+from app.search.similarity_index import MovieSimilarityIndex, cosine
+from scripts.bench_utils import seed_synthetic_catalog, summarize_ms
+
+
+def brute_force(index: MovieSimilarityIndex, movie_id: int, limit: int) -> list[tuple[int, float]]:
+    """The same ranking as ``index.similar``, computed against every indexed movie."""
+    query = index._vectors[movie_id]
+    ranked = []
+    for other, vector in index._vectors.items():
+        score = cosine(query, vector)
+        if other != movie_id and score:
+            ranked.append((-score, other))
+    return [(other, round(-score, 6)) for score, other in heapq.nsmallest(limit, ranked)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500, help="random movies to rank")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--updates", type=int, default=2000, help="incremental upsert/remove pairs to time")
+    parser.add_argument("--verify", type=int, default=20, help="rankings to check against a brute-force scan")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    db = SessionLocal()
+    try:
+        seed_synthetic_catalog(db, args.movies)
+        index = MovieSimilarityIndex()
+        start = time.perf_counter()
+        index.build(db)
+        build_ms = (time.perf_counter() - start) * 1000
+    finally:
+        db.close()
+
+    movie_ids = list(index._vectors)
+    report = {
+        "movies": len(index),
+        "signature_groups": len(index._groups),
+        "limit": args.limit,
+        "build_ms": round(build_ms, 3),
+    }
+
+    samples = []
+    for movie_id in rng.sample(movie_ids, min(args.queries, len(movie_ids))):
+        start = time.perf_counter()
+        index.similar(movie_id, args.limit)
+        samples.append(time.perf_counter() - start)
+    report["similar"] = summarize_ms(samples)
+
+    upserts, removes = [], []
+    for movie_id in rng.sample(movie_ids, min(args.updates, len(movie_ids))):
+        vector = index._vectors[movie_id]
+        decade, genres = vector.signature
+        start = time.perf_counter()
+        index.remove(movie_id)
+        removes.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        # the original features back, as an update endpoint would pass them
+        index.upsert(movie_id, vector.director_id, decade, ", ".join(vector.cast), list(genres))
+        upserts.append(time.perf_counter() - start)
+    report["upsert"] = summarize_ms(upserts)
+    report["remove"] = summarize_ms(removes)
+
+    matches = 0
+    brute_samples = []
+    verify_ids = rng.sample(movie_ids, min(args.verify, len(movie_ids)))
+    for movie_id in verify_ids:
+        start = time.perf_counter()
+        expected = brute_force(index, movie_id, args.limit)
+        brute_samples.append(time.perf_counter() - start)
+        matches += index.similar(movie_id, args.limit) == expected
+    report["brute_force"] = summarize_ms(brute_samples)
+    report["verified"] = {"checked": len(verify_ids), "identical": matches}
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Helpers shared by the benchmark scripts."""
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.association import genres_movie
+from app.models.director import Director
+from app.models.genre import Genre
+from app.models.movie import Movie
+from app.models.movie_rating import MovieRating
+from app.repositories.rating_repository import RatingRepository
+
+TITLE_WORDS = [
+    "night", "day", "dark", "light", "love", "war", "city", "river", "shadow", "king", "queen", "last",
+    "first", "lost", "found", "silent", "storm", "fire", "ice", "dream", "star", "road", "house", "blood",
+    "secret", "garden", "ghost", "empire", "island", "winter", "summer", "heart", "stone", "iron", "glass",
+]
+FIRST_NAMES = ["anna", "ben", "carla", "david", "elena", "frank", "grace", "henry", "iris", "jack", "kate", "leo"]
+LAST_NAMES = ["smith", "jones", "garcia", "miller", "davis", "lopez", "wilson", "moore", "taylor", "clark"]
+GENRE_NAMES = [
+    "Action", "Adventure", "Animation", "Comedy", "Crime", "Documentary", "Drama", "Family", "Fantasy",
+    "History", "Horror", "Music", "Mystery", "Romance", "Sci-Fi", "Thriller", "War", "Western",
+]
+
+
+def genre_name(index: int) -> str:
+    if index < len(GENRE_NAMES):
+        return GENRE_NAMES[index]
+    return f"{GENRE_NAMES[index % len(GENRE_NAMES)]} {index // len(GENRE_NAMES) + 1}"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize_ms(samples: list[float]) -> dict:
+    """Summarize durations given in seconds as milliseconds."""
+    ms = [s * 1000 for s in samples]
+    return {
+        "count": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+    }
+
+
+def seed_synthetic_catalog(
+    session: Session,
+    movies: int,
+    seed: int = 42,
+    batch_size: int = 5000,
+    directors: int | None = None,
+    genres: int | None = None,
+) -> int:
+    """Top the catalog up to ``movies`` synthetic movies; returns how many were inserted.
+
+    Directors and genres are only created when their tables are empty, ``movies // 10``
+    directors and the ``GENRE_NAMES`` genres unless told otherwise."""
+    existing = session.scalar(select(func.count(Movie.id)))
+    missing = movies - existing
+    if missing <= 0:
+        return 0
+
+    rng = random.Random(seed + existing)
+    genre_ids = list(session.scalars(select(Genre.id)))
+    if not genre_ids:
+        genre_ids = list(
+            session.scalars(
+                insert(Genre).returning(Genre.id, sort_by_parameter_order=True),
+                [{"name": genre_name(i)} for i in range(genres or len(GENRE_NAMES))],
+            )
+        )
+    director_ids = list(session.scalars(select(Director.id)))
+    if not director_ids:
+        director_ids = list(
+            session.scalars(
+                insert(Director).returning(Director.id, sort_by_parameter_order=True),
+                [{"name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"} for _ in range(directors or max(1, movies // 10))],
+            )
+        )
+
+    for start in range(0, missing, batch_size):
+        rows = [
+            {
+                "title": " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(1, 4))).title(),
+                "release_year": rng.randint(1920, 2025),
+                "cast": ", ".join(
+                    f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}".title() for _ in range(rng.randint(1, 5))
+                ),
+                "director_id": rng.choice(director_ids),
+            }
+            for _ in range(min(batch_size, missing - start))
+        ]
+        movie_ids = session.scalars(insert(Movie).returning(Movie.id, sort_by_parameter_order=True), rows).all()
+        links = [
+            {"movie_id": movie_id, "genre_id": genre_id}
+            for movie_id in movie_ids
+            for genre_id in rng.sample(genre_ids, rng.randint(1, 3))
+        ]
+        session.execute(insert(genres_movie), links)
+        session.commit()
+    return missing
+
+
+def seed_synthetic_ratings(session: Session, ratings: int, seed: int = 42, batch_size: int = 20_000) -> int:
+    """Top ``movie_ratings`` up to ``ratings`` rows spread uniformly over the catalog, keeping the
+    movie aggregates in step; returns how many were inserted."""
+    existing = session.scalar(select(func.count(MovieRating.id)))
+    missing = ratings - existing
+    if missing <= 0:
+        return 0
+
+    rng = random.Random(seed + existing)
+    max_movie_id = session.scalar(select(func.max(Movie.id)))
+    now = datetime.now(timezone.utc)
+    repo = RatingRepository(session)
+    for start in range(0, missing, batch_size):
+        rows = [
+            {
+                "movie_id": rng.randint(1, max_movie_id),
+                "score": rng.randint(1, 10),
+                "created_at": now - timedelta(seconds=rng.randint(0, 5 * 365 * 86400)),
+            }
+            for _ in range(min(batch_size, missing - start))
+        ]
+        repo.bulk_create_ratings(rows)
+        session.commit()
+    return missing
+
+
+@contextmanager
+def running_server(port: int, env: dict[str, str] | None = None, startup_timeout: float = 30.0):
+    """Run ``app.main:app`` under uvicorn on ``port`` for the duration of the block."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, **(env or {})},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                if httpx.get(f"{base_url}/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"server on port {port} did not start")
+            time.sleep(0.2)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+async def _load_worker(client: httpx.AsyncClient, make_request, deadline: float, rng: random.Random, results: list):
+    while time.perf_counter() < deadline:
+        method, path, body = make_request(rng)
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, json=body)
+            results.append((time.perf_counter() - start, response.status_code, response.headers))
+        except httpx.TransportError:
+            results.append((time.perf_counter() - start, 0, {}))
+
+
+async def _run_load(base_url: str, make_request, concurrency: int, duration: float, seed: int) -> list:
+    results: list = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            *(_load_worker(client, make_request, deadline, random.Random(seed + i), results) for i in range(concurrency))
+        )
+    return results
+
+
+def run_load(base_url: str, make_request, concurrency: int, duration: float, seed: int = 42) -> dict:
+    """Drive ``make_request(rng) -> (method, path, json_body)`` from ``concurrency`` clients for
+    ``duration`` seconds and summarize throughput and latency."""
+    results = asyncio.run(_run_load(base_url, make_request, concurrency, duration, seed))
+    latencies = [elapsed for elapsed, status, _ in results if 0 < status < 500]
+    errors = sum(1 for _, status, _ in results if status == 0 or status >= 500)
+    summary = {
+        "requests": len(results),
+        "errors": errors,
+        "req_per_s": round(len(latencies) / duration, 1),
+        **summarize_ms(latencies),
+    }
+    # reported by the server unless SQL_STATEMENT_BUDGET_MODE=off
+    statements = [
+        int(headers["x-sql-statements"])
+        for _, status, headers in results
+        if 0 < status < 500 and "x-sql-statements" in headers
+    ]
+    if statements:
+        summary["sql_statements"] = {"mean": round(statistics.fmean(statements), 2), "max": max(statements)}
+    return summary
@@ -0,0 +1,131 @@
+"""Verify (and optionally repair) the rating aggregates, score histogram and weighted score
+stored on ``movies``.
+
+Usage:
+    python -m scripts.check_rating_aggregates           # report mismatches, exit 1 if any
+    python -m scripts.check_rating_aggregates --repair  # recompute mismatched movies from movie_ratings
+"""
+import argparse
+import sys
+
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.models.catalog_version import catalog_bump
+from app.models.movie import SCORES, Movie, score_count_column, version_bump
+from app.models.movie_rating import MovieRating
+from app.repositories.leaderboard_repository import weighted_score_expression
+
+# weighted_score is a float; differences below this are rounding, not drift
+SCORE_TOLERANCE = 1e-6
+
+
+def find_mismatches(session: Session):
+    """Rows of ``(movie_id, stored, actual)`` where each side is a dict of the aggregate columns."""
+    actual = (
+        select(
+            MovieRating.movie_id.label("movie_id"),
+            func.count(MovieRating.id).label("ratings_count"),
+            func.sum(MovieRating.score).label("rating_sum"),
+            *(
+                func.sum(case((MovieRating.score == score, 1), else_=0)).label(score_count_column(score))
+                for score in SCORES
+            ),
+        )
+        .group_by(MovieRating.movie_id)
+        .subquery()
+    )
+    columns = ["ratings_count", "rating_sum", *(score_count_column(score) for score in SCORES)]
+    actual_values = {name: func.coalesce(actual.c[name], 0) for name in columns}
+    actual_score = weighted_score_expression(actual_values["ratings_count"], actual_values["rating_sum"])
+    movies = Movie.__table__
+
+    rows = session.execute(
+        select(
+            movies.c.id,
+            *(movies.c[name] for name in columns),
+            movies.c.weighted_score,
+            *actual_values.values(),
+            actual_score,
+        )
+        .outerjoin(actual, actual.c.movie_id == movies.c.id)
+        .where(
+            or_(
+                *(movies.c[name] != value for name, value in actual_values.items()),
+                func.abs(movies.c.weighted_score - actual_score) > SCORE_TOLERANCE,
+            )
+        )
+        .order_by(movies.c.id)
+    ).all()
+
+    names = columns + ["weighted_score"]
+    return [
+        (row[0], dict(zip(names, row[1:len(names) + 1])), dict(zip(names, row[len(names) + 1:])))
+        for row in rows
+    ]
+
+
+def repair(session: Session, movie_ids: list[int]) -> None:
+    # Recompute in a single statement per movie so concurrent rating inserts are not lost.
+    for movie_id in movie_ids:
+        ratings = select(MovieRating.id).where(MovieRating.movie_id == movie_id)
+        count = ratings.with_only_columns(func.count(MovieRating.id)).scalar_subquery()
+        total = ratings.with_only_columns(func.coalesce(func.sum(MovieRating.score), 0)).scalar_subquery()
+        histogram = {
+            score_count_column(score): ratings.with_only_columns(func.count(MovieRating.id))
+            .where(MovieRating.score == score)
+            .scalar_subquery()
+            for score in SCORES
+        }
+        session.execute(
+            update(Movie)
+            .where(Movie.id == movie_id)
+            .values(
+                ratings_count=count,
+                rating_sum=total,
+                weighted_score=weighted_score_expression(count, total),
+                **histogram,
+                **version_bump(Movie.__table__),
+            )
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repair", action="store_true", help="rewrite mismatched aggregates from movie_ratings")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        mismatches = find_mismatches(db)
+        for movie_id, stored, actual in mismatches:
+            differences = ", ".join(
+                f"{name} stored={stored[name]} actual={actual[name]}"
+                for name in stored
+                if stored[name] != actual[name]
+            )
+            print(f"movie {movie_id}: {differences}")
+
+        if not mismatches:
+            print("Rating aggregates are consistent.")
+            return 0
+
+        if not args.repair:
+            print(f"{len(mismatches)} movie(s) have inconsistent rating aggregates. Re-run with --repair to fix.")
+            return 1
+
+        repair(db, [row[0] for row in mismatches])
+        db.execute(catalog_bump())
+        db.commit()
+        print(f"Repaired rating aggregates for {len(mismatches)} movie(s).")
+        return 0
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Verify (and optionally rebuild) the hourly rating rollups in ``movie_rating_rollups``.
+
+Usage:
+    python -m scripts.check_rating_rollups            # report mismatched buckets, exit 1 if any
+    python -m scripts.check_rating_rollups --rebuild  # recompute every rollup from movie_ratings
+
+--rebuild runs in one transaction; on PostgreSQL it holds a SHARE lock on movie_ratings, so
+rating writes wait for it instead of racing it.
+"""
+import argparse
+import sys
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.models.movie_rating_rollup import MovieRatingRollup
+from app.repositories.rating_repository import ROLLUP_COUNTERS, rebuild_rollups, rollups_from_ratings
+
+
+def find_mismatches(session: Session):
+    """Rows of ``(movie_id, bucket, stored, actual)``; either side is ``None`` when the bucket
+    only exists on the other, otherwise a dict of the counters."""
+    actual = rollups_from_ratings().subquery()
+    rollups = MovieRatingRollup.__table__
+    same_bucket = and_(rollups.c.movie_id == actual.c.movie_id, rollups.c.bucket == actual.c.bucket)
+
+    differing = session.execute(
+        select(
+            actual.c.movie_id,
+            actual.c.bucket,
+            rollups.c.movie_id.label("stored_movie_id"),
+            *(rollups.c[name].label(f"stored_{name}") for name in ROLLUP_COUNTERS),
+            *(actual.c[name] for name in ROLLUP_COUNTERS),
+        )
+        .outerjoin(rollups, same_bucket)
+        .where(or_(rollups.c.movie_id.is_(None), *(rollups.c[name] != actual.c[name] for name in ROLLUP_COUNTERS)))
+    ).all()
+    stale = session.execute(
+        select(rollups.c.movie_id, rollups.c.bucket, *(rollups.c[name] for name in ROLLUP_COUNTERS))
+        .outerjoin(actual, same_bucket)
+        .where(actual.c.movie_id.is_(None))
+    ).all()
+
+    mismatches = []
+    for row in differing:
+        values = row._mapping
+        stored = None
+        if values["stored_movie_id"] is not None:
+            stored = {name: values[f"stored_{name}"] for name in ROLLUP_COUNTERS}
+        mismatches.append((row.movie_id, row.bucket, stored, {name: values[name] for name in ROLLUP_COUNTERS}))
+    for row in stale:
+        mismatches.append((row.movie_id, row.bucket, {name: row._mapping[name] for name in ROLLUP_COUNTERS}, None))
+    return sorted(mismatches, key=lambda m: (m[0], str(m[1])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="recompute every rollup from movie_ratings")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.rebuild:
+            rebuild_rollups(db, db.get_bind().dialect.name)
+            db.commit()
+            print("Rebuilt rating rollups from movie_ratings.")
+            return 0
+
+        mismatches = find_mismatches(db)
+        for movie_id, bucket, stored, actual in mismatches:
+            if stored is None:
+                detail = f"missing, {actual['ratings_count']} rating(s) in movie_ratings"
+            elif actual is None:
+                detail = f"stored ratings_count={stored['ratings_count']} but no ratings in movie_ratings"
+            else:
+                detail = ", ".join(
+                    f"{name} stored={stored[name]} actual={actual[name]}" for name in stored if stored[name] != actual[name]
+                )
+            print(f"movie {movie_id} bucket {bucket}: {detail}")
+        if not mismatches:
+            print("Rating rollups are consistent.")
+            return 0
+        print(f"{len(mismatches)} rollup bucket(s) are inconsistent. Re-run with --rebuild to fix.")
+        return 1
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
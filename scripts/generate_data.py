@@ -0,0 +1,298 @@
+"""Generate a large, realistic synthetic dataset in bulk.
+
+Usage:
+    python -m scripts.generate_data --directors 10000 --genres 50 --movies 100000 --ratings 10000000
+    python -m scripts.generate_data --movies 0 --ratings 1000000 --seed 7   # more ratings for existing movies
+
+Rows are streamed in bounded batches, each committed on its own: COPY on PostgreSQL
+(psycopg2), executemany everywhere else. Ids are assigned here, after the current maximum,
+so the same seed against the same starting database produces the same data. Ratings per
+movie follow a Zipf distribution (a few blockbusters, a long tail), created_at is spread
+uniformly over the ``--years`` before ``--end``, and the movie rating aggregates and the
+hourly rollups are updated once at the end instead of per rating.
+"""
+import argparse
+import csv
+import io
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+
+from sqlalchemy import column, func, insert, select, table, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.expression import TableClause
+
+from app.config import LEADERBOARD_PRIOR_MEAN
+from app.db.database import engine
+from app.models.association import genres_movie
+from app.models.catalog_version import catalog_bump
+from app.models.director import Director
+from app.models.genre import Genre
+from app.models.movie import SCORES, Movie
+from app.models.movie_rating import MovieRating
+from app.repositories.rating_repository import RatingRepository, aggregate_values, rebuild_rollups
+from scripts.bench_utils import FIRST_NAMES, LAST_NAMES, TITLE_WORDS, genre_name
+
+
+class Progress:
+    def __init__(self, label: str, total: int):
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.started = time.perf_counter()
+
+    def advance(self, rows: int) -> None:
+        self.done += rows
+        elapsed = time.perf_counter() - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        print(f"{self.label}: {self.done:,}/{self.total:,} rows ({rate:,.0f} rows/s)", file=sys.stderr)
+
+
+def write_rows(conn: Connection, table: TableClause, columns: list[str], rows: list[tuple]) -> None:
+    """Bulk-insert ``rows`` (tuples in ``columns`` order) inside the connection's transaction."""
+    if not rows:
+        return
+    if conn.dialect.name == "postgresql":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        # quoted: movies.cast is a reserved word in PostgreSQL
+        quote = conn.dialect.identifier_preparer.quote
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {quote(table.name)} ({', '.join(quote(name) for name in columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+    else:
+        conn.execute(insert(table), [dict(zip(columns, row)) for row in rows])
+
+
+def stream(conn: Connection, table: TableClause, columns: list[str], rows, total: int, batch_size: int) -> None:
+    progress = Progress(table.name, total)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            write_rows(conn, table, columns, batch)
+            conn.commit()
+            progress.advance(len(batch))
+            batch = []
+    if batch:
+        write_rows(conn, table, columns, batch)
+        conn.commit()
+        progress.advance(len(batch))
+
+
+def next_id(conn: Connection, column) -> int:
+    return (conn.scalar(select(func.max(column))) or 0) + 1
+
+
+def reset_sequence(conn: Connection, table: TableClause) -> None:
+    # ids were assigned explicitly, so the serial sequence has to catch up
+    if conn.dialect.name == "postgresql":
+        conn.execute(
+            text(f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), (SELECT MAX(id) FROM {table.name}))")
+        )
+        conn.commit()
+
+
+def zipf_cum_weights(count: int, s: float, rng: random.Random) -> list[float]:
+    """Cumulative Zipf weights over ``count`` items in random rank order."""
+    ranks = list(range(1, count + 1))
+    rng.shuffle(ranks)
+    return list(accumulate(1.0 / rank**s for rank in ranks))
+
+
+def person_name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}".title()
+
+
+def generate_directors(conn: Connection, count: int, rng: random.Random, batch_size: int) -> None:
+    start = next_id(conn, Director.id)
+    rows = ((start + i, person_name(rng), rng.randint(1920, 1995)) for i in range(count))
+    stream(conn, Director.__table__, ["id", "name", "birth_year"], rows, count, batch_size)
+    reset_sequence(conn, Director.__table__)
+
+
+def generate_genres(conn: Connection, count: int, batch_size: int) -> None:
+    """Add ``count`` genres whose generated names are not taken yet (names are unique)."""
+    taken = set(conn.scalars(select(Genre.name)))
+    start = next_id(conn, Genre.id)
+    names = []
+    index = 0
+    while len(names) < count:
+        name = genre_name(index)
+        if name not in taken:
+            names.append(name)
+        index += 1
+    rows = ((start + i, name) for i, name in enumerate(names))
+    stream(conn, Genre.__table__, ["id", "name"], rows, count, batch_size)
+    reset_sequence(conn, Genre.__table__)
+
+
+def generate_movies(conn: Connection, count: int, rng: random.Random, zipf_s: float, batch_size: int) -> None:
+    director_ids = list(conn.scalars(select(Director.id).order_by(Director.id)))
+    genre_ids = list(conn.scalars(select(Genre.id).order_by(Genre.id)))
+    if count and not (director_ids and genre_ids):
+        raise SystemExit("movies need at least one director and one genre; generate those first")
+    # popular genres (and prolific directors) are shared by many movies
+    genre_weights = zipf_cum_weights(len(genre_ids), zipf_s, rng)
+    director_weights = zipf_cum_weights(len(director_ids), 0.5, rng)
+
+    progress = Progress(Movie.__tablename__, count)
+    next_movie_id = next_id(conn, Movie.id)
+    for start in range(0, count, batch_size):
+        movie_rows = []
+        link_rows = []
+        for movie_id in range(next_movie_id + start, next_movie_id + min(count, start + batch_size)):
+            movie_rows.append(
+                (
+                    movie_id,
+                    " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(1, 4))).title(),
+                    rng.randint(1920, 2025),
+                    ", ".join(person_name(rng) for _ in range(rng.randint(1, 5))),
+                    rng.choices(director_ids, cum_weights=director_weights)[0],
+                    # no ratings yet: the Bayesian average is the prior mean
+                    LEADERBOARD_PRIOR_MEAN,
+                )
+            )
+            for genre_id in sorted(set(rng.choices(genre_ids, cum_weights=genre_weights, k=rng.randint(1, 3)))):
+                link_rows.append((movie_id, genre_id))
+        write_rows(
+            conn, Movie.__table__, ["id", "title", "release_year", "cast", "director_id", "weighted_score"], movie_rows
+        )
+        write_rows(conn, genres_movie, ["movie_id", "genre_id"], link_rows)
+        conn.commit()
+        progress.advance(len(movie_rows))
+    reset_sequence(conn, Movie.__table__)
+
+
+def generate_ratings(
+    conn: Connection,
+    count: int,
+    rng: random.Random,
+    zipf_s: float,
+    end: datetime,
+    years: float,
+    batch_size: int,
+) -> None:
+    movie_ids = list(conn.scalars(select(Movie.id).order_by(Movie.id)))
+    if count and not movie_ids:
+        raise SystemExit("ratings need at least one movie; generate movies first")
+    cum_weights = zipf_cum_weights(len(movie_ids), zipf_s, rng)
+    span = int(years * 365 * 86400)
+    # movie id -> ratings per score, applied to the aggregates at the end
+    histograms: dict[int, dict[int, int]] = {}
+
+    def rows():
+        rating_id = next_id(conn, MovieRating.id)
+        remaining = count
+        while remaining:
+            chunk = min(batch_size, remaining)
+            for movie_id in rng.choices(movie_ids, cum_weights=cum_weights, k=chunk):
+                score = rng.randint(1, 10)
+                histogram = histograms.setdefault(movie_id, {})
+                histogram[score] = histogram.get(score, 0) + 1
+                yield rating_id, movie_id, score, end - timedelta(seconds=rng.randrange(span))
+                rating_id += 1
+            remaining -= chunk
+
+    stream(conn, MovieRating.__table__, ["id", "movie_id", "score", "created_at"], rows(), count, batch_size)
+    reset_sequence(conn, MovieRating.__table__)
+    apply_aggregates(conn, histograms, batch_size)
+    if count:
+        # ratings land in tens of thousands of hourly buckets; regrouping them in SQL beats
+        # tracking every (movie, hour) pair here
+        print("movie_rating_rollups: rebuilding from movie_ratings", file=sys.stderr)
+        rebuild_rollups(conn, conn.dialect.name)
+        conn.commit()
+
+
+def apply_aggregates(conn: Connection, deltas: dict[int, dict[int, int]], batch_size: int) -> None:
+    """Add the generated ratings (movie id -> ratings per score) to the movie aggregates in one pass."""
+    if not deltas:
+        return
+    if conn.dialect.name == "postgresql":
+        # an executemany UPDATE would cost one round-trip per movie with psycopg2
+        score_columns = [f"s{score}" for score in SCORES]
+        conn.execute(
+            text(
+                "CREATE TEMP TABLE rating_deltas (movie_id integer, count integer, total integer, "
+                + ", ".join(f"{name} integer" for name in score_columns)
+                + ") ON COMMIT DROP"
+            )
+        )
+        deltas_table = table(
+            "rating_deltas", column("movie_id"), column("count"), column("total"), *(column(name) for name in score_columns)
+        )
+        write_rows(
+            conn,
+            deltas_table,
+            ["movie_id", "count", "total", *score_columns],
+            [
+                (
+                    movie_id,
+                    sum(histogram.values()),
+                    sum(score * n for score, n in histogram.items()),
+                    *(histogram.get(score, 0) for score in SCORES),
+                )
+                for movie_id, histogram in deltas.items()
+            ],
+        )
+        movies = Movie.__table__
+        conn.execute(
+            update(movies)
+            .where(movies.c.id == deltas_table.c.movie_id)
+            .values(
+                **aggregate_values(
+                    movies,
+                    deltas_table.c.count,
+                    deltas_table.c.total,
+                    {score: deltas_table.c[f"s{score}"] for score in SCORES},
+                )
+            )
+        )
+        conn.commit()
+        return
+
+    items = sorted(deltas.items())
+    for start in range(0, len(items), batch_size):
+        # Connection.execute takes the same Core statements as a Session
+        RatingRepository(conn).apply_aggregate_deltas(dict(items[start:start + batch_size]))
+        conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--directors", type=int, default=10_000)
+    parser.add_argument("--genres", type=int, default=50)
+    parser.add_argument("--movies", type=int, default=100_000)
+    parser.add_argument("--ratings", type=int, default=10_000_000)
+    parser.add_argument("--zipf-s", type=float, default=1.1, help="Zipf exponent for ratings per movie")
+    parser.add_argument("--years", type=float, default=10.0, help="span of rating created_at values")
+    parser.add_argument("--end", type=datetime.fromisoformat, default=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                        help="latest rating created_at (ISO 8601); fixed so output is reproducible")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        generate_directors(conn, args.directors, rng, args.batch_size)
+        generate_genres(conn, args.genres, args.batch_size)
+        generate_movies(conn, args.movies, rng, args.zipf_s, args.batch_size)
+        generate_ratings(conn, args.ratings, rng, args.zipf_s, args.end, args.years, args.batch_size)
+        # listing ETags cached by clients before the load must not validate against it
+        conn.execute(catalog_bump())
+        conn.commit()
+    print(f"Done in {time.perf_counter() - started:.1f}s.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Rewrite every movie's leaderboard score from its stored rating aggregates.
+
+Usage:
+    python -m scripts.recompute_weighted_scores                  # after changing LEADERBOARD_PRIOR_*
+    python -m scripts.recompute_weighted_scores --batch-size 5000
+
+Runs in id-range batches, each its own short transaction, so it can run against a live
+database. On PostgreSQL it also moves the column default to LEADERBOARD_PRIOR_MEAN, so rows
+inserted outside the ORM start at the new prior. Also prints the observed mean rating, a
+data-driven value for LEADERBOARD_PRIOR_MEAN.
+"""
+import argparse
+
+from sqlalchemy import func, select, text, update
+
+from app.config import LEADERBOARD_PRIOR_MEAN, LEADERBOARD_PRIOR_WEIGHT
+from app.db.database import SessionLocal
+from app.models.movie import Movie
+from app.repositories.leaderboard_repository import weighted_score_expression
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        max_id = db.scalar(select(func.max(Movie.id))) or 0
+        for start in range(0, max_id, args.batch_size):
+            # one statement per batch, computed from the row's current aggregates
+            db.execute(
+                update(Movie)
+                .where(Movie.id > start, Movie.id <= start + args.batch_size)
+                .values(weighted_score=weighted_score_expression(Movie.ratings_count, Movie.rating_sum))
+            )
+            db.commit()
+        if db.get_bind().dialect.name == "postgresql":
+            # rows inserted outside the ORM (COPY, raw SQL) start at the column default
+            db.execute(
+                text(f"ALTER TABLE movies ALTER COLUMN weighted_score SET DEFAULT {float(LEADERBOARD_PRIOR_MEAN)!r}")
+            )
+            db.commit()
+
+        count, total = db.execute(select(func.sum(Movie.ratings_count), func.sum(Movie.rating_sum))).one()
+        print(f"Recomputed weighted scores for movies up to id {max_id} (m={LEADERBOARD_PRIOR_WEIGHT}, C={LEADERBOARD_PRIOR_MEAN}).")
+        if count:
+            print(f"Observed mean rating: {total / count:.3f}")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
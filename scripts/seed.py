@@ -1,9 +1,14 @@
+from datetime import datetime, timezone
+
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal
+from app.models.catalog_version import catalog_bump
 from app.models.director import Director
 from app.models.genre import Genre
 from app.models.movie import Movie
 from app.models.movie_rating import MovieRating
+from app.models.movie_rating_rollup import bucket_start
+from app.repositories.rating_repository import RatingRepository
 
 
 def get_or_create(session: Session, model, defaults=None, **kwargs):
@@ -63,12 +68,17 @@ def main():
         def add_rating_if_missing(movie: Movie, score: int):
             exists = db.query(MovieRating).filter(MovieRating.movie_id == movie.id, MovieRating.score == score).first()
             if not exists:
-                db.add(MovieRating(movie_id=movie.id, score=score))
+                created_at = datetime.now(timezone.utc)
+                db.add(MovieRating(movie_id=movie.id, score=score, created_at=created_at))
+                repo = RatingRepository(db)
+                repo.apply_aggregate_delta(movie.id, {score: 1})
+                repo.apply_rollup_deltas({(movie.id, bucket_start(created_at)): {score: 1}})
 
         add_rating_if_missing(inception, 9)
         add_rating_if_missing(inception, 8)
         add_rating_if_missing(fight_club, 10)
 
+        db.execute(catalog_bump())
         db.commit()
         print("Seed completed successfully.")
     except Exception:
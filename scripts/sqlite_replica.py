@@ -0,0 +1,45 @@
+"""Imitate a streaming replica locally by copying a SQLite primary onto a replica file.
+
+Usage:
+    python -m scripts.sqlite_replica primary.db replica.db               # one copy
+    python -m scripts.sqlite_replica primary.db replica.db --interval 2  # copy every 2s (lag <= 2s)
+
+Point the app at both files to try replica routing without PostgreSQL:
+
+    DATABASE_URL=sqlite:///primary.db DATABASE_REPLICA_URLS=sqlite:///replica.db uvicorn app.main:app
+
+Each copy goes through SQLite's online backup API, so readers of the replica see either the
+previous copy or the new one. With two local PostgreSQL instances, use real streaming
+replication instead and list the standby in DATABASE_REPLICA_URLS.
+"""
+import argparse
+import sqlite3
+import sys
+import time
+
+
+def copy_database(source: str, target: str) -> None:
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+    src.close()
+    dst.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("primary", help="SQLite file the app writes to")
+    parser.add_argument("replica", help="SQLite file listed in DATABASE_REPLICA_URLS")
+    parser.add_argument("--interval", type=float, default=0, help="seconds between copies; 0 copies once")
+    args = parser.parse_args()
+
+    while True:
+        started = time.perf_counter()
+        copy_database(args.primary, args.replica)
+        print(f"copied {args.primary} -> {args.replica} in {(time.perf_counter() - started) * 1000:.0f} ms", file=sys.stderr)
+        if args.interval <= 0:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+# app.config and app.db.database read the environment on import, so configure it first
+_db_dir = tempfile.mkdtemp(prefix="movie-rating-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["DB_MODE"] = "sync"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["SQL_STATEMENT_BUDGET_MODE"] = "enforce"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cache.response_cache import response_cache
+from app.db.database import Base, SessionLocal, engine
+from app.main import app
+from app.models import Director, Genre
+from app.search.ngram_index import movie_search_index
+from app.search.similarity_index import movie_similarity_index
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        db.add_all([Director(name="Christopher Nolan", birth_year=1970), Director(name="David Fincher", birth_year=1962)])
+        db.add_all([Genre(name="Drama"), Genre(name="Sci-Fi"), Genre(name="Thriller")])
+        db.commit()
+    finally:
+        db.close()
+    return engine
+
+
+@pytest.fixture(scope="session")
+def client(db_engine):
+    with TestClient(app) as test_client:
+        # let the startup builds finish, so they do not count against a budgeted request
+        movie_search_index.ensure_built()
+        movie_similarity_index.ensure_built()
+        movies = [
+            {"title": "Inception", "release_year": 2010, "cast": "Leonardo DiCaprio, Tom Hardy", "director_id": 1, "genre_ids": [2, 3]},
+            {"title": "Fight Club", "release_year": 1999, "cast": "Brad Pitt, Edward Norton", "director_id": 2, "genre_ids": [1]},
+            {"title": "Interstellar", "release_year": 2014, "cast": "Matthew McConaughey", "director_id": 1, "genre_ids": [1, 2]},
+            {"title": "Se7en", "release_year": 1995, "cast": "Brad Pitt, Morgan Freeman", "director_id": 2, "genre_ids": [1, 3]},
+        ]
+        for movie in movies:
+            assert test_client.post("/api/v1/movies", json=movie).status_code == 201
+        for score in (9, 8, 10):
+            assert test_client.post("/api/v1/movies/1/ratings", json={"score": score}).status_code == 201
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def empty_response_cache():
+    # budgets are about cache misses; a hit issues no statements at all
+    response_cache.clear()
+    yield
@@ -0,0 +1,46 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware import admission
+from app.middleware.admission import AdmissionController, admission_control_middleware
+
+
+def test_streamed_body_keeps_its_slot_until_sent(monkeypatch):
+    controller = AdmissionController(max_in_flight=1, queue_timeout=0, retry_after=1)
+    monkeypatch.setattr(admission, "admission_controller", controller)
+    seen_in_flight = []
+
+    app = FastAPI()
+    app.middleware("http")(admission_control_middleware)
+
+    @app.get("/api/stream")
+    def stream():
+        def body():
+            for chunk in ("a", "b"):
+                seen_in_flight.append(controller.in_flight)
+                yield chunk
+
+        return StreamingResponse(body())
+
+    with TestClient(app) as client:
+        assert client.get("/api/stream").text == "ab"
+        assert client.get("/api/stream").text == "ab"
+
+    assert seen_in_flight == [1, 1, 1, 1]
+    assert controller.in_flight == 0
+    assert controller.rejected == 0
+
+
+def test_a_short_burst_waits_instead_of_being_shed():
+    controller = AdmissionController(max_in_flight=1, queue_timeout=1.0, retry_after=1)
+
+    async def burst():
+        assert await controller.acquire()
+        asyncio.get_running_loop().call_later(0.05, controller.release)
+        return await controller.acquire()
+
+    assert asyncio.run(burst())
+    assert controller.rejected == 0
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+from app.db.database import SessionLocal
+from scripts import check_rating_aggregates, check_rating_rollups
+
+
+def test_bulk_ratings_insert_the_valid_records_and_shift_the_aggregates(client):
+    created = client.post("/api/v1/movies", json={"title": "Bulk Target", "director_id": 1, "genre_ids": [1]})
+    movie_id = created.json()["data"]["id"]
+    # cached before the bulk insert, so the detail below shows the invalidation too
+    assert client.get(f"/api/v1/movies/{movie_id}").json()["data"]["ratings_count"] == 0
+
+    last_week = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+    next_week = (datetime.now(timezone.utc) + timedelta(days=7)).isoformat()
+    response = client.post(
+        "/api/v1/ratings/bulk",
+        json={
+            "ratings": [
+                {"movie_id": movie_id, "score": 8},
+                {"movie_id": 999999, "score": 5},
+                {"movie_id": movie_id, "score": 6, "created_at": last_week},
+                {"movie_id": movie_id, "score": 11},
+                {"movie_id": movie_id, "score": 7, "created_at": next_week},
+                {"movie_id": movie_id, "score": 10},
+            ]
+        },
+    )
+    assert response.status_code == 200, response.text
+    summary = response.json()["data"]
+    assert (summary["accepted"], summary["rejected"]) == (3, 3)
+    assert [result.get("error") for result in summary["results"]] == [
+        None,
+        "Movie not found",
+        None,
+        "Score must be an integer between 1 and 10",
+        "created_at cannot be in the future",
+        None,
+    ]
+
+    movie = client.get(f"/api/v1/movies/{movie_id}").json()["data"]
+    assert (movie["ratings_count"], movie["average_rating"]) == (3, 8.0)
+    counts = {bucket["score"]: bucket["count"] for bucket in movie["rating_distribution"]["histogram"]}
+    assert counts == {score: int(score in (6, 8, 10)) for score in range(1, 11)}
+    ratings = client.get(f"/api/v1/movies/{movie_id}/ratings").json()["data"]
+    assert sorted(rating["score"] for rating in ratings) == [6, 8, 10]
+
+    # the stored aggregates and hourly rollups match a recount of the ratings
+    db = SessionLocal()
+    try:
+        assert [row for row in check_rating_aggregates.find_mismatches(db) if row[0] == movie_id] == []
+        assert [row for row in check_rating_rollups.find_mismatches(db) if row[0] == movie_id] == []
+    finally:
+        db.close()
@@ -0,0 +1,43 @@
+import json
+
+RECORDS = [
+    {"title": "Imported Noir", "release_year": 1947, "director": "Import Director", "genres": ["Film Noir", "drama"]},
+    {"title": "Imported Noir", "release_year": 1948, "director": "Import Director", "genres": ["Film Noir"]},
+    {"title": "Imported Noir", "release_year": 1947, "director": "Import Director", "genres": ["Film Noir"]},
+    {"title": "No Director", "release_year": 1950},
+]
+NDJSON = "\n".join(json.dumps(record) for record in RECORDS) + "\n"
+CSV = "title,release_year,director,genres\nImported Noir,1947,Import Director,Film Noir|Drama\n"
+
+
+def import_catalog(client, body: str, format: str = "ndjson") -> dict:
+    response = client.post("/api/v1/movies/import", params={"format": format}, content=body.encode())
+    assert response.status_code == 200, response.text
+    return response.json()["data"]
+
+
+def imported(client) -> list[tuple]:
+    items = client.get("/api/v1/movies", params={"title": "imported noir", "page_size": 10}).json()["data"]["items"]
+    return sorted(
+        (item["release_year"], item["director"]["name"], tuple(genre["name"] for genre in item["genres"])) for item in items
+    )
+
+
+def test_rerunning_an_import_adds_nothing(client):
+    first = import_catalog(client, NDJSON)
+    # the third record repeats the first's natural key (title, director, release_year)
+    assert (first["created"], first["existing"], first["rejected"]) == (2, 1, 1)
+    assert (first["directors_created"], first["genres_created"]) == (1, 1)
+    assert [error["line"] for error in first["errors"]] == [4]
+    movies = imported(client)
+    assert movies == [
+        (1947, "Import Director", ("Drama", "Film Noir")),
+        (1948, "Import Director", ("Film Noir",)),
+    ]
+
+    again = import_catalog(client, NDJSON)
+    assert (again["created"], again["existing"], again["rejected"]) == (0, 3, 1)
+    assert (again["directors_created"], again["genres_created"]) == (0, 0)
+    as_csv = import_catalog(client, CSV, format="csv")
+    assert (as_csv["created"], as_csv["existing"]) == (0, 1)
+    assert imported(client) == movies
@@ -0,0 +1,46 @@
+from app.db.statement_counter import count_statements
+
+
+def test_listing_reads_the_catalog_state_only_for_if_none_match(client, db_engine):
+    params = {"page_size": 2, "total": "none"}
+    # a non-matching If-None-Match reads the current state, which the page is then built under
+    first = client.get("/api/v1/movies", params=params, headers={"If-None-Match": '"stale"'})
+    etag = first.headers["ETag"]
+
+    with count_statements(db_engine) as counter:
+        cached = client.get("/api/v1/movies", params=params)
+    assert counter.count == 0
+    assert cached.headers["ETag"] == etag
+
+    with count_statements(db_engine) as counter:
+        not_modified = client.get("/api/v1/movies", params=params, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    # one primary key read of catalog_version, nothing over movies
+    assert counter.count == 1
+    assert "FROM catalog_version" in counter.statements[0]
+
+    # a rating on a movie elsewhere in the catalog leaves this page cached, but not its ETag
+    client.post("/api/v1/movies/4/ratings", json={"score": 4})
+    changed = client.get("/api/v1/movies", params=params, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert client.get("/api/v1/movies", params=params, headers={"If-None-Match": changed.headers["ETag"]}).status_code == 304
+
+    # as does a delete, which leaves no newer updated_at on any movie behind
+    created = client.post("/api/v1/movies", json={"title": "Scratch", "director_id": 1, "genre_ids": [1]})
+    before = client.get("/api/v1/movies", params=params, headers={"If-None-Match": '"stale"'}).headers["ETag"]
+    client.delete(f"/api/v1/movies/{created.json()['data']['id']}")
+    after = client.get("/api/v1/movies", params=params, headers={"If-None-Match": before})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before
+
+
+def test_put_and_patch_return_validators(client):
+    created = client.post("/api/v1/movies", json={"title": "Validators", "director_id": 1, "genre_ids": [1]})
+    movie_id = created.json()["data"]["id"]
+    for method, body in (("PUT", {"title": "Validators 2"}), ("PATCH", {"release_year": 1990})):
+        response = client.request(method, f"/api/v1/movies/{movie_id}", json=body)
+        version = response.json()["data"]["version"]
+        assert response.headers["ETag"] == f'"movie-{movie_id}-{version}"'
+        assert "Last-Modified" in response.headers
+        assert client.get(f"/api/v1/movies/{movie_id}", headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
@@ -0,0 +1,52 @@
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import update
+
+from app.db.database import SessionLocal
+from app.models.movie import Movie
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_incremental_rating_export_picks_up_backdated_imports(client):
+    first = client.get("/api/v1/export/ratings")
+    assert first.status_code == 200
+    last_id = int(first.headers["X-Export-Last-Id"])
+    assert max(record["id"] for record in ndjson(first)) == last_id
+
+    imported = client.post(
+        "/api/v1/ratings/bulk",
+        json={"ratings": [{"movie_id": 3, "score": 6, "created_at": "2001-01-01T00:00:00Z"}]},
+    )
+    assert imported.status_code < 300, imported.text
+
+    second = client.get("/api/v1/export/ratings", params={"after_id": last_id})
+    records = ndjson(second)
+    assert [(record["movie_id"], record["score"], record["created_at"][:4]) for record in records] == [(3, 6, "2001")]
+    assert int(second.headers["X-Export-Last-Id"]) == records[0]["id"]
+
+    third = client.get("/api/v1/export/ratings", params={"after_id": records[0]["id"]})
+    assert ndjson(third) == []
+    assert third.headers["X-Export-Last-Id"] == second.headers["X-Export-Last-Id"]
+
+
+def test_incremental_movie_export_picks_up_edits_made_right_after(client):
+    db = SessionLocal()
+    try:
+        # Se7en (4) last changed long ago, so an incremental export leaves it out
+        db.execute(update(Movie).where(Movie.id == 4).values(updated_at=datetime(2001, 1, 1, tzinfo=timezone.utc)))
+        db.commit()
+    finally:
+        db.close()
+
+    first = client.get("/api/v1/export/movies")
+    assert 4 in [record["id"] for record in ndjson(first)]
+    assert client.patch("/api/v1/movies/2", json={"release_year": 1999}).status_code == 200
+
+    second = client.get("/api/v1/export/movies", params={"updated_since": first.headers["X-Export-As-Of"]})
+    ids = [record["id"] for record in ndjson(second)]
+    assert 2 in ids
+    assert 4 not in ids
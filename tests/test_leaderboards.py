@@ -0,0 +1,46 @@
+import pytest
+
+from app.config import LEADERBOARD_PRIOR_MEAN, LEADERBOARD_PRIOR_WEIGHT
+from app.repositories import leaderboard_repository
+
+# a decade of its own, so movies rated by other tests stay off these boards
+DECADE = 1920
+SCORES = {"Single Ten": [10], "Five Nines": [9] * 5, "Two Threes": [3, 3], "Unrated": []}
+
+
+def weighted(scores: list[int]) -> float:
+    return round((sum(scores) + LEADERBOARD_PRIOR_WEIGHT * LEADERBOARD_PRIOR_MEAN) / (len(scores) + LEADERBOARD_PRIOR_WEIGHT), 4)
+
+
+@pytest.fixture(scope="module")
+def rated_movies(client):
+    ids = {}
+    for offset, (title, scores) in enumerate(SCORES.items(), start=1):
+        created = client.post(
+            "/api/v1/movies", json={"title": title, "release_year": DECADE + offset, "director_id": 1, "genre_ids": [1]}
+        )
+        ids[title] = created.json()["data"]["id"]
+        if scores:
+            ratings = [{"movie_id": ids[title], "score": score} for score in scores]
+            assert client.post("/api/v1/ratings/bulk", json={"ratings": ratings}).json()["data"]["accepted"] == len(scores)
+    return ids
+
+
+def test_leaderboard_ranks_by_weighted_score(client, rated_movies):
+    items = client.get("/api/v1/leaderboards", params={"decade": DECADE}).json()["data"]["items"]
+
+    # five 9s outrank a single 10: the prior pulls thinly rated movies towards the mean
+    assert [item["title"] for item in items] == ["Five Nines", "Single Ten", "Two Threes"]
+    assert [item["rank"] for item in items] == [1, 2, 3]
+    assert [item["weighted_score"] for item in items] == [weighted(SCORES[item["title"]]) for item in items]
+    assert [item["average_rating"] for item in items] == [9.0, 10.0, 3.0]
+
+
+def test_leaderboard_leaves_out_movies_below_min_ratings(client, rated_movies, monkeypatch):
+    monkeypatch.setattr(leaderboard_repository, "LEADERBOARD_MIN_RATINGS", 2)
+    items = client.get("/api/v1/leaderboards", params={"decade": DECADE}).json()["data"]["items"]
+    assert [item["title"] for item in items] == ["Five Nines", "Two Threes"]
+
+    monkeypatch.setattr(leaderboard_repository, "LEADERBOARD_MIN_RATINGS", 0)
+    items = client.get("/api/v1/leaderboards", params={"decade": DECADE, "limit": 4}).json()["data"]["items"]
+    assert [item["title"] for item in items] == ["Five Nines", "Single Ten", "Unrated", "Two Threes"]
@@ -0,0 +1,21 @@
+from app.config import MOVIE_BATCH_MAX_IDS
+
+
+def test_batch_keeps_request_order_drops_repeats_and_reports_missing_ids(client):
+    # Fight Club's detail is cached first: cached and loaded details still come back in order
+    single = client.get("/api/v1/movies/2").json()["data"]
+
+    response = client.get("/api/v1/movies/batch", params={"ids": "3,999999,2,1,3,999998,2"})
+    assert response.status_code == 200, response.text
+    data = response.json()["data"]
+    assert [movie["id"] for movie in data["items"]] == [3, 2, 1]
+    assert data["missing_ids"] == [999999, 999998]
+    assert data["items"][1] == single
+    assert data["items"][0]["title"] == "Interstellar"
+    assert data["items"][0]["genres"] == ["Drama", "Sci-Fi"]
+
+
+def test_batch_rejects_malformed_and_oversized_id_lists(client):
+    assert client.get("/api/v1/movies/batch", params={"ids": "1,two"}).status_code == 422
+    too_many = ",".join(str(movie_id) for movie_id in range(1, MOVIE_BATCH_MAX_IDS + 2))
+    assert client.get("/api/v1/movies/batch", params={"ids": too_many}).status_code == 422
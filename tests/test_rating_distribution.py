@@ -0,0 +1,28 @@
+def test_distribution_follows_each_rating(client):
+    created = client.post("/api/v1/movies", json={"title": "Distributed", "director_id": 2, "genre_ids": [3]})
+    movie_id = created.json()["data"]["id"]
+
+    empty = client.get(f"/api/v1/movies/{movie_id}/ratings/distribution").json()["data"]
+    assert empty["ratings_count"] == 0
+    assert [bucket["count"] for bucket in empty["histogram"]] == [0] * 10
+    assert (empty["average_rating"], empty["median"], empty["percentiles"]) == (None, None, None)
+
+    for score in (9, 4, 2, 10, 4, 7):
+        assert client.post(f"/api/v1/movies/{movie_id}/ratings", json={"score": score}).status_code == 201
+
+    distribution = client.get(f"/api/v1/movies/{movie_id}/ratings/distribution").json()["data"]
+    assert distribution["ratings_count"] == 6
+    assert distribution["average_rating"] == 6.0
+    assert distribution["histogram"] == [
+        {"score": score, "count": count} for score, count in zip(range(1, 11), [0, 1, 0, 2, 0, 0, 1, 0, 1, 1])
+    ]
+    # sorted: 2 4 4 7 9 10; the median averages the 3rd and 4th, percentiles take the nearest rank
+    assert distribution["median"] == 5.5
+    assert distribution["percentiles"] == {"p10": 2, "p25": 4, "p75": 9, "p90": 10}
+
+    detail = client.get(f"/api/v1/movies/{movie_id}").json()["data"]
+    assert detail["rating_distribution"] == {key: distribution[key] for key in ("histogram", "median", "percentiles")}
+
+
+def test_distribution_of_a_missing_movie_is_not_found(client):
+    assert client.get("/api/v1/movies/999999/ratings/distribution").status_code == 404
@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select
+
+from app.db.database import SessionLocal
+from app.models.movie import SCORES, score_count_column
+from app.models.movie_rating_rollup import MovieRatingRollup, bucket_start
+from app.repositories.rating_repository import RatingRepository
+
+
+def rollup_row(movie_id, bucket, score):
+    counts = {score_count_column(s): int(s == score) for s in SCORES}
+    return {"movie_id": movie_id, "bucket": bucket, "ratings_count": 1, "rating_sum": score, **counts}
+
+
+def rollups_of(db, movie_id):
+    rollups = MovieRatingRollup.__table__
+    return {
+        bucket_start(bucket): (count, total, nines)
+        for bucket, count, total, nines in db.execute(
+            select(rollups.c.bucket, rollups.c.ratings_count, rollups.c.rating_sum, rollups.c.score_9_count)
+            .where(rollups.c.movie_id == movie_id)
+        )
+    }
+
+
+def test_portable_merge_matches_the_upsert(client):
+    # Fight Club (2) has no ratings; the merge path is what dialects without ON CONFLICT use
+    first = bucket_start(datetime(2026, 1, 1, 10, 15, tzinfo=timezone.utc))
+    second = bucket_start(datetime(2026, 1, 1, 11, 45, tzinfo=timezone.utc))
+    db = SessionLocal()
+    try:
+        repository = RatingRepository(db)
+        repository.apply_rollup_deltas({(2, first): {9: 2}})
+        repository.merge_rollups([rollup_row(2, first, 9), rollup_row(2, second, 7)])
+        assert rollups_of(db, 2) == {first: (3, 27, 3), second: (1, 7, 0)}
+    finally:
+        db.rollback()
+        db.execute(delete(MovieRatingRollup.__table__).where(MovieRatingRollup.movie_id == 2))
+        db.commit()
+        db.close()
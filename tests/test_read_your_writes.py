@@ -0,0 +1,54 @@
+"""A client that just wrote reads its write back even when another client's read of a lagging
+replica has refilled the response cache in between."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.cache.response_cache import InMemoryLRUCache, response_cache
+from app.db import database
+from app.db.replicas import Replica, ReplicaSet, RoutingSession
+from app.main import app
+from app.middleware import read_routing
+from scripts.sqlite_replica import copy_database
+
+
+@pytest.fixture
+def stale_replica(client, db_engine, tmp_path, monkeypatch):
+    """A replica holding a copy of the primary taken now, which later writes never reach."""
+    url = f"sqlite:///{tmp_path}/replica.db"
+    copy_database(db_engine.url.database, f"{tmp_path}/replica.db")
+    replica_engine = database._create_engine(url)
+    replicas = ReplicaSet([Replica(url, replica_engine)], check_interval=0, max_lag_seconds=0)
+    monkeypatch.setattr(
+        database,
+        "SessionLocal",
+        sessionmaker(autocommit=False, autoflush=False, bind=db_engine, class_=RoutingSession, replicas=replicas),
+    )
+    monkeypatch.setattr(read_routing, "DATABASE_REPLICA_URLS", [url])
+    yield
+    replica_engine.dispose()
+
+
+def test_writer_is_not_served_a_cache_entry_filled_from_a_replica(client, stale_replica):
+    assert isinstance(response_cache, InMemoryLRUCache)
+    movie_id = 1
+    before = client.get(f"/api/v1/movies/{movie_id}").json()["data"]["title"]
+
+    writer, reader = TestClient(app), TestClient(app)
+    assert writer.patch(f"/api/v1/movies/{movie_id}", json={"title": "Inception (Director's Cut)"}).status_code == 200
+    assert "read_primary_until" in writer.cookies
+
+    # the reader is not pinned: it reads the stale replica and caches what it saw
+    listing = {"title": "incep", "total": "cached"}
+    assert reader.get(f"/api/v1/movies/{movie_id}").json()["data"]["title"] == before
+    assert reader.get("/api/v1/movies", params=listing).json()["data"]["items"][0]["title"] == before
+
+    assert writer.get(f"/api/v1/movies/{movie_id}").json()["data"]["title"] == "Inception (Director's Cut)"
+    assert writer.get("/api/v1/movies/batch", params={"ids": movie_id}).json()["data"]["items"][0]["title"] == (
+        "Inception (Director's Cut)"
+    )
+    assert writer.get("/api/v1/movies", params=listing).json()["data"]["items"][0]["title"] == (
+        "Inception (Director's Cut)"
+    )
+
+    assert writer.patch(f"/api/v1/movies/{movie_id}", json={"title": before}).status_code == 200
@@ -0,0 +1,48 @@
+"""A director or genre deleted by another worker after this one cached it is a 422, not a
+foreign key error surfacing as a 500."""
+import pytest
+from sqlalchemy import delete
+
+from app.cache.reference_data import reference_data
+from app.db.database import SessionLocal
+from app.models import Director, Genre
+
+
+@pytest.fixture
+def deleted_elsewhere(client):
+    """Ids of a director and a genre that the reference data snapshot lists but the database
+    no longer has."""
+    db = SessionLocal()
+    try:
+        director, genre = Director(name="Gone Director"), Genre(name="Gone Genre")
+        db.add_all([director, genre])
+        db.commit()
+        reference_data.load(db)
+        db.execute(delete(Director).where(Director.id == director.id))
+        db.execute(delete(Genre).where(Genre.id == genre.id))
+        db.commit()
+        yield director.id, genre.id
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("deleted", ["director", "genre"])
+def test_create_with_a_deleted_director_or_genre_is_unprocessable(client, deleted_elsewhere, deleted):
+    director_id, genre_id = deleted_elsewhere
+    body = {"director_id": director_id, "genre_ids": [1]} if deleted == "director" else {"director_id": 1, "genre_ids": [genre_id]}
+    response = client.post("/api/v1/movies", json={"title": "Orphan", **body})
+    assert response.status_code == 422, response.text
+    assert response.json()["error"]["message"] == "Invalid director_id or genres"
+
+
+def test_update_with_a_deleted_director_reloads_the_reference_data(client, deleted_elsewhere):
+    director_id, _ = deleted_elsewhere
+    loads = reference_data.loads
+    response = client.patch("/api/v1/movies/2", json={"director_id": director_id})
+    assert response.status_code == 422, response.text
+    assert response.json()["error"]["message"] == "Invalid director_id or genres"
+    assert client.get("/api/v1/movies/2").json()["data"]["director"]["id"] == 2
+
+    # the stale snapshot was dropped: the next lookup reloads and rejects up front
+    assert client.patch("/api/v1/movies/2", json={"director_id": director_id}).status_code == 422
+    assert reference_data.loads == loads + 1
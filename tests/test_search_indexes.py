@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from app.search.ngram_index import MovieSearchIndex
+from app.search.similarity_index import MovieSimilarityIndex
+
+NEW_MOVIE = 10**6
+
+# (index class, upsert arguments of NEW_MOVIE, finds(index, movie_id): the index answers for it)
+INDEXES = [
+    pytest.param(
+        MovieSearchIndex,
+        (NEW_MOVIE, "Journaled Picture", None, []),
+        lambda index, movie_id: movie_id in index.search({1: "inception", NEW_MOVIE: "journaled"}[movie_id]),
+        id="ngram",
+    ),
+    pytest.param(
+        MovieSimilarityIndex,
+        (NEW_MOVIE, 1, 2010, "Leonardo DiCaprio, Tom Hardy", ["Sci-Fi", "Thriller"]),
+        lambda index, movie_id: index.similar(movie_id, 1) is not None,
+        id="similarity",
+    ),
+]
+
+
+def probe(index_class):
+    """An ``index_class`` whose builds run ``during_load`` between the database read and the swap."""
+
+    class Probe(index_class):
+        during_load = None
+
+        def _load(self, session):
+            super()._load(session)
+            if Probe.during_load is not None:
+                Probe.during_load()
+
+    return Probe()
+
+
+@pytest.mark.parametrize("index_class, upserted, finds", INDEXES)
+def test_concurrent_cold_requests_build_once(client, index_class, upserted, finds):
+    index = index_class()
+    threads = [threading.Thread(target=index.ensure_built) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert index.builds == 1
+    assert finds(index, 1)
+
+
+@pytest.mark.parametrize("index_class, upserted, finds", INDEXES)
+def test_writes_during_a_build_survive_the_swap(client, index_class, upserted, finds):
+    index = probe(index_class)
+    index.build()
+    type(index).during_load = lambda: (index.upsert(*upserted), index.remove(1))
+    index.build()
+    assert index.builds == 2
+    assert finds(index, NEW_MOVIE)
+    assert not finds(index, 1)
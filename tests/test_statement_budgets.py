@@ -0,0 +1,101 @@
+"""Every endpoint in ``STATEMENT_BUDGETS`` stays within its budget.
+
+The app runs with ``SQL_STATEMENT_BUDGET_MODE=enforce`` (see conftest.py), so the middleware
+fails an overrun too; ``statement_budget`` additionally counts everything the request sent,
+including statements issued outside the request context.
+"""
+from dataclasses import dataclass, field
+
+import pytest
+
+from app.db.statement_counter import STATEMENT_BUDGETS, statement_budget
+
+
+@dataclass
+class Case:
+    endpoint: str
+    method: str
+    path: str
+    json: dict | None = None
+    params: dict = field(default_factory=dict)
+    headers: dict = field(default_factory=dict)
+
+
+CASES = [
+    Case("list_movies", "GET", "/api/v1/movies", params={"page_size": 20}),
+    Case("list_movies", "GET", "/api/v1/movies", params={"genre": "drama", "total": "none"}),
+    Case("list_movies", "GET", "/api/v1/movies", params={"release_year": "2010", "title": "incep"}),
+    Case("get_movie", "GET", "/api/v1/movies/1"),
+    Case("get_movie", "GET", "/api/v1/movies/1", headers={"If-None-Match": '"stale"'}),
+    Case("get_movies_batch", "GET", "/api/v1/movies/batch", params={"ids": "3,1,2,999"}),
+    Case("get_similar_movies", "GET", "/api/v1/movies/1/similar"),
+    Case(
+        "create_movie",
+        "POST",
+        "/api/v1/movies",
+        json={"title": "Zodiac", "release_year": 2007, "director_id": 2, "genre_ids": [1, 3]},
+    ),
+    Case("update_movie", "PUT", "/api/v1/movies/{movie_id}", json={"title": "Renamed", "genre_ids": [2, 3]}),
+    Case("patch_movie", "PATCH", "/api/v1/movies/{movie_id}", json={"release_year": 2001, "genre_ids": [1]}),
+    Case("delete_movie", "DELETE", "/api/v1/movies/{movie_id}"),
+    Case("create_rating", "POST", "/api/v1/movies/1/ratings", json={"score": 7}),
+    Case("list_ratings", "GET", "/api/v1/movies/1/ratings"),
+    Case("list_ratings", "GET", "/api/v1/movies/1/ratings", params={"limit": 2}),
+    Case("get_rating_distribution", "GET", "/api/v1/movies/1/ratings/distribution"),
+    Case("get_rating_timeseries", "GET", "/api/v1/movies/1/ratings/timeseries", params={"interval": "day"}),
+    Case(
+        "bulk_create_ratings",
+        "POST",
+        "/api/v1/ratings/bulk",
+        json={"ratings": [{"movie_id": movie_id, "score": 1 + movie_id % 10} for movie_id in (1, 2, 3, 4, 999) * 300]},
+    ),
+    Case("get_leaderboard", "GET", "/api/v1/leaderboards"),
+    Case("get_leaderboard", "GET", "/api/v1/leaderboards", params={"genre": "sci-fi", "decade": 2010}),
+    Case("get_trending", "GET", "/api/v1/leaderboards/trending", params={"window": "7d"}),
+]
+
+
+def test_every_budget_is_exercised():
+    assert {case.endpoint for case in CASES} == set(STATEMENT_BUDGETS)
+
+
+@pytest.mark.parametrize("case", CASES, ids=lambda case: f"{case.endpoint}-{case.method}")
+def test_endpoint_stays_within_budget(client, db_engine, case):
+    path = case.path
+    if "{movie_id}" in path:
+        # a movie of its own, so writes and deletes do not disturb the other cases
+        created = client.post("/api/v1/movies", json={"title": "Scratch", "release_year": 2000, "director_id": 1, "genre_ids": [1]})
+        path = path.format(movie_id=created.json()["data"]["id"])
+
+    with statement_budget(db_engine, case.endpoint) as counter:
+        response = client.request(case.method, path, json=case.json, params=case.params, headers=case.headers)
+
+    assert response.status_code < 300, response.text
+    assert response.headers.get("X-SQL-Statements") is None or int(response.headers["X-SQL-Statements"]) <= counter.count
+
+
+@pytest.mark.parametrize(
+    "payload, statements",
+    [
+        ({"release_year": 2001}, 3),  # UPDATE ... RETURNING + director/genres SELECT + catalog bump
+        ({"title": "Patched", "genre_ids": [2, 3]}, 5),  # + stale links DELETE + missing links INSERT
+    ],
+)
+def test_patch_movie_statement_count(client, db_engine, payload, statements):
+    created = client.post("/api/v1/movies", json={"title": "Scratch", "release_year": 2000, "director_id": 1, "genre_ids": [1]})
+    movie_id = created.json()["data"]["id"]
+
+    with statement_budget(db_engine, "patch_movie") as counter:
+        response = client.patch(f"/api/v1/movies/{movie_id}", json=payload)
+
+    assert response.status_code == 200, response.text
+    assert counter.count == statements
+    assert response.headers["X-SQL-Statements"] == str(statements)
+
+
+def test_patch_of_a_missing_movie_is_one_statement(client, db_engine):
+    with statement_budget(db_engine, "patch_movie") as counter:
+        response = client.patch("/api/v1/movies/999999", json={"release_year": 2001})
+
+    assert response.status_code == 404
+    assert counter.count == 1